@@ -0,0 +1,237 @@
+"""
+Resume parsing and scoring core, shared by the Streamlit app and the batch tools.
+
+Nothing in here imports Streamlit or runs anything at import time, so it can be used
+from scripts and worker processes. PyPDF2 and textstat are imported by the functions
+that need them, which keeps `import analyzer` cheap.
+"""
+import re
+
+from metrics import incr, span, timed
+from sections import find_headings, get_section, section_text, sections_from_headings, segment_resume
+from skill_matcher import SkillScanner, get_skill_index, get_taxonomy
+
+# Bump whenever a change here alters extracted skills, experience or scores; cached results are keyed on it.
+PIPELINE_VERSION = "6"
+
+MAX_PAGES = 50  # pages read from one PDF
+MAX_TEXT_BYTES = 1024 * 1024  # extracted text kept from one PDF
+YEARS_PATTERN = re.compile(r"(\d+)\s*(?:years?|yrs?)", re.IGNORECASE)
+
+
+def pipeline_version():
+    """PIPELINE_VERSION plus the skill taxonomy's content hash, so editing skills.yaml invalidates cached results too."""
+    return f"{PIPELINE_VERSION}-{get_taxonomy().digest[:12]}"
+
+
+def _extract_pages(pdf_reader, max_pages):
+    for number, page in enumerate(pdf_reader.pages):
+        if max_pages is not None and number >= max_pages:
+            return
+        with span("pdf_page"):
+            text = page.extract_text() or ""  # image-only pages have no text layer
+        yield page, text
+
+
+def iter_pdf_pages(pdf_file, max_pages=MAX_PAGES, max_bytes=MAX_TEXT_BYTES, ocr="default"):
+    """
+    Yields the text of each page lazily, so analysis can start (or stop) before
+    the whole PDF is parsed. Stops after `max_pages` pages, or once `max_bytes`
+    of text have been produced (the last page is cut to fit). None disables a limit.
+
+    Image-only (scanned) pages are OCR'd by `ocr`, an ocr.OcrFallback; the default
+    is ocr.get_ocr_fallback(), which is None when no OCR engine is installed.
+    Pass ocr=None to never OCR.
+    """
+    import PyPDF2
+
+    with span("pdf_open"):
+        pdf_reader = PyPDF2.PdfReader(pdf_file)
+    if ocr == "default":
+        from ocr import get_ocr_fallback
+
+        ocr = get_ocr_fallback()
+    pages = _extract_pages(pdf_reader, max_pages)
+    texts = ocr.texts(pages) if ocr is not None else (text for _, text in pages)
+    budget = max_bytes
+    for text in texts:
+        incr("pdf_pages")
+        incr("text_chars", len(text))
+        if budget is not None:
+            encoded = text.encode("utf-8")
+            if len(encoded) >= budget:
+                yield encoded[:budget].decode("utf-8", "ignore")
+                return
+            budget -= len(encoded)
+        yield text
+
+
+# Function to extract text from PDF
+def extract_text_from_pdf(uploaded_file, max_pages=MAX_PAGES, max_bytes=MAX_TEXT_BYTES):
+    return "\n".join(iter_pdf_pages(uploaded_file, max_pages, max_bytes))
+
+@timed("extract_skills")
+def extract_skills(text):
+    # ✅ Single pass over the text using the prebuilt skill index (handles "Machine Learning", "C++", "CI/CD", ...)
+    skills = get_skill_index().extract(text)
+    incr("skills_found", len(skills))
+    return skills
+
+
+# ✅ Function to calculate Resume Score
+@timed("score_resume")
+def score_resume(resume_text, extracted_skills, experience_years=None):
+    """
+    Scores a resume out of 100 on five equally weighted factors.
+    Pass `experience_years` when extract_experience() has already been run on this text.
+    """
+    import textstat
+
+    lowered_text = resume_text.lower()
+    taxonomy = get_taxonomy()  # the keyword lists live in skills.yaml under "scoring"
+    industry_keywords, ats_sections = taxonomy.industry_keywords, taxonomy.ats_sections
+
+    # 1️⃣ **Keyword Matching (20%)**
+    matched_keywords = sum(1 for word in industry_keywords if word in lowered_text)
+    keyword_score = (matched_keywords / len(industry_keywords)) * 20
+
+    # 2️⃣ **Experience Level (20%)**
+    if experience_years is None:
+        experience_years = extract_experience(resume_text)["years_of_experience"]
+    experience_score = 20 if experience_years >= 3 else 10 if experience_years >= 1 else 5  # ✅ Fix TypeError
+
+    # 3️⃣ **Readability Score (20%)**
+    with span("readability"):
+        readability = textstat.flesch_reading_ease(resume_text)
+    readability_score = 20 if readability > 50 else 10 if readability > 30 else 5
+
+    # 4️⃣ **Skill Relevance (20%)**
+    matched_skills = len(set(skill.lower() for skill in extracted_skills).intersection(industry_keywords))
+    skill_score = (matched_skills / len(industry_keywords)) * 20
+
+    # 5️⃣ **ATS Compliance (20%)**
+    ats_score = sum(1 for word in ats_sections if word in lowered_text)
+    ats_score = (ats_score / len(ats_sections)) * 20
+
+    # ✅ Calculate Final Score (Out of 100)
+    final_score = keyword_score + experience_score + readability_score + skill_score + ats_score
+    return round(final_score, 2)
+
+
+@timed("extract_experience")
+def extract_experience(text, sections=None):
+    """
+    Extracts the full experience section and calculates years of experience.
+
+    Parameters:
+    text (str): Resume text.
+    sections (list): segment_resume(text), if the caller already has it.
+
+    Returns:
+    dict: {
+        "experience_text": Full extracted experience section or "Experience not found",
+        "years_of_experience": Number of years found (int, default 0)
+    }
+    """
+    if sections is None:
+        sections = segment_resume(text)
+
+    # ✅ The experience section runs from its heading to the next section heading
+    section = get_section(sections, "experience")
+    extracted_experience = section_text(text, section) if section else ""
+    extracted_experience = extracted_experience or "Experience not found"
+
+    # ✅ Extract number of years from the experience section
+    years_match = YEARS_PATTERN.findall(extracted_experience)
+
+    years_of_experience = max(map(int, years_match)) if years_match else 0  # Take the highest year found
+
+    return {
+        "experience_text": extracted_experience,
+        "years_of_experience": years_of_experience
+    }
+
+
+class ResumeStream:
+    """
+    Resume Analyzer state that is fed one page at a time, so skills and the
+    experience section are known as soon as the pages containing them are read.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.length = 0  # length of self.text
+        self.skill_scanner = SkillScanner()
+        self.headings = []
+        self.experience = None  # extract_experience() result, once the section is complete
+
+    def feed(self, page_text):
+        if self.pages:
+            self.length += 1  # the "\n" pages are joined with
+        self.headings.extend(find_headings(page_text, offset=self.length))
+        self.pages.append(page_text)
+        self.length += len(page_text)
+        self.skill_scanner.feed(page_text)
+        if self.experience is None:
+            names = [name for name, _, _, _ in self.headings]
+            # The experience section is complete once another heading follows it.
+            if "experience" in names and names.index("experience") < len(names) - 1:
+                self.experience = extract_experience(self.text, sections_from_headings(self.headings, self.length))
+
+    @property
+    def text(self):
+        return "\n".join(self.pages)
+
+    @property
+    def skills(self):
+        return self.skill_scanner.skills
+
+    @property
+    def sections_seen(self):
+        return {name for name, _, _, _ in self.headings}
+
+    def has_sections(self, sections):
+        """True once every section in `sections` has a heading (and, for "experience", has been read to its end)."""
+        sections_seen = self.sections_seen
+        return all(
+            self.experience is not None if section == "experience" else section in sections_seen
+            for section in sections
+        )
+
+    def final_experience(self):
+        """extract_experience(self.text), from the section found while streaming when it was complete."""
+        text = self.text
+        return self.experience or extract_experience(text, sections_from_headings(self.headings, len(text)))
+
+    def result(self):
+        text = self.text
+        skills = self.skills
+        experience = self.final_experience()
+        return {
+            "skills": skills,
+            "experience_text": experience["experience_text"],
+            "years_of_experience": experience["years_of_experience"],
+            "score": score_resume(text, skills, experience["years_of_experience"]),
+        }
+
+
+@timed("analyze_resume")
+def analyze_resume(pdf_file, required_sections=None, max_pages=MAX_PAGES, max_bytes=MAX_TEXT_BYTES):
+    """
+    Runs the full Resume Analyzer pipeline on one PDF (path or file-like object),
+    page by page.
+
+    Parameters:
+    required_sections (list): Stop reading pages as soon as these ATS sections
+        (e.g. ["experience", "skills"]) are found; the score then only covers the
+        pages read. None reads the whole document (up to the page/byte limits).
+
+    Returns:
+    dict: {"skills", "experience_text", "years_of_experience", "score"}
+    """
+    stream = ResumeStream()
+    for page_text in iter_pdf_pages(pdf_file, max_pages, max_bytes):
+        stream.feed(page_text)
+        if required_sections and stream.has_sections(required_sections):
+            break
+    return stream.result()
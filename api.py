@@ -0,0 +1,298 @@
+"""
+Headless HTTP API for the resume pipeline, for ATS integrations that need it
+without the Streamlit UI. A plain ASGI app, no web framework:
+
+    POST /analyze     body: the PDF (application/pdf)         -> {"skills", "experience", "score"}
+    POST /skills      {"text": "..."}                          -> {"skills": [...]}
+    POST /score       {"text": "...", "skills": [...]?}        -> {"score", "skills", "years_of_experience"}
+    POST /job-match   {"skills": [...] | "text": "...", "jobs": [...]?, "k": 10}
+                      -> the k best jobs, from "jobs" if given, else from the persistent job index
+    POST /render      {"template": "<file in templates/>", "data": {...}, "format": "docx" | "pdf"}
+                      -> the rendered file; "data" keys fill the {KEY} placeholders, in any case
+    GET  /health      -> pool and queue state
+
+Serve it with:  python api.py --port 8000 --workers 4
+(or any ASGI server: uvicorn api:app).
+
+Parsing, scoring and rendering run on a process pool. At most `max_pending`
+jobs may be running or queued for it, and at most `max_concurrency` requests
+may be in flight; past either limit the API answers 503 with Retry-After
+straight away instead of queueing without bound. Request bodies are read
+chunk by chunk and rejected with 413 as soon as they pass the size limit.
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+API_WORKERS = int(os.environ.get("API_WORKERS", 0)) or os.cpu_count() or 1
+API_MAX_PENDING = int(os.environ.get("API_MAX_PENDING", 0)) or None  # default: 4 per worker
+API_MAX_CONCURRENCY = int(os.environ.get("API_MAX_CONCURRENCY", 64))
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MAX_JSON_BYTES = 2 * 1024 * 1024
+TEMPLATE_DIR = "templates"
+RENDER_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = list(headers)
+
+
+# ✅ Run in the worker processes; imports happen there, so the server process stays light
+
+def _analyze(data):
+    from cache import analyze_pdf_bytes
+
+    result = analyze_pdf_bytes(data)
+    return {name: value for name, value in result.items() if name != "text"}  # up to MAX_TEXT_BYTES; not sent back
+
+
+def _skills(text):
+    from analyzer import extract_skills
+
+    return {"skills": extract_skills(text)}
+
+
+def _score(text, skills=None):
+    from analyzer import extract_experience, extract_skills, score_resume
+
+    skills = extract_skills(text) if skills is None else skills
+    years = extract_experience(text)["years_of_experience"]
+    return {"score": score_resume(text, skills, years), "skills": skills, "years_of_experience": years}
+
+
+def _job_match(skills, jobs=None, k=10):
+    from job_index import get_job_index
+
+    index = get_job_index()
+    ranked = index.query(skills, k) if jobs is None else index.rank(skills, jobs)[:k]
+    return {"jobs": [{**job, "score": round(score, 4)} for job, score in ranked]}
+
+
+def _job_match_text(text, jobs=None, k=10):
+    return _job_match(_skills(text)["skills"], jobs, k)
+
+
+def _render(template_path, data, fmt):
+    from generator import render_resume
+
+    return render_resume(template_path, data, formats=(fmt,))[fmt]
+
+
+class ResumeAPI:
+    def __init__(self, workers=API_WORKERS, max_pending=API_MAX_PENDING, max_concurrency=API_MAX_CONCURRENCY,
+                 template_dir=TEMPLATE_DIR):
+        self.workers = workers
+        self.max_pending = max_pending or 4 * workers
+        self.max_concurrency = max_concurrency
+        self.template_dir = template_dir
+        self.pool = None
+        self.pending = 0
+        self.active = 0
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/skills"): self.skills,
+            ("POST", "/score"): self.score,
+            ("POST", "/job-match"): self.job_match,
+            ("POST", "/render"): self.render,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self.handle(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def start(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def stop(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def handle(self, scope, receive, send):
+        route = self.routes.get((scope["method"], scope["path"]))
+        headers = []
+        self.active += 1
+        try:
+            if route is None:
+                raise HTTPError(404, "not found")
+            if self.active > self.max_concurrency:
+                raise HTTPError(503, "too many concurrent requests", [(b"retry-after", b"1")])
+            status, body, content_type = await route(scope, receive)
+        except HTTPError as exc:
+            status, body, content_type, headers = exc.status, {"error": exc.message}, None, exc.headers
+        finally:
+            self.active -= 1
+        await self.respond(send, status, body, content_type, headers)
+
+    async def respond(self, send, status, body, content_type=None, headers=()):
+        if content_type is None:
+            body, content_type = json.dumps(body).encode(), "application/json"
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode()),
+                        *headers],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def read_body(self, scope, receive, limit):
+        """Reads the request body chunk by chunk, failing with 413 as soon as it passes `limit` bytes."""
+        headers = dict(scope["headers"])
+        declared = headers.get(b"content-length")
+        if declared is not None:
+            try:
+                declared = int(declared)
+            except ValueError:
+                raise HTTPError(400, "invalid content-length")
+            if declared > limit:
+                raise HTTPError(413, f"body larger than {limit} bytes")
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise HTTPError(400, "client disconnected")
+            body += message.get("body", b"")
+            if len(body) > limit:
+                raise HTTPError(413, f"body larger than {limit} bytes")
+            if not message.get("more_body", False):
+                return bytes(body)
+
+    async def read_json(self, scope, receive):
+        try:
+            payload = json.loads(await self.read_body(scope, receive, MAX_JSON_BYTES))
+        except ValueError:
+            raise HTTPError(400, "body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return payload
+
+    async def offload(self, func, *args):
+        """Runs `func` on the process pool, or fails with 503 when `max_pending` jobs are already waiting."""
+        if self.pending >= self.max_pending:
+            raise HTTPError(503, "server busy, retry later", [(b"retry-after", b"1")])
+        self.start()
+        pool = self.pool
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+        except BrokenProcessPool:
+            # A worker died: release the broken pool's thread and surviving workers; the next request gets a fresh pool
+            pool.shutdown(wait=False, cancel_futures=True)
+            if self.pool is pool:
+                self.pool = None
+            raise HTTPError(500, "worker process died")
+        except Exception as exc:  # bad input, e.g. a PDF that PyPDF2 cannot read
+            raise HTTPError(422, f"{type(exc).__name__}: {exc}")
+        finally:
+            self.pending -= 1
+
+    async def health(self, scope, receive):
+        return 200, {"status": "ok", "workers": self.workers, "pending": self.pending,
+                     "max_pending": self.max_pending, "active": self.active}, None
+
+    async def analyze(self, scope, receive):
+        data = await self.read_body(scope, receive, MAX_UPLOAD_BYTES)
+        if not data.startswith(b"%PDF"):
+            raise HTTPError(415, "body must be a PDF")
+        return 200, await self.offload(_analyze, data), None
+
+    async def skills(self, scope, receive):
+        payload = await self.read_json(scope, receive)
+        return 200, await self.offload(_skills, _text(payload)), None
+
+    async def score(self, scope, receive):
+        payload = await self.read_json(scope, receive)
+        return 200, await self.offload(_score, _text(payload), _string_list(payload, "skills")), None
+
+    async def job_match(self, scope, receive):
+        payload = await self.read_json(scope, receive)
+        jobs = payload.get("jobs")
+        if jobs is not None and not (isinstance(jobs, list) and all(isinstance(job, dict) for job in jobs)):
+            raise HTTPError(400, '"jobs" must be a list of objects')
+        k = payload.get("k", 10)
+        if not isinstance(k, int) or k < 1:
+            raise HTTPError(400, '"k" must be a positive integer')
+        skills = _string_list(payload, "skills")
+        if skills is not None:
+            return 200, await self.offload(_job_match, skills, jobs, k), None
+        return 200, await self.offload(_job_match_text, _text(payload), jobs, k), None
+
+    async def render(self, scope, receive):
+        payload = await self.read_json(scope, receive)
+        fmt = payload.get("format", "docx")
+        if fmt not in RENDER_TYPES:
+            raise HTTPError(400, f'"format" must be one of {", ".join(RENDER_TYPES)}')
+        data = payload.get("data") or {}
+        if not isinstance(data, dict):
+            raise HTTPError(400, '"data" must be an object')
+        # basename() keeps the lookup inside the template directory
+        template_path = os.path.join(self.template_dir, os.path.basename(str(payload.get("template", ""))))
+        if not template_path.endswith(".docx") or not os.path.isfile(template_path):
+            raise HTTPError(404, "unknown template")
+        # Placeholders are upper case ({NAME}), so {"name": ...} fills {NAME} rather than being ignored
+        data = {str(key).upper(): str(value) for key, value in data.items()}
+        return 200, await self.offload(_render, template_path, data, fmt), RENDER_TYPES[fmt]
+
+
+def _text(payload):
+    text = payload.get("text")
+    if not isinstance(text, str):
+        raise HTTPError(400, '"text" must be a string')
+    return text
+
+
+def _string_list(payload, key):
+    value = payload.get(key)
+    if value is not None and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+        raise HTTPError(400, f'"{key}" must be a list of strings')
+    return value
+
+
+app = ResumeAPI()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the resume pipeline over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-w", "--workers", type=int, default=API_WORKERS, help="worker processes for parsing")
+    parser.add_argument("--max-pending", type=int, default=API_MAX_PENDING,
+                        help="jobs running or queued before answering 503 (default: 4 per worker)")
+    parser.add_argument("--max-concurrency", type=int, default=API_MAX_CONCURRENCY,
+                        help="requests in flight before answering 503")
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError as exc:
+        raise SystemExit("Serving needs an ASGI server: pip install uvicorn") from exc
+    uvicorn.run(ResumeAPI(args.workers, args.max_pending, args.max_concurrency),
+                host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,19 @@
 import streamlit as st
-import docx
 import os
-from fpdf import FPDF
-import PyPDF2
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
-from bs4 import BeautifulSoup
-import requests
-import yaml
-import bcrypt
-from pdf2image import convert_from_path
-import io
-from PIL import Image
-import nltk
-import textstat
-from collections import Counter
+import time
 import auth0_config
+import metrics
+from credentials import get_accounts
+
+# Heavy modules (PDF parsing, scraping, TF-IDF, DOCX/PDF rendering) are imported
+# inside the page that uses them, so the login page and other pages start fast.
 
 
 TEMPLATE_PATH = "templates/"
-nltk.download("punkt")
+TASK_POLL_SECONDS = 0.5  # how often a page waiting on a background task reruns
+# ✅ Usernames that see the metrics panel, e.g. RESUME_ADMIN_USERS=alice,bob
+ADMIN_USERS = {name.strip() for name in os.environ.get("RESUME_ADMIN_USERS", "").split(",") if name.strip()}
+metrics.get_profiler()  # starts the sampling profiler when RESUME_PROFILE=1
 st.markdown(
     """
     <style>
@@ -122,37 +114,12 @@ else:
         unsafe_allow_html=True
     )
     
-def load_credentials():
-    credentials_path = "credentials.yaml"
-
-    # ✅ Check if the file exists
-    if not os.path.exists(credentials_path):
-        return {"credentials": {}}  # Return an empty dictionary if the file is missing
-
-    with open(credentials_path, "r") as file:
-        credentials = yaml.safe_load(file) or {}  # Ensure it never returns None
-    
-    # ✅ Ensure it has the expected structure
-    if "credentials" not in credentials:
-        credentials["credentials"] = {}
-
-    return credentials
-
-def save_credentials(credentials):
-    with open("credentials.yaml", "w") as file:
-        yaml.dump(credentials, file, default_flow_style=False)
-
-# ✅ Hash passwords before saving
-def hash_password(password):
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+# ✅ Accounts live in an indexed SQLite store (credentials.py), migrated once from credentials.yaml
+accounts = get_accounts()
 
 # ✅ Function to check login
 def authenticate(username, password):
-    credentials = load_credentials()
-    if username in credentials["credentials"]:
-        stored_password = credentials["credentials"][username]["password"]
-        return bcrypt.checkpw(password.encode(), stored_password.encode())
-    return False
+    return accounts.authenticate(username, password)
 
 # ✅ Ensure session state variables are always initialized
 if "extracted_skills" not in st.session_state:
@@ -224,13 +191,10 @@ if not st.session_state.logged_in:  # Show login options only if the user is not
             if new_password != confirm_password:
                 st.error("❌ Passwords do not match!")
             else:
-                credentials = load_credentials()
-                if new_username in credentials["credentials"]:
-                    st.error("❌ Username already exists! Choose another.")
-                else:
-                    credentials["credentials"][new_username] = {"password": hash_password(new_password)}
-                    save_credentials(credentials)
+                if accounts.create_account(new_username, new_password):
                     st.success("✅ Account created successfully! Please log in.")
+                else:
+                    st.error("❌ Username already exists! Choose another.")
 
     st.stop()
 # ✅ Logout button
@@ -240,260 +204,88 @@ if st.sidebar.button("Logout"):
     st.session_state.username = ""
     st.rerun()
 
-# ✅ Set the correct Poppler path
-POPPLER_PATH = r"C:\Users\HP\Documents\poppler-24.08.0\Library\bin"  # Update if needed
-
-def convert_docx_to_image(docx_path):
-    pdf_path = docx_path.replace(".docx", ".pdf")
-    image_path = docx_path.replace(".docx", ".png")
-
-    # ✅ Convert DOCX to PDF
-    os.system(f"libreoffice --headless --convert-to pdf {docx_path}")
-
-    # ✅ Convert PDF to Image with Poppler path
-    images = convert_from_path(pdf_path, poppler_path=POPPLER_PATH)
-
-    if images:
-        images[0].save(image_path, "PNG")  # Save first page as an image
-        return image_path
-    return None
-
-
-# Function to replace placeholders in a template
-def fill_template(template_path, user_data):
-    doc = docx.Document(template_path)
-    for para in doc.paragraphs:
-        for key, value in user_data.items():
-            if f"{{{key}}}" in para.text:
-                para.text = para.text.replace(f"{{{key}}}", value)
-    return doc
-# Function to scrape jobs from Indeed
-def scrape_indeed_jobs(query, num_jobs=5):
-    base_url = f"https://www.indeed.com/jobs?q={query}"
-    response = requests.get(base_url)
-    soup = BeautifulSoup(response.text, "html.parser")
-    job_list = []
-
-    for job_card in soup.find_all("div", class_="job_seen_beacon")[:num_jobs]:
-        title = job_card.find("h2").text.strip()
-        company = job_card.find("span", class_="companyName").text.strip()
-        job_link = "https://www.indeed.com" + job_card.find("a")["href"]
-        job_list.append({"title": title, "company": company, "link": job_link})
-
-    return job_list
-
-# Function to scrape jobs from LinkedIn
-def scrape_linkedin_jobs(query, num_jobs=5):
-    base_url = f"https://www.linkedin.com/jobs/search?keywords={query}"
-    response = requests.get(base_url)
-    soup = BeautifulSoup(response.text, "html.parser")
-    job_list = []
-
-    for job_card in soup.find_all("div", class_="base-search-card")[:num_jobs]:
-        title = job_card.find("h3").text.strip()
-        company = job_card.find("h4").text.strip()
-        job_link = job_card.find("a")["href"]
-        job_list.append({"title": title, "company": company, "link": job_link})
-
-    return job_list
-
-# Function to scrape jobs from Glassdoor
-def scrape_glassdoor_jobs(query, num_jobs=5):
-    base_url = f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={query}"
-    response = requests.get(base_url)
-    soup = BeautifulSoup(response.text, "html.parser")
-    job_list = []
-
-    for job_card in soup.find_all("li", class_="react-job-listing")[:num_jobs]:
-        title = job_card.find("a", class_="jobLink").text.strip()
-        company = job_card.find("div", class_="jobHeader").text.strip()
-        job_link = "https://www.glassdoor.com" + job_card.find("a")["href"]
-        job_list.append({"title": title, "company": company, "link": job_link})
-
-    return job_list
-
-# Function to fetch jobs from multiple sources
-def fetch_jobs_from_multiple_sources(query, num_jobs=5):
-    jobs = []
-    jobs.extend(scrape_indeed_jobs(query, num_jobs))
-    jobs.extend(scrape_linkedin_jobs(query, num_jobs))
-    jobs.extend(scrape_glassdoor_jobs(query, num_jobs))
-    return jobs[:num_jobs]
-
-# Function to match resume skills with job descriptions
-def match_resumes_to_jobs(resume_skills, job_list):
-    vectorizer = TfidfVectorizer()
-    job_titles = [job["title"] for job in job_list]
-    combined_texts = resume_skills + job_titles
-    tfidf_matrix = vectorizer.fit_transform(combined_texts)
-    resume_vector = tfidf_matrix[:len(resume_skills)]
-    job_vectors = tfidf_matrix[len(resume_skills):]
-    similarity_scores = cosine_similarity(resume_vector, job_vectors)
-    return similarity_scores
-
-# Function to extract text from PDF
-def extract_text_from_pdf(uploaded_file):
-    pdf_reader = PyPDF2.PdfReader(uploaded_file)
-    return "\n".join([page.extract_text() for page in pdf_reader.pages])
-
-def extract_skills(text):
-    skills_list = [
-        # Software Development
-        "Python", "Java", "C++", "C#", "JavaScript", "TypeScript", "Go", "Swift", "Kotlin", "Ruby", "PHP", "Rust",
-        "HTML", "CSS", "React", "Angular", "Vue.js", "Node.js", "Django", "Flask", "Spring Boot", "Express.js",
-        "Git", "Docker", "Kubernetes", "CI/CD", "Jenkins", "GraphQL", "REST API", "SOAP", "Microservices",
-        
-        # Data Science & AI
-        "Machine Learning", "Deep Learning", "Data Science", "Artificial Intelligence", "NLP", "Computer Vision",
-        "TensorFlow", "PyTorch", "Scikit-Learn", "Pandas", "NumPy", "Matplotlib", "Seaborn", "Keras", "OpenCV",
-        "Big Data", "Hadoop", "Spark", "Apache Kafka", "ETL", "Tableau", "Power BI", "Data Visualization",
-        
-        # Cloud Computing
-        "AWS", "Azure", "Google Cloud", "DevOps", "Cloud Security", "Terraform", "Ansible", "CloudFormation",
-        "Serverless", "Lambda", "EC2", "S3", "Kubernetes", "Cloud Networking",
-        
-        # Cybersecurity
-        "Ethical Hacking", "Penetration Testing", "Malware Analysis", "Network Security", "SIEM", "SOC", 
-        "Firewall Management", "Incident Response", "Cryptography", "Zero Trust Security", "Identity Management",
-        
-        # Business & Management
-        "Agile", "Scrum", "Kanban", "Project Management", "Business Analysis", "Risk Management",
-        "Stakeholder Management", "Product Management", "Lean Methodology", "Six Sigma",
-        
-        # Digital Marketing
-        "SEO", "SEM", "Google Ads", "Facebook Ads", "Social Media Marketing", "Email Marketing",
-        "Marketing Automation", "Content Strategy", "Copywriting", "PPC", "Google Analytics",
-        
-        # Finance & Accounting
-        "Financial Analysis", "Accounting", "Budgeting", "Forecasting", "Investment Analysis",
-        "Risk Assessment", "Auditing", "Taxation", "Excel", "QuickBooks", "SAP",
-        
-        # Networking & IT Support
-        "Network Security", "CCNA", "CCNP", "Routing", "Switching", "LAN", "WAN", "VPN", "TCP/IP",
-        "Linux Administration", "Windows Server", "Active Directory",
-        
-        # Soft Skills
-        "Communication", "Leadership", "Time Management", "Problem Solving", "Critical Thinking",
-        "Teamwork", "Adaptability", "Creativity"
-    ]
-    
-    return list(set([word for word in re.findall(r'\b\w+\b', text) if word.lower() in [skill.lower() for skill in skills_list]]))
-
-
-# ✅ Function to calculate Resume Score
-def score_resume(resume_text, extracted_skills):
-    score = 0
-    total_factors = 5  # Total factors for scoring
-
-    # 1️⃣ **Keyword Matching (20%)**
-    industry_keywords = ["data analysis", "machine learning", "business intelligence", "python", "sql", "power bi", "dashboard", "visualization"]
-    matched_keywords = sum(1 for word in industry_keywords if word.lower() in resume_text.lower())
-    keyword_score = (matched_keywords / len(industry_keywords)) * 20
-
-    # 2️⃣ **Experience Level (20%)**
-    experience_data = extract_experience(resume_text)  # ✅ Get experience text & years
-    experience_years = experience_data["years_of_experience"]  # ✅ Extract only years
-    experience_score = 20 if experience_years >= 3 else 10 if experience_years >= 1 else 5  # ✅ Fix TypeError
-
-    # 3️⃣ **Readability Score (20%)**
-    readability = textstat.flesch_reading_ease(resume_text)
-    readability_score = 20 if readability > 50 else 10 if readability > 30 else 5
-
-    # 4️⃣ **Skill Relevance (20%)**
-    matched_skills = len(set(extracted_skills).intersection(set(industry_keywords)))
-    skill_score = (matched_skills / len(industry_keywords)) * 20
-
-    # 5️⃣ **ATS Compliance (20%)**
-    ats_keywords = ["education", "experience", "skills", "projects", "certifications"]
-    ats_score = sum(1 for word in ats_keywords if word.lower() in resume_text.lower())
-    ats_score = (ats_score / len(ats_keywords)) * 20
-
-    # ✅ Calculate Final Score (Out of 100)
-    final_score = keyword_score + experience_score + readability_score + skill_score + ats_score
-    return round(final_score, 2)
-
-
-def display_resume_preview(user_data):
+# ✅ Hidden admin panel: stage timings, counters, cache hit rates and profiler output
+if st.session_state.username in ADMIN_USERS:
+    with st.sidebar.expander("🛠️ Pipeline metrics"):
+        if not metrics.ENABLED:
+            st.caption("Set RESUME_METRICS=1 to record stage timings and counters.")
+        snapshot = metrics.snapshot()
+        if snapshot["stages"]:
+            st.table([{"stage": name, **stage} for name, stage in snapshot["stages"].items()])
+        st.json({"counters": snapshot["counters"], "caches": snapshot["collectors"]})
+        st.download_button("Prometheus metrics", metrics.prometheus_text(), file_name="metrics.prom", mime="text/plain")
+        profiler = metrics.get_profiler()
+        if profiler is not None:
+            st.caption(f"Hottest stacks ({profiler.samples} samples)")
+            st.code("\n".join(f"{count:>6}  {stack[-120:]}" for stack, count in profiler.top(10)))
+        if st.button("Reset metrics"):
+            metrics.reset()
+
+def display_resume_preview(draft):
     st.markdown("### 📄 Live Resume Preview")
     st.markdown("---")
-    st.markdown(f"**👤 Name:** {user_data.get('NAME', 'Your Name')}")
-    st.markdown(f"📧 **Email:** {user_data.get('EMAIL', 'your.email@example.com')}")
-    st.markdown(f"📞 **Phone:** {user_data.get('PHONE', '123-456-7890')}")
-    st.markdown(f"🎓 **Education:** {user_data.get('EDUCATION', 'Your Degree, University Name')}")
-    st.markdown(f"💼 **Experience:** {user_data.get('EXPERIENCE', 'Your work experience details...')}")
-    st.markdown(f"🛠 **Skills:** {user_data.get('SKILLS', 'List your skills...')}")
-    st.markdown(f"🏆 **Certifications:** {user_data.get('CERTIFICATIONS', 'Your certifications...')}")
+    # ✅ Preview lines are rebuilt by the draft only when their field changes
+    for line in draft.preview.values():
+        st.markdown(line)
     st.markdown("---")
-    
-import re
 
-import re
 
-def extract_experience(text):
+def wait_for_task(task_id, show_progress):
     """
-    Extracts the full experience section and calculates years of experience.
-
-    Parameters:
-    text (str): Resume text.
-
-    Returns:
-    dict: {
-        "experience_text": Full extracted experience section or "Experience not found",
-        "years_of_experience": Number of years found (int, default 0)
-    }
+    The result of a background task (task_queue.py). While it runs, its partial result is shown
+    with show_progress(progress) and the page reruns every TASK_POLL_SECONDS, so nothing below
+    this call runs yet. Returns None, after showing the error, if the task failed.
     """
-
-    # ✅ Define common headers that indicate work experience sections
-    experience_headers = [
-        "Work Experience/Internships", "work experience", "professional experience", 
-        "employment history", "career summary", "job experience", "experience"
-    ]
-
-    # ✅ Regex pattern to detect the experience section
-    experience_pattern = r"(?:{})\s*(?:[:\-]?\s*)\n?(.*?)(?:\n\s*\n|\Z)".format("|".join(experience_headers))
-    matches = re.findall(experience_pattern, text, re.IGNORECASE | re.DOTALL)
-
-    extracted_experience = matches[0].strip() if matches else "Experience not found"
-
-    # ✅ Extract number of years from the experience section
-    years_pattern = r"(\d+)\s*(?:years?|yrs?)"
-    years_match = re.findall(years_pattern, extracted_experience, re.IGNORECASE)
-
-    years_of_experience = max(map(int, years_match)) if years_match else 0  # Take the highest year found
-
-    return {
-        "experience_text": extracted_experience,
-        "years_of_experience": years_of_experience
-    }
-
-# ✅ Example Usage:
-resume_text = """ 
-Work Experience
-Software Engineer at XYZ Corp (2018 - Present)
-- Developed machine learning models for fraud detection.
-- Optimized SQL queries to improve database performance.
-- Led a team of 5 developers for AI-driven automation projects.
-Worked as Data Analyst for 3 years in ABC Ltd.
-"""
-extracted_data = extract_experience(resume_text)
-print("Extracted Experience Section:\n", extracted_data["experience_text"])
-print("Extracted Years of Experience:", extracted_data["years_of_experience"])
-
-# Function to convert DOCX to PDF
-def convert_docx_to_pdf(doc, pdf_path):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    for para in doc.paragraphs:
-        pdf.multi_cell(200, 10, txt=para.text.encode("latin-1", "ignore").decode("latin-1"), align='L')
-    pdf.output(pdf_path)
+    from task_queue import get_task_queue
+
+    task = get_task_queue().status(task_id)
+    if task is None or task["status"] == "failed":
+        st.error(f"❌ Background task failed: {task['error'] if task else 'it has expired'}. Try again.")
+        return None
+    if task["status"] != "done":
+        show_progress(task["progress"])
+        time.sleep(TASK_POLL_SECONDS)
+        st.rerun()
+    return task["result"]
+
+
+def show_analysis_progress(progress):
+    st.info(f"⏳ Analyzing your resume… {progress.get('pages', 0)} page(s) read")
+    if progress.get("skills"):
+        st.write("**Skills found so far:**", progress["skills"])
+
+
+def analyze_in_background(upload):
+    """Resume Analyzer result for an upload: from the result cache, else from a background worker."""
+    from cache import digest_key, get_result_cache
+    from task_queue import submit_analysis
+
+    analysis = get_result_cache().get(digest_key(upload.digest))
+    if analysis is not None:
+        return analysis
+    # ✅ Submitted once per file and session; identical uploads from other sessions share the task
+    tasks = st.session_state.setdefault("analysis_tasks", {})
+    if upload.digest not in tasks:
+        tasks[upload.digest] = submit_analysis(upload)
+    analysis = wait_for_task(tasks[upload.digest], show_analysis_progress)
+    if analysis is None:
+        del tasks[upload.digest]  # submitted again on the next run
+        st.stop()
+    return analysis
+
+
+def show_job_progress(progress):
+    sources = progress.get("sources", [])
+    st.info("⏳ Searching job boards…" + (f" {', '.join(s.title() for s in sources)} done" if sources else ""))
+    for job in progress.get("jobs", []):
+        st.write(f"**{job['title']}** at **{job['company']}**")
 
 if not os.path.exists(TEMPLATE_PATH):
     os.makedirs(TEMPLATE_PATH)
 
 # ✅ Sidebar Navigation
 st.sidebar.title("🔍 Navigation")
-option = st.sidebar.radio("Choose an option:", ["Resume Analyzer", "Get Job Recommendations", "Resume Generator"])
+option = st.sidebar.radio("Choose an option:", ["Resume Analyzer", "Get Job Recommendations", "Resume Generator", "Search Candidates"])
 if option == "Resume Generator":
     st.title("📝 Generate your own resume")
 
@@ -503,7 +295,19 @@ elif option == "Resume Analyzer":
 elif option == "Get Job Recommendations":
     st.title("🔍 Get Job Recommendations")
 
+elif option == "Search Candidates":
+    st.title("🗂️ Search Candidates")
+
 if option == "Resume Generator":
+    from generator import ResumeDraft
+    from previews import get_preview_cache
+    from uploads import current_session_id, get_session_memory
+
+    # ✅ One draft per session: unchanged fields and unchanged inputs are not re-rendered
+    if "resume_draft" not in st.session_state:
+        st.session_state.resume_draft = ResumeDraft()
+    draft = st.session_state.resume_draft
+
     st.subheader("📝 Create a Resume Using Templates")
     templates = [f for f in os.listdir(TEMPLATE_PATH) if f.endswith(".docx")]
     if templates:
@@ -511,53 +315,81 @@ if option == "Resume Generator":
         
         # ✅ Show Template Preview
         template_path = os.path.join(TEMPLATE_PATH, selected_template)
-        # preview_image = convert_docx_to_image(template_path)
-        
-        # if preview_image:
-        #    st.image(preview_image, caption="Template Preview", use_column_width=True)
-        # else:
-          #  st.warning("⚠️ Could not generate a preview for this template.")
-
-        user_data = {key: st.text_input(key) for key in ["NAME", "EMAIL", "PHONE", "SKILLS", "EXPERIENCE", "EDUCATION", "CERTIFICATIONS"]}
+        # ✅ Thumbnails are rendered once in the background and cached by template hash
+        previews = get_preview_cache()
+        if "previews_warmed" not in st.session_state:
+            previews.warm(TEMPLATE_PATH)
+            st.session_state.previews_warmed = True
+        preview_image = previews.get(template_path)
+
+        if preview_image:
+            st.image(preview_image, caption="Template Preview", use_column_width=True)
+        elif previews.error(template_path):
+            st.warning("⚠️ Could not generate a preview for this template.")
+        else:
+            st.info("⏳ Preview is being generated, it will show up on the next refresh.")
+
+        # ✅ Fields live in a form, so typing doesn't rerun the app; Enter or either button applies them all at once
+        with st.form("resume_fields"):
+            user_data = {key: st.text_input(key) for key in ["NAME", "EMAIL", "PHONE", "SKILLS", "EXPERIENCE", "EDUCATION", "CERTIFICATIONS"]}
+            st.form_submit_button("Update Preview")
+            generate = st.form_submit_button("Generate Resume")  # submits what was typed before rendering
+        draft.update(user_data)
         
         # Display Live Resume Preview
-        display_resume_preview(user_data)
-
-        if st.button("Generate Resume"):
-            updated_doc = fill_template(template_path, user_data)
-            docx_path = "Generated_Resume.docx"
-            updated_doc.save(docx_path)
+        display_resume_preview(draft)
 
-            pdf_path = "Generated_Resume.pdf"
-            convert_docx_to_pdf(updated_doc, pdf_path)
-
-            # ✅ Fix file download by using BytesIO
-            with open(docx_path, "rb") as docx_file:
-                docx_bytes = io.BytesIO(docx_file.read())
-                st.download_button("Download Resume (DOCX)", docx_bytes, file_name="Generated_Resume.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-
-            with open(pdf_path, "rb") as pdf_file:
-                pdf_bytes = io.BytesIO(pdf_file.read())
-                st.download_button("Download Resume (PDF)", pdf_bytes, file_name="Generated_Resume.pdf", mime="application/pdf")
+        if generate:
+            # ✅ Rendered in memory, and reused until the template or a field changes
+            rendered = draft.render(template_path)
+        else:
+            rendered = draft.cached(template_path)
+        # ✅ Rendered files count against this session's memory budget and are dropped when it runs out
+        get_session_memory().put(current_session_id(), "resume_draft", draft, draft.nbytes, on_evict=draft.drop_renders)
+        if rendered:
+            st.download_button("Download Resume (DOCX)", rendered["docx"], file_name="Generated_Resume.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+            st.download_button("Download Resume (PDF)", rendered["pdf"], file_name="Generated_Resume.pdf", mime="application/pdf")
     else:
         st.warning("No resume templates found! Upload DOCX templates in 'templates/' folder.")
 
 
 elif option == "Resume Analyzer":
+    from cache import digest_key
+    from result_store import get_result_store
+    from skill_matcher import get_taxonomy
+    from uploads import UploadRejected, session_upload
+
     uploaded_file = st.file_uploader("Upload Your Resume (PDF)", type=["pdf"])
     
     if uploaded_file:
-        resume_text = extract_text_from_pdf(uploaded_file)
-        extracted_skills = extract_skills(resume_text)
-        extracted_experience = extract_experience(resume_text)
-
-        st.write("**Extracted Skills:**", extracted_skills)
+        # ✅ Size and page limits are enforced; large files are spooled to disk once and parsed through mmap
+        try:
+            upload = session_upload(uploaded_file, slot="analyzer_upload")
+        except UploadRejected as exc:
+            st.error(f"❌ {exc}")
+            st.stop()
+
+        # ✅ Cached by file hash, so reruns and re-uploads skip PDF parsing; new files are parsed by a worker
+        analysis = analyze_in_background(upload)
+        extracted_skills = analysis["skills"]
+        extracted_experience = analysis["experience"]
+
+        st.write("**Extracted Skills:**", get_taxonomy().by_category(extracted_skills))  # ✅ grouped as in skills.yaml
         st.write("**Extracted Experience:**", extracted_experience)
 
         # ✅ Calculate Resume Score
-        resume_score = score_resume(resume_text, extracted_skills)
+        resume_score = analysis["score"]
         st.subheader(f"📊 Your Resume Score: {resume_score}/100")
 
+        # ✅ Keep the result so past candidates can be searched: added once per file and session, not on every
+        # rerun, and keyed by user too, so a file two users upload shows up in both users' searches
+        stored = st.session_state.setdefault("stored_results", set())
+        if upload.digest not in stored:
+            get_result_store().add(f"{st.session_state.username}:{digest_key(upload.digest)}", uploaded_file.name,
+                                   st.session_state.username, extracted_skills,
+                                   extracted_experience["years_of_experience"], resume_score)
+            stored.add(upload.digest)
+
         # ✅ Show Score Interpretation
         if resume_score >= 80:
             st.success("🔥 Excellent Resume! Ready for job applications.")
@@ -569,11 +401,19 @@ elif option == "Resume Analyzer":
 
 # ============================= JOB RECOMMENDATIONS =============================
 elif option == "Get Job Recommendations":
+    from job_index import get_job_index
+    from task_queue import submit_recommendations
+    from uploads import UploadRejected, session_upload
+
     uploaded_file = st.file_uploader("Upload Your Resume (PDF) to Get Job Recommendations", type=["pdf"])
 
     if uploaded_file:
-        resume_text = extract_text_from_pdf(uploaded_file)
-        extracted_skills = extract_skills(resume_text)
+        try:
+            upload = session_upload(uploaded_file, slot="jobs_upload")
+        except UploadRejected as exc:
+            st.error(f"❌ {exc}")
+            st.stop()
+        extracted_skills = analyze_in_background(upload)["skills"]
 
         # ✅ Store extracted skills in session state
         st.session_state.extracted_skills = extracted_skills
@@ -582,12 +422,24 @@ elif option == "Get Job Recommendations":
 
     # ✅ Ensure extracted skills exist before proceeding
     if st.session_state.extracted_skills:
-        jobs = fetch_jobs_from_multiple_sources(",".join(st.session_state.extracted_skills), num_jobs=10)
+        # ✅ Scraped by a background worker; boards show up as they answer, and reruns don't restart the search
+        recommendations = wait_for_task(submit_recommendations(st.session_state.extracted_skills, num_jobs=10),
+                                        show_job_progress)
+        if recommendations is None:
+            st.stop()
+        jobs = recommendations["jobs"]
+
+        # ✅ Keep every scraped job in the persistent index and show the best matches first
+        job_index = get_job_index()
+        job_index.add_jobs(jobs)
+        jobs = [job for job, score in job_index.rank(st.session_state.extracted_skills, jobs)]
 
         st.subheader("🔍 Recommended Job Listings from Multiple Websites")
         if jobs:
             for job in jobs:
                 st.write(f"**{job['title']}** at **{job['company']}**")
+                if len(job.get("sources", [])) > 1:
+                    st.caption("Listed on " + ", ".join(source.title() for source in job["sources"]))
                 st.markdown(f"[Apply Here]({job['link']})", unsafe_allow_html=True)
         else:
             st.warning("No jobs found based on your skills.")
@@ -595,3 +447,27 @@ elif option == "Get Job Recommendations":
         st.warning("⚠️ Please upload a resume to get job recommendations.")
 
 
+# ============================= CANDIDATE SEARCH =============================
+elif option == "Search Candidates":
+    from result_store import get_result_store
+
+    store = get_result_store()
+    # ✅ Admins search every user's resumes, everyone else only the ones they analyzed
+    admin = st.session_state.username in ADMIN_USERS
+    owner = None if admin else st.session_state.username
+    st.write(f"**{len(store.query(owner=owner))} analyzed resumes**")
+    required_skills = st.multiselect("Must have all of these skills", store.skill_names)
+    min_years = st.number_input("Minimum years of experience", min_value=0, max_value=50, value=0)
+    min_score = st.slider("Minimum resume score", 0, 100, 0)
+
+    # ✅ Answered from skill posting lists and score/years columns, so this stays fast with many resumes
+    rows = store.query(all_skills=required_skills, min_years=min_years or None, min_score=min_score or None,
+                       owner=owner)
+    st.caption(f"{len(rows)} matching resumes, best 100 shown")
+    candidates = store.fetch(store.top(rows, 100))
+    if candidates:
+        st.dataframe([{"Resume": c["source"], "Score": c["score"], "Years": c["years"],
+                       "Skills": ", ".join(c["skills"]), **({"Uploaded by": c["owner"]} if admin else {})}
+                      for c in candidates], use_container_width=True)
+    else:
+        st.info("No analyzed resumes match these filters.")
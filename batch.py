@@ -0,0 +1,182 @@
+"""
+Headless batch Resume Analyzer: runs the same pipeline as the Streamlit
+"Resume Analyzer" page over many resumes on a process pool.
+
+Usage:
+    python batch.py resumes/ -o results.jsonl --workers 8
+    python batch.py resumes.zip more/one.pdf -o results.parquet
+
+From Python:
+    from batch import analyze_batch
+    for result in analyze_batch(["resumes/"], workers=8):
+        ...
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from multiprocessing import Pool
+
+from analyzer import analyze_resume
+
+PARQUET_ROW_GROUP = 500
+
+
+def iter_resumes(sources):
+    """
+    Yields (name, path, member) for every PDF found in `sources`, which may be
+    directories (searched recursively), .zip archives or single PDF files.
+    `member` is the archive member name, or None for plain files.
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".pdf"):
+                        path = os.path.join(root, name)
+                        yield path, path, None
+        elif zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                members = [info.filename for info in archive.infolist()
+                           if not info.is_dir() and info.filename.lower().endswith(".pdf")]
+            for member in members:
+                yield f"{source}:{member}", source, member
+        else:
+            yield source, source, None
+
+
+def _analyze_one(item):
+    # Runs in a worker process; archive members are read there so the parent never holds the PDFs in memory.
+    name, path, member = item
+    start = time.perf_counter()
+    try:
+        if member is None:
+            result = analyze_resume(path)
+        else:
+            with zipfile.ZipFile(path) as archive:
+                result = analyze_resume(io.BytesIO(archive.read(member)))
+        error = None
+    except Exception as exc:  # one broken PDF must not stop the batch
+        result, error = {}, f"{type(exc).__name__}: {exc}"
+    return {"source": name, **result, "error": error, "seconds": round(time.perf_counter() - start, 4)}
+
+
+def analyze_batch(paths, workers=None, chunksize=1):
+    """
+    Analyzes every resume under `paths` and yields one result dict per resume
+    as soon as it finishes (completion order, not input order).
+
+    Parameters:
+    paths (list): Directories, .zip archives or PDF files.
+    workers (int): Worker processes (default: CPU count). 1 runs inline without a pool.
+    chunksize (int): Resumes handed to a worker at a time.
+    """
+    items = iter_resumes(paths)
+    if workers == 1:
+        for item in items:
+            yield _analyze_one(item)
+        return
+    with Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(_analyze_one, items, chunksize=chunksize)
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.file = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ParquetWriter:
+    """Buffers results and flushes them as Parquet row groups while the batch is still running."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise SystemExit("Parquet output needs pyarrow (pip install pyarrow), or use a .jsonl output.") from exc
+        self.pa = pa
+        self.schema = pa.schema([
+            ("source", pa.string()),
+            ("skills", pa.list_(pa.string())),
+            ("experience_text", pa.string()),
+            ("years_of_experience", pa.int64()),
+            ("score", pa.float64()),
+            ("error", pa.string()),
+            ("seconds", pa.float64()),
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.rows = []
+
+    def write(self, record):
+        self.rows.append(record)
+        if len(self.rows) >= PARQUET_ROW_GROUP:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_writer(path):
+    return ParquetWriter(path) if path.endswith(".parquet") else JsonlWriter(path)
+
+
+def run_batch(paths, output="-", workers=None, chunksize=1, progress=True):
+    """Streams analyze_batch() into `output` and returns throughput stats."""
+    writer = open_writer(output)
+    count = errors = 0
+    start = last_report = time.perf_counter()
+    try:
+        for result in analyze_batch(paths, workers=workers, chunksize=chunksize):
+            writer.write(result)
+            count += 1
+            errors += result["error"] is not None
+            now = time.perf_counter()
+            if progress and now - last_report >= 1:
+                print(f"\r{count} resumes, {count / (now - start):.1f} resumes/s", end="", file=sys.stderr)
+                last_report = now
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    stats = {
+        "resumes": count,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "resumes_per_second": round(count / elapsed, 2) if elapsed else 0.0,
+    }
+    if progress:
+        print(f"\r{count} resumes ({errors} errors) in {elapsed:.2f}s, "
+              f"{stats['resumes_per_second']} resumes/s", file=sys.stderr)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze many resumes without the Streamlit UI.")
+    parser.add_argument("paths", nargs="+", help="PDF files, directories or .zip archives")
+    parser.add_argument("-o", "--output", default="-", help="results file (.jsonl or .parquet), default stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=1, help="resumes sent to a worker at a time")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress output")
+    args = parser.parse_args(argv)
+    run_batch(args.paths, args.output, workers=args.workers, chunksize=args.chunksize, progress=not args.quiet)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Scores 10k synthetic resumes with score_resume() in a loop and with
+bulk_scoring.score_resumes() in one call, checks the scores are identical and
+prints the timings.
+
+Run from the repo root:  python benchmarks/bench_bulk_scoring.py [--resumes 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import extract_experience, extract_skills, score_resume  # noqa: E402
+from bulk_scoring import score_resumes  # noqa: E402
+from skill_matcher import SKILLS_LIST, get_taxonomy  # noqa: E402
+
+ATS_SECTIONS = get_taxonomy().ats_sections
+INDUSTRY_KEYWORDS = get_taxonomy().industry_keywords
+
+FILLER = ("Designed and delivered reporting for the finance team. Improved the quality of customer data. "
+          "Worked with stakeholders across regions. Built internal tools used every day.").split(". ")
+
+
+def make_resume(rng):
+    lines = ["Jane Doe"]
+    for section in rng.sample(ATS_SECTIONS, rng.randint(1, len(ATS_SECTIONS))):
+        lines.append(section.title())
+        if section == "experience":
+            lines.append(f"Analyst at ABC Ltd for {rng.randint(0, 8)} years")
+        for _ in range(rng.randint(2, 8)):
+            words = rng.sample(SKILLS_LIST, 3) + rng.sample(INDUSTRY_KEYWORDS, rng.randint(0, 2))
+            lines.append(f"{rng.choice(FILLER)} using {', '.join(words)}.")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [make_resume(rng) for _ in range(args.resumes)]
+    skills = [extract_skills(text) for text in texts]
+    years = [extract_experience(text)["years_of_experience"] for text in texts]
+
+    start = time.perf_counter()
+    expected = [score_resume(text, skill_list) for text, skill_list in zip(texts, skills)]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected_with_years = [score_resume(text, s, y) for text, s, y in zip(texts, skills, years)]
+    loop_years_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = score_resumes(texts, skills, years)
+    bulk_s = time.perf_counter() - start
+
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    bulk_parallel = score_resumes(texts, skills, years, workers=workers)
+    bulk_parallel_s = time.perf_counter() - start
+
+    assert expected == expected_with_years == bulk["score"].tolist() == bulk_parallel["score"].tolist(), \
+        "bulk scores differ from score_resume"
+    print(f"{args.resumes} resumes, scores identical")
+    print(f"score_resume loop:                 {loop_s:8.2f} s")
+    print(f"score_resume loop, years supplied: {loop_years_s:8.2f} s")
+    print(f"score_resumes bulk:                {bulk_s:8.2f} s")
+    print(f"score_resumes bulk, {workers:>2} workers:    {bulk_parallel_s:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
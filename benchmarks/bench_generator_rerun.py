@@ -0,0 +1,96 @@
+"""
+Rerun cost of the Resume Generator page while a user fills in the form,
+measured with Streamlit's AppTest: how many script reruns one editing session
+triggers, the script time per rerun and per edited field, and the cost of
+pressing "Generate Resume" repeatedly with unchanged inputs.
+
+Streamlit's server caches the compiled script between reruns, AppTest does not;
+the script cache is shared here so the numbers match a real server.
+
+Run from the repo root:  python benchmarks/bench_generator_rerun.py [--app app.py] [--sessions 10]
+Compare with an older version:  git show <rev>:app.py > old_app.py && python benchmarks/bench_generator_rerun.py --app old_app.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.runtime.scriptrunner import script_runner  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.testing.v1 import AppTest, local_script_runner  # noqa: E402
+
+FIELDS = ["NAME", "EMAIL", "PHONE", "SKILLS", "EXPERIENCE", "EDUCATION", "CERTIFICATIONS"]
+
+script_ms = []
+
+
+def record_script_time():
+    shared_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: shared_cache
+    run_script = script_runner.ScriptRunner._run_script
+
+    def timed_run_script(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return run_script(self, *args, **kwargs)
+        finally:
+            script_ms.append((time.perf_counter() - start) * 1000)
+
+    script_runner.ScriptRunner._run_script = timed_run_script
+
+
+def field_inputs(at):
+    return {widget.label: widget for widget in at.text_input if widget.label in FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--sessions", type=int, default=10, help="editing sessions of all seven fields")
+    parser.add_argument("--generate", type=int, default=5, help="Generate Resume clicks with unchanged inputs")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    record_script_time()
+    at = AppTest.from_file(args.app, default_timeout=120)
+    at.run()
+    at.session_state.logged_in = True
+    at.session_state.username = "bench"
+    at.run()
+    at.sidebar.radio[0].set_value("Resume Generator").run()
+
+    # One session = type a value into each field. The old page reruns after
+    # each field; with a form the values are only sent on submit.
+    submit = next((button for button in at.get("button") if button.label == "Update Preview"), None)
+    script_ms.clear()
+    for session in range(args.sessions):
+        for field in FIELDS:
+            field_inputs(at)[field].set_value(f"{field.lower()} {session}")
+            if submit is None:
+                at.run()
+        if submit is not None:
+            next(b for b in at.get("button") if b.label == "Update Preview").click().run()
+    edit_ms = list(script_ms)
+    edits = args.sessions * len(FIELDS)
+
+    script_ms.clear()
+    for _ in range(args.generate):
+        next(button for button in at.button if button.label == "Generate Resume").click().run()
+    generate_ms = list(script_ms)
+    assert not at.exception, [e.value for e in at.exception]
+
+    print(f"app: {os.path.relpath(args.app, ROOT)}")
+    print(f"field edits:                  {edits}")
+    print(f"reruns:                       {len(edit_ms)} ({len(edit_ms) / edits:.2f} per edit)")
+    print(f"script time per rerun:        {statistics.median(edit_ms):8.2f} ms (median)")
+    print(f"script time per edit:         {sum(edit_ms) / edits:8.2f} ms")
+    print(f"Generate Resume, first click: {generate_ms[0]:8.2f} ms")
+    print(f"Generate Resume, repeats:     {statistics.median(generate_ms[1:]):8.2f} ms (median, inputs unchanged)")
+
+
+if __name__ == "__main__":
+    main()
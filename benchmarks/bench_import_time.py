@@ -0,0 +1,57 @@
+"""
+Cold import time of the app's modules, measured with `python -X importtime` in
+a fresh interpreter per module, checked against targets for the analyzer path.
+
+Run from the repo root:  python benchmarks/bench_import_time.py
+Exits non-zero if a module with a target is over it.
+"""
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module: target cumulative import time in ms (None = report only)
+MODULES = {
+    "metrics": 10,
+    "skill_matcher": 20,
+    "sections": 20,
+    "analyzer": 50,   # cold start of the Resume Analyzer core
+    "cache": 80,      # analyzer + the result cache the analyzer page imports
+    "batch": 100,
+    "jobs": None,
+    "job_index": None,
+    "generator": None,
+    "bulk_scoring": None,
+}
+
+
+def import_time_ms(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    # last line is the module itself: "import time: self | cumulative | name"
+    for line in reversed(result.stderr.splitlines()):
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)", line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+def main():
+    failed = []
+    print(f"{'module':<15}{'import (ms)':>12}{'target':>9}")
+    for module, target in MODULES.items():
+        elapsed = min(import_time_ms(module) for _ in range(3))
+        status = "" if target is None else ("ok" if elapsed <= target else "OVER")
+        print(f"{module:<15}{elapsed:>12.1f}{target if target else '-':>9}  {status}")
+        if status == "OVER":
+            failed.append(module)
+    if failed:
+        sys.exit(f"over target: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
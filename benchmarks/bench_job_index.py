@@ -0,0 +1,85 @@
+"""
+Top-k query latency of the persistent job index against a large synthetic job
+corpus (default 100k jobs), compared with refitting TF-IDF and running a full
+cosine_similarity per call like the old match_resumes_to_jobs did.
+
+Run from the repo root:  python benchmarks/bench_job_index.py [--jobs 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.metrics.pairwise import cosine_similarity  # noqa: E402
+
+from job_index import JobIndex  # noqa: E402
+from skill_matcher import SKILLS_LIST  # noqa: E402
+
+ROLES = ["Engineer", "Developer", "Analyst", "Scientist", "Manager", "Consultant", "Architect", "Specialist"]
+LEVELS = ["Junior", "Senior", "Lead", "Principal", "Staff", ""]
+
+
+def make_jobs(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"{rng.choice(LEVELS)} {' '.join(rng.sample(SKILLS_LIST, 2))} {rng.choice(ROLES)}".strip(),
+            "company": f"Company {rng.randrange(5000)}",
+            "link": f"https://example.com/jobs/{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    rng = random.Random(1)
+    resumes = [rng.sample(SKILLS_LIST, 8) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as path:
+        start = time.perf_counter()
+        index = JobIndex(path)
+        index.fit(jobs[: args.jobs // 2])
+        for i in range(args.jobs // 2, args.jobs, 5_000):  # incremental appends, like repeated scrapes
+            index.add_jobs(jobs[i:i + 5_000])
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = JobIndex(path)  # reopen: memory-maps the segments
+        open_ms = (time.perf_counter() - start) * 1000
+
+        latencies = []
+        for skills in resumes:
+            start = time.perf_counter()
+            index.query(skills, k=10)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    titles = [job["title"] for job in jobs]
+    start = time.perf_counter()
+    for skills in resumes[:3]:
+        matrix = TfidfVectorizer().fit_transform([" ".join(skills)] + titles)
+        cosine_similarity(matrix[0], matrix[1:])
+    refit_ms = (time.perf_counter() - start) / 3 * 1000
+
+    latencies.sort()
+    print(f"jobs indexed:           {len(index):>10}")
+    print(f"build + appends:        {build_s:>10.2f} s")
+    print(f"reopen index:           {open_ms:>10.1f} ms")
+    print(f"query p50:              {statistics.median(latencies):>10.2f} ms")
+    print(f"query p95:              {latencies[int(len(latencies) * 0.95) - 1]:>10.2f} ms")
+    print(f"refit + full cosine:    {refit_ms:>10.1f} ms per call (old approach)")
+
+
+if __name__ == "__main__":
+    main()
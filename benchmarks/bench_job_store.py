@@ -0,0 +1,114 @@
+"""
+Deduplication quality and cost of the job store on a synthetic syndicated feed:
+each posting appears on 1-3 boards with board-specific noise (tracking URLs,
+"Sr." vs "Senior", punctuation, company suffixes, extra words). Reports how many
+raw jobs collapse into clusters, pairwise precision/recall against the true
+postings, upsert throughput, and match_resumes_to_jobs time on the raw list vs
+the deduplicated store.
+
+Run from the repo root:  python benchmarks/bench_job_store.py [--postings 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_index import JobIndex, match_resumes_to_jobs  # noqa: E402
+from job_store import JobStore  # noqa: E402
+from skill_matcher import SKILLS_LIST  # noqa: E402
+
+LEVELS = ["Senior", "Junior", "Lead", "Principal", ""]
+ROLES = ["Engineer", "Developer", "Analyst", "Data Scientist", "Manager", "Consultant"]
+BOARDS = {"indeed": "https://www.indeed.com/viewjob?jk={id}&utm_source=feed&from=serp",
+          "linkedin": "https://www.linkedin.com/jobs/view/{id}/?trk=public_jobs",
+          "glassdoor": "https://www.glassdoor.com/job-listing/{id}?src=GD_JOB_AD&ao=1136043"}
+
+
+def make_feed(postings, seed=0):
+    """[(job, true posting id)] for `postings` postings, each syndicated on 1-3 boards."""
+    rng = random.Random(seed)
+    feed = []
+    for posting in range(postings):
+        level, role = rng.choice(LEVELS), rng.choice(ROLES)
+        skill = rng.choice(SKILLS_LIST)
+        company = f"Company {rng.randrange(postings // 4 + 1)}"
+        for board in rng.sample(list(BOARDS), rng.randint(1, 3)):
+            title = f"{level} {skill} {role}".strip()
+            if rng.random() < 0.3:
+                title = title.replace("Senior", "Sr.").replace("Junior", "Jr.")
+            if rng.random() < 0.3:
+                title = f"{title} - Remote"
+            if rng.random() < 0.3:
+                title = title.upper()
+            name = company + rng.choice(["", " Inc.", ", LLC", " Ltd"])
+            link = BOARDS[board].format(id=f"{board[:2]}{posting}")
+            feed.append(({"title": title, "company": name, "link": link}, posting, board))
+    rng.shuffle(feed)
+    return feed
+
+
+def pairwise_scores(labels, truth):
+    """Pairwise precision and recall of predicted clusters against the true postings."""
+    def pairs(groups):
+        members = defaultdict(list)
+        for i, group in enumerate(groups):
+            members[group].append(i)
+        return {pair for items in members.values() for pair in combinations(items, 2)}
+
+    predicted, actual = pairs(labels), pairs(truth)
+    both = len(predicted & actual)
+    return (both / len(predicted) if predicted else 1.0), (both / len(actual) if actual else 1.0)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--postings", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    feed = make_feed(args.postings, args.seed)
+    raw = [job for job, _, _ in feed]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(os.path.join(tmp, "jobs.sqlite"))
+        start = time.perf_counter()
+        for job, _, board in feed:
+            store.upsert([job], query="bench", source=board)
+        upsert_s = time.perf_counter() - start
+        again = time.perf_counter()
+        store.upsert(raw, query="bench")  # a full re-scrape: every URL is known
+        rescrape_s = time.perf_counter() - again
+
+        clusters = dict(store.db.execute("SELECT link, cluster FROM jobs").fetchall())
+        precision, recall = pairwise_scores([clusters[job["link"]] for job in raw], [posting for _, posting, _ in feed])
+
+        index = JobIndex(os.path.join(tmp, "index"))
+        index.fit(raw)
+        skills = random.Random(1).sample(SKILLS_LIST, 8)
+        start = time.perf_counter()
+        match_resumes_to_jobs(skills, raw, index=index)
+        raw_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        deduplicated = store.jobs()
+        read_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        match_resumes_to_jobs(skills, deduplicated, index=index)
+        store_ms = (time.perf_counter() - start) * 1000
+
+    print(f"scraped jobs:           {len(raw)} ({args.postings} real postings)")
+    print(f"after deduplication:    {len(deduplicated)}")
+    print(f"pairwise precision:     {precision:.3f}")
+    print(f"pairwise recall:        {recall:.3f}")
+    print(f"first upsert:           {len(raw) / upsert_s:8.0f} jobs/s")
+    print(f"re-scrape upsert:       {len(raw) / rescrape_s:8.0f} jobs/s (all URLs known)")
+    print(f"match_resumes_to_jobs:  {raw_ms:8.1f} ms on the raw list, {store_ms:.1f} ms on the store's jobs "
+          f"(+{read_ms:.1f} ms to read them)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Throughput of the OCR fallback on a batch of scanned (image-only) PDFs:
+pages/s with a cold OCR cache for 1 and N workers, then again with a warm cache.
+
+Run from the repo root:  python benchmarks/bench_ocr.py [--pages 100] [--pages-per-doc 5] [--stub]
+--stub replaces Tesseract with an engine that burns --stub-ms of CPU per page
+and returns canned text, for machines without Tesseract; it measures the
+fallback's own overhead and parallelism, not OCR quality.
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import extract_skills, iter_pdf_pages  # noqa: E402
+from cache import ResultCache  # noqa: E402
+from ocr import EmbeddedImageRasterizer, OcrFallback, TesseractEngine  # noqa: E402
+
+LINES = ["Jane Doe", "Skills", "Python, SQL, Machine Learning, Power BI", "Work Experience",
+         "Data Analyst at ABC Ltd for 4 years", "Education", "BSc Computer Science"]
+
+
+class StubEngine:
+    def __init__(self, cpu_ms):
+        self.cpu_ms = cpu_ms
+
+    def image_to_text(self, image):
+        deadline = time.process_time() + self.cpu_ms / 1000
+        while time.process_time() < deadline:
+            pass
+        return "\n".join(LINES)
+
+
+def make_scanned_pdf(pages, doc_number):
+    """A PDF whose pages are only images of text, like a scanner produces."""
+    from PIL import Image, ImageDraw
+
+    images = []
+    for page in range(pages):
+        image = Image.new("L", (1275, 1650), 255)  # US Letter at 150 dpi
+        draw = ImageDraw.Draw(image)
+        for i, line in enumerate(LINES + [f"document {doc_number} page {page}"]):
+            draw.text((100, 100 + 40 * i), line, fill=0)
+        images.append(image)
+    buffer = io.BytesIO()
+    images[0].save(buffer, "PDF", save_all=True, append_images=images[1:], resolution=150)
+    return buffer.getvalue()
+
+
+def run(documents, fallback):
+    start = time.perf_counter()
+    pages = skills = 0
+    for data in documents:
+        texts = list(iter_pdf_pages(io.BytesIO(data), max_pages=None, max_bytes=None, ocr=fallback))
+        pages += len(texts)
+        skills += len(extract_skills("\n".join(texts)))
+    return pages, skills, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=100, help="scanned pages in the batch")
+    parser.add_argument("--pages-per-doc", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stub", action="store_true", help="use a CPU-burning stub instead of Tesseract")
+    parser.add_argument("--stub-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    engine = StubEngine(args.stub_ms) if args.stub else TesseractEngine()
+    if not args.stub and not engine.available():
+        sys.exit("Tesseract is not installed (pytesseract + tesseract binary); rerun with --stub")
+    documents = [make_scanned_pdf(args.pages_per_doc, i) for i in range(args.pages // args.pages_per_doc)]
+    print(f"{len(documents)} scanned PDFs, {args.pages_per_doc} pages each, "
+          f"engine: {'stub ' + str(args.stub_ms) + ' ms/page' if args.stub else 'tesseract'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in sorted({0, 1, args.workers}):
+            cache = ResultCache(os.path.join(tmp, f"ocr-{workers}.sqlite"))
+            fallback = OcrFallback(engine, EmbeddedImageRasterizer(), workers=workers,
+                                   page_budget=args.pages_per_doc, cache=cache)
+            pages, skills, cold = run(documents, fallback)
+            cache.memory.clear()  # warm run reads the SQLite tier, like a fresh process would
+            cache.memory_size = 0
+            _, _, warm = run(documents, fallback)
+            fallback.close()
+            print(f"workers {workers:>2}: {pages} pages, {skills} skills found | "
+                  f"cold {pages / cold:7.1f} pages/s | cached {pages / warm:7.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
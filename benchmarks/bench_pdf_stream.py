@@ -0,0 +1,95 @@
+"""
+Time-to-first-result and peak memory of page-by-page PDF analysis on a large
+synthetic PDF, compared with extracting every page up front.
+First checks that SkillScanner finds the same skills as SkillIndex.find() when
+the text arrives one or two words at a time, and exits non-zero if it doesn't.
+
+Run from the repo root:  python benchmarks/bench_pdf_stream.py [--pages 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2  # noqa: E402
+from fpdf import FPDF  # noqa: E402
+
+from analyzer import analyze_resume, iter_pdf_pages  # noqa: E402
+from skill_matcher import SKILLS_LIST, SkillScanner, get_skill_index  # noqa: E402
+
+
+def make_pdf(path, pages, seed=0):
+    rng = random.Random(seed)
+    pdf = FPDF()
+    pdf.set_font("Arial", size=10)
+    pdf.add_page()
+    for line in ["Jane Doe", "Skills", ", ".join(rng.sample(SKILLS_LIST, 12)), "", "Work Experience",
+                 "Data Analyst at ABC Ltd for 4 years", "", "Education", "BSc Computer Science", ""]:
+        pdf.multi_cell(190, 6, txt=line)
+    for _ in range(pages - 1):
+        pdf.add_page()
+        for _ in range(40):  # portfolio filler
+            pdf.multi_cell(190, 6, txt=" ".join(rng.choice(["project", "delivered", "client", "report", rng.choice(SKILLS_LIST)]) for _ in range(14)))
+    pdf.output(path)
+
+
+def check_scanner(seed=0):
+    # Skills of 3+ words split over chunks shorter than the index depth must still be found
+    rng = random.Random(seed)
+    index = get_skill_index()
+    long_skills = [skill for skill in SKILLS_LIST if len(skill.split()) >= 3]
+    words = " ".join(rng.choice(long_skills + ["and", "led", "with"]) for _ in range(200)).split(" ")
+    text = " ".join(words)
+    for size in (1, 2):
+        scanner = SkillScanner(index, separator=" ")
+        for i in range(0, len(words), size):
+            scanner.feed(" ".join(words[i:i + size]))
+        if scanner.matches != index.find(text):
+            sys.exit(f"SkillScanner fed {size}-word chunks differs from SkillIndex.find()")
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    check_scanner()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "portfolio.pdf")
+        make_pdf(path, args.pages)
+
+        def eager_all_pages():
+            reader = PyPDF2.PdfReader(path)
+            return "\n".join([page.extract_text() for page in reader.pages])
+
+        rows = [
+            ("eager extract, all pages", lambda: eager_all_pages()),
+            ("stream: first page text", lambda: next(iter_pdf_pages(path))),
+            ("analyze, no limits", lambda: analyze_resume(path, max_pages=None, max_bytes=None)),
+            ("analyze, default page cap", lambda: analyze_resume(path)),
+            ("analyze, stop at sections", lambda: analyze_resume(path, required_sections=["skills", "experience", "education"])),
+        ]
+        print(f"{args.pages}-page PDF, {os.path.getsize(path) / 1024:.0f} KiB")
+        print(f"{'':28}{'time (ms)':>10}  {'peak (MiB)':>10}")
+        for label, func in rows:
+            _, elapsed, peak = measure(func)
+            print(f"{label:28}{elapsed:>10.1f}  {peak:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
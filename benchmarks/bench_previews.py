@@ -0,0 +1,97 @@
+"""
+Template preview timings: warms the thumbnail cache for every template in
+templates/ on the background pool (cold), then times the page's lookup of
+cached PNG bytes (warm). First checks that a failed conversion is retried
+once its error expires; exits non-zero if not.
+
+Run from the repo root:  python benchmarks/bench_previews.py [--dpi 50] [--stub]
+--stub swaps LibreOffice/Poppler for a converter that draws a blank page with
+Pillow, for machines without them; the cold numbers are then meaningless.
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from previews import PreviewCache  # noqa: E402
+
+
+class StubConverter:
+    def convert(self, docx_bytes, dpi):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (int(8.5 * dpi), 11 * dpi), "white").save(buffer, "PNG")
+        return buffer.getvalue()
+
+
+class FlakyConverter(StubConverter):
+    """Fails the first conversion, as a missing or briefly broken LibreOffice would."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def convert(self, docx_bytes, dpi):
+        self.calls += 1
+        if self.calls == 1:
+            raise OSError("converter unavailable")
+        return super().convert(docx_bytes, dpi)
+
+
+def check_retry(template):
+    with tempfile.TemporaryDirectory() as tmp:
+        previews = PreviewCache(tmp, converter=FlakyConverter(), workers=1, retry_after=0.2)
+        if previews.get(template, timeout=60) is not None or not previews.error(template):
+            sys.exit("FAILED: the first conversion should fail")
+        if previews.get(template, timeout=60) is not None:
+            sys.exit("FAILED: a failed conversion was retried before its error expired")
+        time.sleep(0.3)
+        if previews.get(template, timeout=60) is None or previews.error(template):
+            sys.exit("FAILED: a failed conversion was not retried")
+        previews.pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dpi", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--stub", action="store_true", help="use a Pillow stub instead of LibreOffice")
+    args = parser.parse_args()
+
+    templates = sorted(glob.glob(os.path.join(ROOT, "templates", "*.docx")))
+    check_retry(templates[0])
+    with tempfile.TemporaryDirectory() as tmp:
+        previews = PreviewCache(tmp, converter=StubConverter() if args.stub else None,
+                                dpi=args.dpi, workers=args.workers)
+        start = time.perf_counter()
+        previews.warm(os.path.join(ROOT, "templates"))
+        warm_returned = time.perf_counter() - start
+        for template in templates:
+            previews.get(template, timeout=600)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rounds = 100
+        for _ in range(rounds):
+            for template in templates:
+                previews.get(template)
+        cached = (time.perf_counter() - start) / (rounds * len(templates))
+
+        print(f"{len(templates)} templates at {args.dpi} dpi, {args.workers} workers")
+        print(f"warm() returned after:  {warm_returned * 1000:8.1f} ms")
+        print(f"all thumbnails ready:   {cold:8.2f} s")
+        print(f"cached lookup:          {cached * 1000:8.3f} ms per template")
+        for template in templates:
+            png, error = previews.get(template), previews.error(template)
+            status = error or f"{len(png)} bytes"
+            print(f"  {os.path.basename(template)[:40]:<42}{status}")
+
+
+if __name__ == "__main__":
+    main()
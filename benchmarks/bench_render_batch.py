@@ -0,0 +1,73 @@
+"""
+Throughput and peak memory of bulk resume generation: renders N records with a
+template (DOCX + PDF) through generator.write_zip() into a zip, and reports
+renders/s, the parent's peak traced Python memory and the peak RSS of the
+parent and of the largest worker.
+
+Run from the repo root:  python benchmarks/bench_render_batch.py [--renders 1000] [--workers 4]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from generator import write_zip  # noqa: E402
+
+TEMPLATE = os.path.join(ROOT, "templates", "Business Operation Manager.docx")
+
+
+def make_records(count):
+    # A generator, so the records are never all in memory at once
+    for i in range(count):
+        yield {
+            "NAME": f"Candidate {i}",
+            "EMAIL": f"candidate{i}@example.com",
+            "PHONE": f"+1 555 {i:04d}",
+            "SUMMARY": "Operations manager with experience in logistics, planning and reporting. " * 3,
+            "SKILLS": "Python, SQL, Project Management, Excel",
+            "EXPERIENCE": f"Operations Manager, ABC Ltd ({2010 + i % 10}-2024)",
+            "UNIVERSITY": "State University",
+            "DEGREE": "BBA",
+            "CERTIFICATIONS": "PMP",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--renders", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--formats", default="docx,pdf")
+    args = parser.parse_args()
+    formats = tuple(args.formats.split(","))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "resumes.zip")
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = write_zip(make_records(args.renders), [TEMPLATE], output, formats=formats, workers=args.workers)
+        elapsed = time.perf_counter() - start
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        zip_size = os.path.getsize(output)
+
+    # ru_maxrss is in KiB on Linux
+    parent_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    print(f"{result['renders']} renders ({len(result['errors'])} errors), formats {', '.join(formats)}, "
+          f"workers {args.workers or os.cpu_count()}")
+    print(f"elapsed:               {elapsed:8.2f} s")
+    print(f"throughput:            {result['renders'] / elapsed:8.1f} renders/s")
+    print(f"zip size:              {zip_size / 2**20:8.1f} MiB")
+    print(f"parent traced peak:    {traced_peak / 2**20:8.1f} MiB")
+    print(f"parent peak RSS:       {parent_rss:8.1f} MiB")
+    print(f"largest worker RSS:    {worker_rss:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Query latency of the analyzed-resume store over a large synthetic history
+(default 1M resumes): loads the store, then runs skill / years / score queries
+and compares them, with identical results, against scanning the same records as
+Python dicts. First checks that processes writing to the same store at once
+(sealing and compacting segments as they go) lose nothing, that a store opened
+before their writes sees them, and that owner-scoped queries only return that
+owner's resumes.
+
+Run from the repo root:  python benchmarks/bench_result_store.py [--resumes 1000000]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_store import ResultStore  # noqa: E402
+from skill_matcher import SKILLS_LIST  # noqa: E402
+
+QUERIES = [
+    {"all_skills": ["Python", "Kubernetes"], "min_years": 3, "min_score": 70},
+    {"all_skills": ["Python"], "min_score": 50},
+    {"any_skills": ["Docker", "Kubernetes", "AWS"], "min_years": 5},
+    {"all_skills": ["Machine Learning", "Python", "Docker"]},
+    {"min_years": 8, "min_score": 90},
+]
+
+
+def make_records(count, seed):
+    rng = random.Random(seed)
+    popular = SKILLS_LIST[:20]  # skill frequencies are skewed, like real resumes
+    for i in range(count):
+        skills = set(rng.sample(SKILLS_LIST, rng.randint(2, 10))) | set(rng.sample(popular, rng.randint(0, 4)))
+        yield {"key": f"{i:08x}", "source": f"resume-{i}.pdf", "owner": "bench", "skills": sorted(skills),
+               "years": rng.randint(0, 15), "score": round(rng.uniform(20, 100), 2)}
+
+
+def scan(records, all_skills=(), any_skills=(), min_years=None, min_score=None):
+    return [i for i, r in enumerate(records)
+            if all(skill in r["skills"] for skill in all_skills)
+            and (not any_skills or any(skill in r["skills"] for skill in any_skills))
+            and (min_years is None or r["years"] >= min_years)
+            and (min_score is None or r["score"] >= min_score)]
+
+
+def write_part(path, records):
+    store = ResultStore(path, segment_rows=50)
+    for i in range(0, len(records), 20):
+        store.add_many(records[i:i + 20])
+
+
+def check_processes():
+    records = list(make_records(2400, seed=1))
+    for i, record in enumerate(records):
+        record["owner"] = f"user-{i % 3}"  # one owner per writer process
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = ResultStore(tmp, segment_rows=50)
+        writers = [multiprocessing.Process(target=write_part, args=(tmp, records[i::3])) for i in range(3)]
+        for process in writers:
+            process.start()
+        while any(process.is_alive() for process in writers):
+            reader.fetch(reader.top(reader.query(**QUERIES[0]), 10))  # must not fail mid-compaction
+        if any(process.exitcode for process in writers):
+            sys.exit("FAILED: a writer process failed")
+        for store in (reader, ResultStore(tmp, segment_rows=50)):
+            if len(store) != len(records):
+                sys.exit(f"FAILED: {len(store)} rows stored by 3 processes, expected {len(records)}")
+            for query in QUERIES:
+                found = sorted(record["source"] for record in store.fetch(store.query(**query)))
+                if found != sorted(records[i]["source"] for i in scan(records, **query)):
+                    sys.exit(f"FAILED: {describe(query)} differs after concurrent writes")
+                owned = sorted(record["source"] for record in store.fetch(store.query(owner="user-1", **query)))
+                if owned != sorted(records[i]["source"] for i in scan(records, **query) if i % 3 == 1):
+                    sys.exit(f"FAILED: {describe(query)} for user-1 differs from user-1's resumes")
+        listed = set(reader.segment_names())
+        leftover = [name for name in os.listdir(tmp) if name.startswith("seg-") and name not in listed]
+        print(f"3 writer processes: {len(records)} rows in {len(listed)} segments, "
+              f"{len(leftover)} replaced segment(s) awaiting deletion")
+
+
+def describe(query):
+    parts = [" AND ".join(query.get("all_skills", []))]
+    if query.get("any_skills"):
+        parts.append("(" + " OR ".join(query["any_skills"]) + ")")
+    if "min_years" in query:
+        parts.append(f">={query['min_years']} years")
+    if "min_score" in query:
+        parts.append(f"score >={query['min_score']}")
+    return ", ".join(part for part in parts if part)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check_processes()
+    records = list(make_records(args.resumes, args.seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(tmp)
+        start = time.perf_counter()
+        for i in range(0, len(records), 10_000):
+            store.add_many(records[i:i + 10_000])
+        load_s = time.perf_counter() - start
+        columns = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(tmp)
+                      for name in names if name.endswith(".npy"))
+        print(f"{len(store)} resumes loaded in {load_s:.1f} s ({len(records) / load_s:,.0f}/s), "
+              f"{len(store.segments)} segments, {columns / 2 ** 20:.1f} MiB of columns")
+
+        reopened = ResultStore(tmp)
+        print(f"{'query':<52}{'matches':>9}{'store ms':>10}{'scan ms':>10}")
+        for query in QUERIES:
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                rows = reopened.query(**query)
+                times.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            expected = scan(records, **query)
+            scan_ms = (time.perf_counter() - start) * 1000
+            assert rows.tolist() == expected, describe(query)
+            print(f"{describe(query):<52}{len(rows):>9}{statistics.median(times):>10.2f}{scan_ms:>10.0f}")
+
+        start = time.perf_counter()
+        best = reopened.fetch(reopened.top(reopened.query(**QUERIES[0]), 50))
+        print(f"top 50 records of the first query: {(time.perf_counter() - start) * 1000:.2f} ms "
+              f"(best score {best[0]['score']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Adversarial-input timings for experience extraction: the old per-call
+lazy-DOTALL regex vs the section segmenter, at doubling input sizes. Linear
+code should roughly double its time with each doubling of the input. First
+checks that only whole heading lines start sections; exits non-zero if not.
+
+Run from the repo root:  python benchmarks/bench_sections.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import extract_experience  # noqa: E402
+from sections import section_text, segment_resume  # noqa: E402
+
+
+def legacy_extract_experience(text):
+    # The original implementation, kept here only as the "before" number.
+    experience_headers = [
+        "Work Experience/Internships", "work experience", "professional experience",
+        "employment history", "career summary", "job experience", "experience"
+    ]
+    experience_pattern = r"(?:{})\s*(?:[:\-]?\s*)\n?(.*?)(?:\n\s*\n|\Z)".format("|".join(experience_headers))
+    matches = re.findall(experience_pattern, text, re.IGNORECASE | re.DOTALL)
+    extracted_experience = matches[0].strip() if matches else "Experience not found"
+    years_match = re.findall(r"(\d+)\s*(?:years?|yrs?)", extracted_experience, re.IGNORECASE)
+    return max(map(int, years_match)) if years_match else 0
+
+
+CASES = {
+    # a long resume whose text layer has no blank lines (typical PyPDF2 output)
+    "no blank lines": lambda n: "Work Experience\n" + "Analyst at ABC Ltd, 3 years of SQL and reporting\n" * n,
+    # the word "experience" everywhere, on one huge line
+    "header spam": lambda n: "experience: " * n,
+    # lines made of long whitespace runs that almost close a section
+    "whitespace runs": lambda n: "Experience\n" + ("\n" + " " * 200 + "x") * (n // 4),
+    # a heading on every line
+    "many headings": lambda n: "Skills\nExperience\n" * n,
+}
+SIZES = [2_000, 4_000, 8_000, 16_000]
+
+
+def check_headings():
+    text = ("Experience:\nExperience-driven analyst at ABC Ltd for 4 years\nSkills: SQL and Python\n"
+            "  Education  \nState University\nSkills\nPython")
+    found = [(section.name, section_text(text, section)) for section in segment_resume(text)]
+    expected = [("experience", "Experience-driven analyst at ABC Ltd for 4 years\nSkills: SQL and Python"),
+                ("education", "State University"), ("skills", "Python")]
+    if found != expected:
+        sys.exit(f"FAILED: sections {found}")
+
+
+def best_of(func, text, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    check_headings()
+    for label, make in CASES.items():
+        print(f"\n{label}")
+        print(f"{'chars':>10}  {'old regex (ms)':>14}  {'segmenter (ms)':>14}  {'sections':>8}")
+        for size in SIZES:
+            text = make(size)
+            old = best_of(legacy_extract_experience, text)
+            new = best_of(extract_experience, text)
+            print(f"{len(text):>10}  {old:>14.2f}  {new:>14.2f}  {len(segment_resume(text)):>8}")
+
+
+if __name__ == "__main__":
+    main()
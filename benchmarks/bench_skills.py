@@ -0,0 +1,53 @@
+"""
+Per-resume latency of skill extraction, before (per-token list rebuild) and
+after (prebuilt SkillIndex), on 1-page and 20-page synthetic resumes.
+
+Run from the repo root:  python benchmarks/bench_skills.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SKILL_INDEX, SKILLS_LIST  # noqa: E402
+
+WORDS_PER_PAGE = 500
+FILLER = ("designed built led improved delivered team customer platform service report "
+          "worked with across the and for in of to a on data system project").split()
+
+
+def legacy_extract_skills(text):
+    # The original implementation, kept here only as the "before" number.
+    skills_list = list(SKILLS_LIST)
+    return list(set([word for word in re.findall(r'\b\w+\b', text) if word.lower() in [skill.lower() for skill in skills_list]]))
+
+
+def make_resume(pages, seed=0):
+    rng = random.Random(seed)
+    words = []
+    for _ in range(pages * WORDS_PER_PAGE):
+        words.append(rng.choice(SKILLS_LIST) if rng.random() < 0.05 else rng.choice(FILLER))
+    return " ".join(words)
+
+
+def time_per_call(func, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    print(f"{'pages':>5}  {'before (ms)':>12}  {'after (ms)':>10}  {'speedup':>8}")
+    for pages, repeat in [(1, 20), (20, 3)]:
+        text = make_resume(pages)
+        before = time_per_call(legacy_extract_skills, text, repeat)
+        after = time_per_call(SKILL_INDEX.extract, text, repeat * 10)
+        print(f"{pages:>5}  {before:>12.2f}  {after:>10.3f}  {before / after:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Throughput of the background task queue: queues many resume analyses (a share
+of them uploaded twice, as when several sessions upload the same file) and
+times how long worker pools of different sizes take to drain the queue.
+Reports submit rate, tasks/s, queue-to-result latency and how many duplicates
+were folded into an in-flight task, next to analyzing the same PDFs inline.
+It also times a no-op task kind, to show the queue's own overhead per task.
+
+Each run uses a fresh task database and result cache, so nothing is a cache hit.
+
+Run from the repo root:  python benchmarks/bench_task_queue.py [--resumes 300] [--workers 1 2 4]
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import ROOT, make_resume, resume_pdf  # noqa: E402
+
+sys.path.insert(0, ROOT)
+os.environ.setdefault("RESUME_OCR", "0")
+
+
+def echo(payload, report):
+    # A task that does nothing, so only the queue's own work is timed
+    return payload
+
+
+def make_pdfs(count, seed=0):
+    rng = random.Random(seed)
+    return [resume_pdf(make_resume(rng, rng.randint(30, 150))) for _ in range(count)]
+
+
+def drain(queue, task_ids):
+    start = time.perf_counter()
+    pending = queue.wait(task_ids, timeout=3600)
+    elapsed = time.perf_counter() - start
+    tasks = [queue.status(task_id) for task_id in set(task_ids)]
+    latencies = sorted(task["finished"] - task["created"] for task in tasks if task["finished"])
+    failed = sum(task["status"] == "failed" for task in tasks)
+    return elapsed, latencies, failed, pending
+
+
+def run_pool(workers, pdfs, duplicates, tmp, seed=0):
+    import task_queue
+    from uploads import spool_upload
+
+    os.environ["RESUME_CACHE_PATH"] = os.path.join(tmp, f"results-{workers}.sqlite")  # read by the workers
+    task_queue.TASK_INPUT_DIR = os.path.join(tmp, "inputs")
+    path = os.path.join(tmp, f"tasks-{workers}.sqlite")
+    queue = task_queue.TaskQueue(path)
+    pool = task_queue.WorkerPool(workers, path).start()
+    try:
+        uploads = [spool_upload(io.BytesIO(pdf), name=f"resume-{i}.pdf") for i, pdf in enumerate(pdfs)]
+        rng = random.Random(seed)
+        order = uploads + rng.sample(uploads, int(len(uploads) * duplicates))
+        rng.shuffle(order)
+        start = time.perf_counter()
+        task_ids = [task_queue.submit_analysis(upload, queue) for upload in order]
+        submit_s = time.perf_counter() - start
+        elapsed, latencies, failed, pending = drain(queue, task_ids)
+        return {
+            "submitted": len(order), "tasks": len(set(task_ids)), "submit_per_s": len(order) / submit_s,
+            "elapsed": submit_s + elapsed, "latencies": latencies, "failed": failed, "pending": len(pending),
+        }
+    finally:
+        pool.stop()
+        queue.close()
+
+
+def queue_overhead(tasks, tmp):
+    import task_queue
+
+    path = os.path.join(tmp, "echo.sqlite")
+    queue = task_queue.TaskQueue(path)
+    pool = task_queue.WorkerPool(1, path, handlers={"echo": "bench_task_queue:echo"})
+    pool.start()
+    try:
+        queue.wait([queue.submit("echo", {"warm-up": True})])  # the worker has started
+        start = time.perf_counter()
+        task_ids = [queue.submit("echo", {"n": i}) for i in range(tasks)]
+        queue.wait(task_ids)
+        return (time.perf_counter() - start) / tasks * 1000
+    finally:
+        pool.stop()
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--duplicates", type=float, default=0.25, help="share of resumes submitted a second time")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    pdfs = make_pdfs(args.resumes)
+    with tempfile.TemporaryDirectory() as tmp:
+        from cache import ResultCache, analyze_pdf_bytes
+
+        cache = ResultCache(os.path.join(tmp, "inline.sqlite"))
+        start = time.perf_counter()
+        for pdf in pdfs:
+            analyze_pdf_bytes(pdf, cache=cache)
+        inline_s = time.perf_counter() - start
+        print(f"{len(pdfs)} resumes on {os.cpu_count()} CPU(s); inline: {inline_s:.1f} s "
+              f"({len(pdfs) / inline_s:.1f} resumes/s)")
+        print(f"{'workers':>7}  {'submitted':>9}  {'tasks':>6}  {'submit/s':>8}  {'drain (s)':>9}  {'tasks/s':>7}  "
+              f"{'p50 (s)':>7}  {'p95 (s)':>7}  {'failed':>6}")
+        for workers in args.workers:
+            run = run_pool(workers, pdfs, args.duplicates, tmp)
+            latencies = run["latencies"]
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else float("nan")
+            print(f"{workers:>7}  {run['submitted']:>9}  {run['tasks']:>6}  {run['submit_per_s']:>8.0f}  "
+                  f"{run['elapsed']:>9.1f}  {run['tasks'] / run['elapsed']:>7.1f}  "
+                  f"{statistics.median(latencies):>7.1f}  {p95:>7.1f}  {run['failed'] + run['pending']:>6}")
+        print(f"queue overhead: {queue_overhead(500, tmp):.2f} ms per no-op task (1 worker)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Skill taxonomy cost as it grows: for the shipped skills.yaml and synthetic
+taxonomies of 1k, 5k and 20k skills (one in four with aliases), reports the
+compile time from YAML, the artifact size and load time, and skill extraction
+time on the same 20-page resume, which should stay flat as the taxonomy grows.
+The synthetic taxonomies include the shipped skills; the resume mixes those
+with the words the synthetic skill names are made of, so larger taxonomies
+find more skills in it.
+
+Run from the repo root:  python benchmarks/bench_taxonomy.py [--sizes 1000 5000 20000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml  # noqa: E402
+
+from skill_matcher import TAXONOMY_PATH, load_taxonomy  # noqa: E402
+
+WORDS_PER_PAGE = 500
+FILLER = ("designed built led improved delivered team customer platform service report "
+          "worked with across the and for in of to a on data system project").split()
+
+
+def shipped_taxonomy():
+    with open(TAXONOMY_PATH, encoding="utf-8") as file:
+        return yaml.safe_load(file)
+
+
+def make_vocabulary(size, seed=0):
+    rng = random.Random(seed)
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(size)]
+
+
+def synthetic_taxonomy(size, vocabulary, seed=0):
+    """The shipped taxonomy plus made-up skills of 1-3 words in 20 more categories, `size` skills in all."""
+    rng = random.Random(seed)
+    data = shipped_taxonomy()
+    taken = {str(name).lower() for entries in data["categories"].values() for entry in entries
+             for name in (list(entry) + sum(entry.values(), []) if isinstance(entry, dict) else [entry])}
+    categories = {f"Category {i}": [] for i in range(20)}
+    added = size - sum(len(entries) for entries in data["categories"].values())
+    while added > 0:
+        name = " ".join(rng.sample(vocabulary, rng.choice([1, 2, 2, 3]))).title()
+        if name.lower() in taken:
+            continue
+        taken.add(name.lower())
+        alias = f"{name.lower().replace(' ', '')}x" if rng.random() < 0.25 else None
+        categories[f"Category {rng.randrange(20)}"].append({name: [alias]} if alias else name)
+        added -= 1
+    data["categories"].update(categories)
+    return data
+
+
+def make_resume(pages, skills, vocabulary, seed=0):
+    # 5% shipped skills, 10% words the synthetic skill names are made of, the rest filler
+    rng = random.Random(seed)
+    words = []
+    for _ in range(pages * WORDS_PER_PAGE):
+        draw = rng.random()
+        words.append(rng.choice(skills) if draw < 0.05 else rng.choice(vocabulary) if draw < 0.15
+                     else rng.choice(FILLER))
+    return " ".join(words)
+
+
+def time_ms(func, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+
+    real = load_taxonomy(TAXONOMY_PATH, artifact_path=None)
+    vocabulary = make_vocabulary(max(args.sizes))
+    text = make_resume(args.pages, real.skills, vocabulary)  # the same resume for every size
+    print(f"{'skills':>7}  {'aliases':>7}  {'compile (ms)':>12}  {'artifact KB':>11}  {'load (ms)':>9}  "
+          f"{'extract (ms)':>12}  {'found':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in [None] + args.sizes:
+            path, artifact = os.path.join(tmp, f"skills-{size}.yaml"), os.path.join(tmp, f"skills-{size}.marshal")
+            data = shipped_taxonomy() if size is None else synthetic_taxonomy(size, vocabulary)
+            with open(path, "w", encoding="utf-8") as file:
+                yaml.safe_dump(data, file, sort_keys=False)
+            compile_ms, taxonomy = time_ms(load_taxonomy, path, artifact)
+            load_ms, _ = time_ms(load_taxonomy, path, artifact, repeat=5)
+            extract_ms, found = time_ms(taxonomy.index.extract, text, repeat=10)
+            print(f"{len(taxonomy.skills):>7}  {len(taxonomy.aliases):>7}  {compile_ms:>12.0f}  "
+                  f"{os.path.getsize(artifact) / 1024:>11.0f}  {load_ms:>9.1f}  {extract_ms:>12.2f}  {len(found):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Renders per second for every template in templates/: the original fill_template
+(parse the file, loop over paragraphs x keys) vs the compiled template engine
+(parse once, patch only the placeholder runs). Also checks that both leave no
+known placeholder behind in the body text, that placeholders in a text box
+are replaced exactly once, and that tabs, breaks and drawings in a placeholder's
+runs survive rendering. Exits non-zero if a check fails.
+
+Run from the repo root:  python benchmarks/bench_templates.py [--seconds 2]
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import docx  # noqa: E402
+from docx.oxml import parse_xml  # noqa: E402
+from docx.oxml.ns import nsdecls, qn  # noqa: E402
+
+from template_engine import CompiledTemplate, template_cache  # noqa: E402
+
+USER_DATA = {
+    "NAME": "Jane Doe",
+    "EMAIL": "jane@example.com",
+    "PHONE": "+1 555 0100",
+    "LINKEDIN": "linkedin.com/in/janedoe",
+    "ADDRESS": "Springfield",
+    "SUMMARY": "Operations manager with 8 years of experience in logistics and planning.",
+    "SKILLS": "Python, SQL, Project Management",
+    "EXPERIENCE": "Operations Manager, ABC Ltd (2018-2024)",
+    "UNIVERSITY": "State University",
+    "DEGREE": "BBA",
+    "CERTIFICATIONS": "PMP",
+}
+
+
+def legacy_fill_template(template_path, user_data):
+    # The original implementation, kept here only as the "before" number.
+    doc = docx.Document(template_path)
+    for para in doc.paragraphs:
+        for key, value in user_data.items():
+            if f"{{{key}}}" in para.text:
+                para.text = para.text.replace(f"{{{key}}}", value)
+    return doc
+
+
+def renders_per_second(render, seconds):
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        render()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def leftovers(document):
+    text = "\n".join(paragraph.text for paragraph in document.paragraphs)
+    return [key for key in USER_DATA if f"{{{key}}}" in text]
+
+
+def check_text_box():
+    # A paragraph whose run holds a text box: the text box's paragraph must only be patched once, by itself
+    document = docx.Document()
+    paragraph = document.add_paragraph("Hi {EMAIL} ")
+    paragraph._p.append(parse_xml(
+        f'<w:r {nsdecls("w")} xmlns:v="urn:schemas-microsoft-com:vml"><w:pict><v:shape><v:textbox><w:txbxContent>'
+        '<w:p><w:r><w:t xml:space="preserve">Name: {NAME}</w:t></w:r></w:p>'
+        '</w:txbxContent></v:textbox></v:shape></w:pict></w:r>'
+    ))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "text-box.docx")
+        document.save(path)
+        rendered = CompiledTemplate(path).render({"EMAIL": "ah@example.com", "NAME": "Alexander Hamilton"})
+    texts = ["".join(node.text or "" for node in p.iter(qn("w:t"))) for p in rendered.element.body.iter(qn("w:p"))]
+    if texts[-1] != "Name: Alexander Hamilton" or not texts[0].startswith("Hi ah@example.com Name: Alexander Hamilton"):
+        sys.exit(f"text box rendered wrong: {texts}")
+
+
+def check_run_content():
+    # Runs holding a placeholder next to a tab, a break and a drawing: only their text may change
+    document = docx.Document()
+    paragraph = document.add_paragraph()
+    paragraph._p.append(parse_xml(
+        f'<w:r {nsdecls("w", "wp")}><w:tab/><w:t xml:space="preserve">Name: {{NA</w:t><w:drawing><wp:inline/></w:drawing>'
+        '</w:r>'
+    ))
+    paragraph._p.append(parse_xml(f'<w:r {nsdecls("w")}><w:t>ME}}</w:t><w:br/><w:t>{{EMAIL}}</w:t></w:r>'))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run-content.docx")
+        document.save(path)
+        rendered = CompiledTemplate(path).render({"NAME": "Jane Doe", "EMAIL": "jane@example.com"})
+    runs = list(rendered.paragraphs[-1]._p.iter(qn("w:r")))
+    kept = [child.tag.split("}")[1] for run in runs for child in run if child.tag != qn("w:rPr")]
+    texts = [node.text for run in runs for node in run.iter(qn("w:t"))]
+    if kept != ["tab", "t", "drawing", "t", "br", "t"] or texts != ["Name: Jane Doe", "", "jane@example.com"]:
+        sys.exit(f"run content rendered wrong: {kept} {texts}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    check_text_box()
+    check_run_content()
+    print(f"{'template':<36}{'placeholders':>13}{'compile (ms)':>13}{'legacy/s':>10}{'engine/s':>10}{'speedup':>9}")
+    for path in sorted(glob.glob(os.path.join(ROOT, "templates", "*.docx"))):
+        start = time.perf_counter()
+        compiled = CompiledTemplate(path)
+        compile_ms = (time.perf_counter() - start) * 1000
+        assert not leftovers(compiled.render(USER_DATA)), f"{path}: placeholders left after render"
+
+        legacy = renders_per_second(lambda: legacy_fill_template(path, USER_DATA), args.seconds)
+        engine = renders_per_second(lambda: template_cache.get(path).render(USER_DATA), args.seconds)
+        print(f"{os.path.basename(path)[:35]:<36}{len(compiled.placeholders):>13}{compile_ms:>13.1f}"
+              f"{legacy:>10.0f}{engine:>10.0f}{engine / legacy:>8.1f}x")
+    print(f"template cache: {template_cache.hits} hits, {template_cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Seeded synthetic resume corpus: the same seed always gives the same resumes.
+
+Resumes are built from SKILLS_LIST and a few word lists, with a configurable
+length (lines of body text) and skill density (share of body words that are
+skills), and can be written as plain text, PDF (fpdf) or DOCX (filled from a
+template in templates/; templates without placeholders get the sections
+appended).
+
+Run from the repo root to write a corpus to disk:
+    python benchmarks/corpus.py corpus/ --count 100 --lines 80 --skill-density 0.2 --formats pdf,docx
+"""
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from skill_matcher import SKILLS_LIST  # noqa: E402
+
+TEMPLATE_DIR = os.path.join(ROOT, "templates")
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Maria", "Ahmed", "Olga", "Kwame", "Lucia", "Kenji"]
+LAST_NAMES = ["Doe", "Smith", "Patel", "Chen", "Garcia", "Khan", "Ivanova", "Mensah", "Rossi", "Sato"]
+TITLES = ["Data Analyst", "Software Engineer", "Operations Manager", "Business Analyst", "Project Manager",
+          "Marketing Specialist", "DevOps Engineer", "Data Scientist", "Accountant", "Product Manager"]
+COMPANIES = ["ABC Ltd", "Globex", "Initech", "Umbrella Corp", "Stark Industries", "Wayne Enterprises", "Acme"]
+FILLER = ("designed delivered improved reporting for the team built automated reduced costs across regions "
+          "stakeholders customers quality data weekly monthly processes tools migrated launched owned").split()
+
+
+def make_resume(rng, lines=60, skill_density=0.2):
+    """A resume as template user_data ({"NAME": ..., "EXPERIENCE": ..., ...}); `lines` scales the body."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+    def sentence(words=14):
+        return " ".join(rng.choice(SKILLS_LIST) if rng.random() < skill_density else rng.choice(FILLER)
+                        for _ in range(words)).capitalize() + "."
+
+    jobs, experience = max(1, lines // 10), []
+    for _ in range(jobs):
+        years = rng.randint(1, 8)
+        experience.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({years} years)")
+        experience.extend(sentence() for _ in range(max(1, (lines - 8) // jobs - 1)))
+    return {
+        "NAME": f"{first} {last}",
+        "EMAIL": f"{first.lower()}.{last.lower()}@example.com",
+        "PHONE": f"+1 555 {rng.randint(0, 9999):04d}",
+        "LINKEDIN": f"linkedin.com/in/{first.lower()}{last.lower()}",
+        "ADDRESS": "Springfield",
+        "SUMMARY": sentence(24),
+        "SKILLS": ", ".join(rng.sample(SKILLS_LIST, min(len(SKILLS_LIST), 6 + int(20 * skill_density)))),
+        "EXPERIENCE": "\n".join(experience),
+        "UNIVERSITY": "State University",
+        "DEGREE": rng.choice(["BSc Computer Science", "BBA", "MSc Data Science", "BA Economics"]),
+        "CERTIFICATIONS": ", ".join(rng.sample(["PMP", "AWS Certified", "Scrum Master", "CPA", "Six Sigma"], 2)),
+    }
+
+
+SECTIONS = [("Summary", "SUMMARY"), ("Skills", "SKILLS"), ("Work Experience", "EXPERIENCE"),
+            ("Education", None), ("Certifications", "CERTIFICATIONS")]
+
+
+def resume_lines(resume):
+    lines = [resume["NAME"], f"{resume['EMAIL']} | {resume['PHONE']}", ""]
+    for heading, key in SECTIONS:
+        lines.append(heading)
+        lines.extend((resume[key] if key else f"{resume['DEGREE']}, {resume['UNIVERSITY']}").split("\n"))
+        lines.append("")
+    return lines
+
+
+def resume_text(resume):
+    return "\n".join(resume_lines(resume))
+
+
+def resume_pdf(resume):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=10)
+    for line in resume_lines(resume):
+        pdf.multi_cell(190, 5, txt=line.encode("latin-1", "ignore").decode("latin-1"))
+    output = pdf.output(dest="S")
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+def resume_docx(resume, template_path):
+    from generator import docx_to_bytes, fill_template
+    from template_engine import template_cache
+
+    doc = fill_template(template_path, resume)
+    if not template_cache.get(template_path).placeholders:
+        for heading, key in SECTIONS:
+            doc.add_paragraph().add_run(heading).bold = True  # templates may not define heading styles
+            for line in (resume[key] if key else f"{resume['DEGREE']}, {resume['UNIVERSITY']}").split("\n"):
+                doc.add_paragraph(line)
+    return docx_to_bytes(doc)
+
+
+def make_jobs(rng, count):
+    return [{"title": f"{rng.choice(['Senior ', 'Junior ', ''])}{rng.choice(TITLES)} ({rng.choice(SKILLS_LIST)})",
+             "company": rng.choice(COMPANIES), "link": f"https://jobs.example.com/{i}"}
+            for i in range(count)]
+
+
+def templates():
+    return sorted(os.path.join(TEMPLATE_DIR, name) for name in os.listdir(TEMPLATE_DIR) if name.endswith(".docx"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic resume corpus.")
+    parser.add_argument("output", help="directory to write to")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lines", type=int, default=60, help="body lines per resume")
+    parser.add_argument("--skill-density", type=float, default=0.2, help="share of body words that are skills")
+    parser.add_argument("--formats", default="txt,pdf,docx")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    formats = args.formats.split(",")
+    template_paths = templates()
+    os.makedirs(args.output, exist_ok=True)
+    for i in range(args.count):
+        resume = make_resume(rng, args.lines, args.skill_density)
+        stem = os.path.join(args.output, f"resume-{i:05d}")
+        if "txt" in formats:
+            with open(stem + ".txt", "w", encoding="utf-8") as f:
+                f.write(resume_text(resume))
+        if "pdf" in formats:
+            with open(stem + ".pdf", "wb") as f:
+                f.write(resume_pdf(resume))
+        if "docx" in formats:
+            with open(stem + ".docx", "wb") as f:
+                f.write(resume_docx(resume, template_paths[i % len(template_paths)]))
+    print(f"wrote {args.count} resumes ({', '.join(formats)}) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
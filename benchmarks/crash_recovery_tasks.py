@@ -0,0 +1,180 @@
+"""
+Crash-recovery test for the background task queue. Two scenarios:
+
+1. Killed workers: a supervised pool of 2 analyzes resumes (slowed down so the
+   kills land mid-task) while a busy worker is SIGKILLed every --kill-every
+   seconds. Every analysis must still finish, with the same skills and score as
+   analyzing the PDF inline. A task that crashes its worker every time must be
+   marked failed after MAX_ATTEMPTS instead of being retried forever.
+2. Lost pool: every worker of an unsupervised pool is killed at once, so nothing
+   requeues their tasks; a second pool must pick them up once their leases expire.
+
+Exits non-zero if any check fails.
+
+Run from the repo root:  python benchmarks/crash_recovery_tasks.py [--resumes 30] [--kills 6]
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import ROOT, make_resume, resume_pdf  # noqa: E402
+
+sys.path.insert(0, ROOT)
+os.environ.setdefault("RESUME_OCR", "0")
+
+PAGE_DELAY = 0.3  # seconds slow_analysis spends per page
+HANDLERS = {"analyze": "crash_recovery_tasks:slow_analysis", "crash": "crash_recovery_tasks:crash"}
+
+
+def slow_analysis(payload, report):
+    import task_queue
+
+    def slow_report(progress):
+        time.sleep(PAGE_DELAY)
+        report(progress)
+
+    return task_queue.analyze_task(payload, slow_report)
+
+
+def crash(payload, report):
+    os._exit(1)  # like a segfault or the OOM killer: no exception, no cleanup
+
+
+def submit_all(pdfs, queue):
+    import task_queue
+    from uploads import spool_upload
+
+    return [task_queue.submit_analysis(spool_upload(io.BytesIO(pdf), name=f"resume-{i}.pdf"), queue)
+            for i, pdf in enumerate(pdfs)]
+
+
+def killed_workers(pdfs, tmp, kills, kill_every, failures):
+    import task_queue
+    from cache import ResultCache, analyze_pdf_bytes
+
+    path = os.path.join(tmp, "killed.sqlite")
+    queue = task_queue.TaskQueue(path)
+    pool = task_queue.WorkerPool(2, path, handlers=HANDLERS).start()
+    done = threading.Event()
+    killed = []
+
+    def first_attempt(process):
+        # Only kill a worker in the middle of a task's first attempt: a task whose
+        # worker dies MAX_ATTEMPTS times is (rightly) given up on, like the crash task
+        with queue.lock:
+            row = queue.db.execute("SELECT attempts FROM tasks WHERE worker = ? AND status = 'running'",
+                                   (task_queue.worker_id(process.pid),)).fetchone()
+        return process.poll() is None and row is not None and row[0] == 1
+
+    def killer():
+        rng = random.Random(0)
+        while len(killed) < kills and not done.wait(kill_every):
+            candidates = [process for process in pool.processes if first_attempt(process)]
+            if candidates:
+                process = rng.choice(candidates)
+                process.kill()
+                killed.append(process.pid)
+
+    thread = threading.Thread(target=killer, daemon=True)
+    try:
+        start = time.perf_counter()
+        task_ids = submit_all(pdfs, queue)
+        crash_id = queue.submit("crash", {})
+        thread.start()
+        pending = queue.wait(task_ids + [crash_id], timeout=600)
+        elapsed = time.perf_counter() - start
+    finally:
+        done.set()
+        thread.join()
+        pool.stop()
+
+    tasks = [queue.status(task_id) for task_id in task_ids]
+    crashed = queue.status(crash_id)
+    queue.close()
+    mismatched = 0
+    for pdf, task in zip(pdfs, tasks):
+        expected = analyze_pdf_bytes(pdf, cache=ResultCache(None))
+        result = task["result"] or {}
+        if result.get("skills") != expected["skills"] or result.get("score") != expected["score"]:
+            mismatched += 1
+
+    print(f"killed workers: {len(tasks)} analyses in {elapsed:.1f} s, {len(killed)} workers killed, "
+          f"{pool.restarts} restarts, {sum(task['attempts'] > 1 for task in tasks)} analyses retried")
+    print(f"  crash task: {crashed['status']} after {crashed['attempts']} attempts ({crashed['error']})")
+    if pending:
+        failures.append(f"{len(pending)} task(s) never finished")
+    if any(task["status"] != "done" for task in tasks):
+        failures.append(f"{sum(task['status'] != 'done' for task in tasks)} analyses did not finish as done")
+    if mismatched:
+        failures.append(f"{mismatched} analyses differ from the inline result")
+    if crashed["status"] != "failed" or crashed["attempts"] != task_queue.MAX_ATTEMPTS:
+        failures.append("the crashing task was not given up on after MAX_ATTEMPTS")
+
+
+def lost_pool(pdfs, tmp, lease, failures):
+    import task_queue
+
+    path = os.path.join(tmp, "lost.sqlite")
+    queue = task_queue.TaskQueue(path)
+    first = task_queue.WorkerPool(2, path, handlers=HANDLERS, lease_seconds=lease).start(supervise=False)
+    task_ids = submit_all(pdfs, queue)
+    while queue.counts()["running"] < 2:
+        time.sleep(0.05)
+    running = [task_id for task_id in task_ids if queue.status(task_id)["status"] == "running"]
+    for process in first.processes:
+        process.kill()
+        process.wait()
+
+    start = time.perf_counter()
+    second = task_queue.WorkerPool(2, path, handlers=HANDLERS, lease_seconds=lease).start()
+    try:
+        pending = queue.wait(task_ids, timeout=600)
+        elapsed = time.perf_counter() - start
+    finally:
+        second.stop()
+    tasks = {task_id: queue.status(task_id) for task_id in task_ids}
+    queue.close()
+
+    print(f"lost pool: {len(running)} running tasks orphaned, all {len(task_ids)} done {elapsed:.1f} s later "
+          f"(lease {lease:.0f} s)")
+    if pending or any(task["status"] != "done" for task in tasks.values()):
+        failures.append("tasks of the lost pool were not all finished by the second pool")
+    if any(tasks[task_id]["attempts"] != 2 for task_id in running):
+        failures.append("orphaned tasks were not run again exactly once")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=30)
+    parser.add_argument("--kills", type=int, default=6)
+    parser.add_argument("--kill-every", type=float, default=1.5, help="seconds between kills")
+    parser.add_argument("--lease", type=float, default=3.0, help="lease of the lost pool's tasks, in seconds")
+    args = parser.parse_args()
+
+    import task_queue
+
+    rng = random.Random(0)
+    pdfs = [resume_pdf(make_resume(rng, rng.randint(60, 200))) for _ in range(args.resumes)]
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        task_queue.TASK_INPUT_DIR = os.path.join(tmp, "inputs")
+        os.environ["RESUME_CACHE_PATH"] = os.path.join(tmp, "results-killed.sqlite")  # read by the workers
+        killed_workers(pdfs, tmp, args.kills, args.kill_every, failures)
+        os.environ["RESUME_CACHE_PATH"] = os.path.join(tmp, "results-lost.sqlite")
+        lost_pool(pdfs[:20], tmp, args.lease, failures)
+        if os.listdir(task_queue.TASK_INPUT_DIR):
+            failures.append(f"{len(os.listdir(task_queue.TASK_INPUT_DIR))} input file(s) left behind")
+    if failures:
+        sys.exit("FAILED: " + "; ".join(failures))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Load test for the HTTP API (api.py): starts the server in a subprocess (or
+uses --url), then runs concurrent keep-alive clients against a mix of
+endpoints and reports throughput, status codes and p50/p95/p99 latency per
+endpoint. 503s are the API's backpressure, not failures.
+
+Run from the repo root:  python benchmarks/load_api.py [--clients 16] [--requests 400] [--workers 2]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESUME_TEXT = (
+    "Jane Doe\nSkills\nPython, SQL, Machine Learning, Power BI, Tableau, Docker\n"
+    "Experience\nData Analyst at ABC Ltd, 4 years of dashboard and visualization work\n"
+    "Education\nBSc Computer Science\n"
+)
+JOBS = [{"title": title, "company": "Acme", "link": f"https://jobs.example.com/{i}"}
+        for i, title in enumerate(["Data Analyst", "Python Developer", "BI Engineer", "Project Manager",
+                                   "Machine Learning Engineer", "Accountant"])]
+
+
+def make_pdf():
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=11)
+    for line in RESUME_TEXT.splitlines() * 3:
+        pdf.multi_cell(190, 6, txt=line)
+    output = pdf.output(dest="S")
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+def requests_mix(pdf):
+    as_json = lambda payload: (json.dumps(payload).encode(), "application/json")  # noqa: E731
+    return {
+        "/analyze": (pdf, "application/pdf"),
+        "/skills": as_json({"text": RESUME_TEXT}),
+        "/score": as_json({"text": RESUME_TEXT}),
+        "/job-match": as_json({"text": RESUME_TEXT, "jobs": JOBS, "k": 3}),
+        "/render": as_json({"template": "Business Operation Manager.docx", "format": "docx",
+                            "data": {"NAME": "Jane Doe", "SKILLS": "Python, SQL"}}),
+    }
+
+
+def wait_ready(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit("API did not start")
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="existing server, e.g. http://127.0.0.1:8000 (default: start one)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="server worker processes")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="server queue bound (default: the API's own, 4 per worker); lower it to see 503s")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=400, help="total requests")
+    parser.add_argument("--endpoints", default="/analyze,/skills,/score,/job-match,/render")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        target = urlparse(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        command = [sys.executable, os.path.join(ROOT, "api.py"), "--port", str(port), "--workers", str(args.workers)]
+        if args.max_pending:
+            command += ["--max-pending", str(args.max_pending)]
+        server = subprocess.Popen(command, cwd=ROOT)
+    try:
+        wait_ready(host, port)
+        bodies = requests_mix(make_pdf())
+        endpoints = args.endpoints.split(",")
+        rng = random.Random(0)
+        plan = [rng.choice(endpoints) for _ in range(args.requests)]
+        local = threading.local()
+        latencies, statuses = defaultdict(list), defaultdict(Counter)
+
+        def call(path):
+            if not hasattr(local, "conn"):
+                local.conn = http.client.HTTPConnection(host, port, timeout=120)
+            body, content_type = bodies[path]
+            start = time.perf_counter()
+            local.conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+            response = local.conn.getresponse()
+            response.read()
+            return path, response.status, time.perf_counter() - start
+
+        for path in endpoints:  # warm up: worker imports, template compile, job index load
+            for _ in range(args.workers):
+                call(path)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            for path, status, elapsed in pool.map(call, plan):
+                statuses[path][status] += 1
+                if status == 200:
+                    latencies[path].append(elapsed)
+        total = time.perf_counter() - start
+
+        ok = sum(counts[200] for counts in statuses.values())
+        print(f"{args.requests} requests, {args.clients} clients, {args.workers} server workers: "
+              f"{total:.2f} s, {args.requests / total:.1f} req/s ({ok / total:.1f} ok/s)")
+        print(f"{'endpoint':<12}{'ok':>6}{'503':>6}{'other':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for path in endpoints:
+            counts, times = statuses[path], latencies[path]
+            other = sum(counts.values()) - counts[200] - counts[503]
+            row = f"{path:<12}{counts[200]:>6}{counts[503]:>6}{other:>7}"
+            if times:
+                row += f"{percentile(times, 50):>9.1f}{percentile(times, 95):>9.1f}{percentile(times, 99):>9.1f}"
+            print(row)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
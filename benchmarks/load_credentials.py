@@ -0,0 +1,91 @@
+"""
+Load test for the credential store: concurrent sign-ups followed by concurrent
+logins (good and bad passwords) from many threads, against the SQLite store and
+the legacy YAML file. Reports throughput, p50/p95 latency and lost accounts
+(sign-ups that reported success but cannot log in afterwards).
+
+Run from the repo root:  python benchmarks/load_credentials.py [--users 200] [--threads 16] [--rounds 4]
+--rounds is the bcrypt cost; the app uses 12, which makes each hash ~250 ms.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml  # noqa: E402
+
+from credentials import Accounts, SqliteCredentialStore, YamlCredentialStore  # noqa: E402
+
+
+class UnlockedYamlStore(YamlCredentialStore):
+    """The app's original load_credentials/save_credentials: read, modify, rewrite, no lock."""
+
+    def add_user(self, username, password_hash):
+        users = self.load()
+        if username in users:
+            return False
+        users[username] = {"password": password_hash}
+        with open(self.path, "w") as file:
+            yaml.dump({"credentials": users}, file, default_flow_style=False)
+        return True
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception:  # the unlocked YAML store can read a half-written file
+        result = None
+    return result, time.perf_counter() - start
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000
+
+
+def run(label, store, args):
+    accounts = Accounts(store, workers=args.hash_workers, rounds=args.rounds)
+    users = [(f"user{i}", f"password-{i}") for i in range(args.users)]
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        start = time.perf_counter()
+        signups = list(pool.map(lambda user: timed(accounts.create_account, *user), users))
+        signup_s = time.perf_counter() - start
+
+        attempts = [(name, password) for name, password in users] + [(name, "wrong") for name, _ in users]
+        start = time.perf_counter()
+        logins = list(pool.map(lambda user: timed(accounts.authenticate, *user), attempts))
+        login_s = time.perf_counter() - start
+
+    created = sum(1 for result, _ in signups if result)
+    good = sum(1 for result, _ in logins[:len(users)] if result)
+    false_accepts = sum(1 for result, _ in logins[len(users):] if result)
+    print(f"\n{label}")
+    print(f"  sign-ups: {len(users) / signup_s:8.1f}/s  p50 {percentile([t for _, t in signups], 50):7.1f} ms"
+          f"  p95 {percentile([t for _, t in signups], 95):7.1f} ms  created {created}/{len(users)}")
+    print(f"  logins:   {len(attempts) / login_s:8.1f}/s  p50 {percentile([t for _, t in logins], 50):7.1f} ms"
+          f"  p95 {percentile([t for _, t in logins], 95):7.1f} ms")
+    print(f"  lost accounts: {created - good}, wrong passwords accepted: {false_accepts}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--hash-workers", type=int, default=4, help="bcrypt pool size")
+    parser.add_argument("--rounds", type=int, default=4, help="bcrypt cost")
+    args = parser.parse_args()
+
+    print(f"{args.users} users, {args.threads} client threads, {args.hash_workers} bcrypt workers, cost {args.rounds}")
+    with tempfile.TemporaryDirectory() as tmp:
+        run("sqlite", SqliteCredentialStore(os.path.join(tmp, "credentials.sqlite")), args)
+        run("yaml, original (no lock)", UnlockedYamlStore(os.path.join(tmp, "unlocked.yaml")), args)
+        run("yaml, in-process lock", YamlCredentialStore(os.path.join(tmp, "locked.yaml")), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Memory soak test for uploads: simulates many concurrent Streamlit sessions (default
+200) that upload PDFs (mostly resumes, some 5 MB scans and 50 MB portfolios),
+rerun the analyzer page a few times per upload, render a resume, and move on.
+Process RSS (and its anonymous / file-backed parts) is sampled every second.
+
+Each session runs the analyzer page's code path in a thread:
+- default: the current path - size/page limits (uploads the widget would refuse
+  are never held), spooling to temp files read via mmap, per-session accounting
+  with eviction of rendered files and spooled uploads, a byte-bounded result cache
+- --legacy: the previous path - every upload accepted and held, getvalue() copies
+  on each rerun, rendered files kept in session state, a count-only result cache
+
+Each upload is made unique, like real uploads, so the result cache doesn't hide the parsing.
+
+Run from the repo root:
+    python benchmarks/soak_sessions.py [--sessions 200] [--duration 60]
+    python benchmarks/soak_sessions.py --legacy
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import ROOT, make_resume, resume_pdf, templates  # noqa: E402
+
+sys.path.insert(0, ROOT)
+os.environ.setdefault("RESUME_OCR", "0")
+
+MB = 1024 * 1024
+
+
+class FakeUpload(io.BytesIO):
+    """Stands in for Streamlit's UploadedFile, which keeps the whole upload in memory."""
+
+    def __init__(self, data, name, file_id):
+        super().__init__(data)
+        self.name, self.size, self.file_id = name, len(data), file_id
+
+
+def noise_pages_pdf(target_bytes, seed):
+    """A PDF of full-page noise images (scans don't compress) of about target_bytes."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    pages, size = [], 0
+    while size < target_bytes:
+        side = 1600
+        pages.append(Image.frombytes("RGB", (side, side), rng.randbytes(side * side * 3)))
+        size += side * side * 3 // 2  # roughly what the JPEG in the PDF takes
+    buffer = io.BytesIO()
+    pages[0].save(buffer, "PDF", save_all=True, append_images=pages[1:], quality=95)
+    return buffer.getvalue()
+
+
+def with_attachment(resume, attachment):
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    for data in (resume, attachment):
+        for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+            writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def make_files(seed):
+    rng = random.Random(seed)
+    resumes = [(make_resume(rng, rng.randint(30, 150)), None) for _ in range(20)]
+    files = [(resume, resume_pdf(resume)) for resume, _ in resumes]
+    medium = noise_pages_pdf(4 * MB, seed)
+    large = noise_pages_pdf(62 * MB, seed + 1)  # about 50 MB once JPEG-encoded
+    return {
+        "resume": files,
+        "scan": [(resume, with_attachment(pdf, medium)) for resume, pdf in files[:3]],
+        "portfolio": [(resume, with_attachment(pdf, large)) for resume, pdf in files[3:5]],
+    }
+
+
+def memory_status():
+    fields = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+
+class Soak:
+    def __init__(self, files, legacy, sessions, duration, idle_ttl, tmp):
+        from cache import ResultCache
+        from uploads import SessionMemory
+
+        self.files, self.legacy, self.sessions, self.duration = files, legacy, sessions, duration
+        self.cache = ResultCache(os.path.join(tmp, "results.sqlite"),
+                                 **({"memory_bytes": float("inf")} if legacy else {}))
+        self.memory = SessionMemory(idle_ttl=idle_ttl)
+        self.templates = templates()
+        self.lock = threading.Lock()
+        self.counts = {"uploads": 0, "rejected": 0, "reruns": 0, "renders": 0}
+        self.active = 0
+        self.stop = threading.Event()
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def rerun(self, session, state, uploaded):
+        """One run of the analyzer page for an uploaded file; False when the upload is refused."""
+        from cache import analyze_pdf_bytes, analyze_upload, content_key
+        from uploads import UploadRejected, session_upload
+
+        if self.legacy:
+            analysis = analyze_pdf_bytes(uploaded.getvalue(), cache=self.cache)
+            content_key(uploaded.getvalue())
+        else:
+            try:
+                upload = session_upload(uploaded, memory=self.memory, session=session)
+            except UploadRejected:
+                return False
+            analysis = analyze_upload(upload, cache=self.cache)
+        state["extracted_skills"] = analysis["skills"]
+        self.count("reruns")
+        return True
+
+    def render(self, session, state, resume):
+        from generator import ResumeDraft
+
+        draft = state.setdefault("resume_draft", ResumeDraft())
+        draft.update({key: resume[key] for key in ("NAME", "EMAIL", "PHONE", "SKILLS", "EXPERIENCE")})
+        draft.render(random.choice(self.templates))
+        if not self.legacy:
+            self.memory.put(session, "resume_draft", draft, draft.nbytes, on_evict=draft.drop_renders)
+        self.count("renders")
+
+    def run_session(self, number):
+        from uploads import UPLOAD_MAX_BYTES
+
+        rng = random.Random(number)
+        generation = 0
+        time.sleep(rng.uniform(0, 2))  # sessions don't all arrive at once
+        while not self.stop.is_set():
+            session, state = f"session-{number}-{generation}", {}
+            with self.lock:
+                self.active += 1
+            for upload_number in range(rng.randint(1, 3)):
+                kind = rng.choices(["resume", "scan", "portfolio"], [0.8, 0.15, 0.05])[0]
+                resume, pdf = rng.choice(self.files[kind])
+                data = pdf + f"\n% {session} {upload_number}\n".encode()  # a unique upload
+                self.count("uploads")
+                if not self.legacy and len(data) > UPLOAD_MAX_BYTES:
+                    self.count("rejected")  # refused by the upload widget, never held
+                    continue
+                uploaded = FakeUpload(data, f"{kind}.pdf", f"{session}-{upload_number}")
+                state["uploaded_file"] = uploaded  # Streamlit holds the upload while the widget shows it
+                for _ in range(rng.randint(1, 4)):
+                    if not self.rerun(session, state, uploaded):
+                        self.count("rejected")
+                        break
+                    if self.stop.wait(rng.uniform(0.1, 0.5)):
+                        break
+                self.render(session, state, resume)
+                del uploaded, data
+                state.pop("uploaded_file", None)
+            with self.lock:
+                self.active -= 1
+            generation += 1  # the session ends; with --legacy its state simply goes away with it
+            if self.stop.wait(rng.uniform(0.5, 2)):
+                break
+
+    def start(self):
+        threads = [threading.Thread(target=self.run_session, args=(i,), daemon=True) for i in range(self.sessions)]
+        for thread in threads:
+            thread.start()
+        samples, start = [], time.monotonic()
+        while time.monotonic() - start < self.duration:
+            time.sleep(1)
+            status = memory_status()
+            with self.lock:
+                active = self.active
+            samples.append((time.monotonic() - start, status, active, self.memory.usage()["bytes"]))
+        self.stop.set()
+        for thread in threads:
+            thread.join(timeout=30)
+        return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run")
+    parser.add_argument("--legacy", action="store_true", help="simulate the previous upload handling")
+    parser.add_argument("--idle-ttl", type=float, default=10, help="seconds before an idle session is evicted")
+    parser.add_argument("--every", type=int, default=5, help="print every Nth sample")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    files = make_files(args.seed)
+    sizes = {kind: max(len(pdf) for _, pdf in group) / MB for kind, group in files.items()}
+    print(f"mode: {'legacy' if args.legacy else 'bounded'}, {args.sessions} sessions, {args.duration:g} s; "
+          f"file sizes: " + ", ".join(f"{kind} {size:.1f} MB" for kind, size in sizes.items()))
+    baseline = memory_status()
+    with tempfile.TemporaryDirectory() as tmp:
+        soak = Soak(files, args.legacy, args.sessions, args.duration, args.idle_ttl, tmp)
+        samples = soak.start()
+    print(f"{'t (s)':>6}{'RSS MiB':>10}{'anon MiB':>10}{'file MiB':>10}{'active':>8}{'tracked MiB':>13}")
+    for i, (t, status, active, tracked) in enumerate(samples):
+        if i % args.every == args.every - 1 or i == len(samples) - 1:
+            print(f"{t:6.0f}{status['VmRSS']:10.0f}{status['RssAnon']:10.0f}{status['RssFile']:10.0f}"
+                  f"{active:8d}{tracked / MB:13.1f}")
+    peak = max(samples, key=lambda sample: sample[1]["VmRSS"])[1]
+    print(f"baseline RSS {baseline['VmRSS']:.0f} MiB; peak RSS {peak['VmRSS']:.0f} MiB "
+          f"(anon {max(s[1]['RssAnon'] for s in samples):.0f} MiB); "
+          + ", ".join(f"{name} {value}" for name, value in soak.counts.items())
+          + f", evictions {soak.memory.evictions}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Local stub for the three job boards, serving canned HTML on the same paths the
+scrapers request, plus a timing run of jobs.fetch_jobs_from_multiple_sources
+against it: sequential vs concurrent, cached, incremental re-scrape and with
+one board failing. Each board serves STUB_PAGES result pages of 10 jobs.
+
+Run from the repo root:  python benchmarks/stub_job_board.py [--delay 0.3]
+
+To point the Streamlit app at the stub instead, start it with --serve and run
+the app with JOB_BOARD_BASE_URL=http://127.0.0.1:8765.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import tempfile
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PORT = 8765
+STUB_PAGES = 3
+
+CARDS = {
+    "/jobs": lambda i: (f'<div class="job_seen_beacon"><h2>Data Analyst {i}</h2>'
+                        f'<span class="companyName">Indeed Co {i}</span><a href="/rc/clk?jk={i}">apply</a></div>'),
+    "/jobs/search": lambda i: (f'<div class="base-search-card"><a href="https://www.linkedin.com/jobs/view/{i}">'
+                               f'<h3>Python Developer {i}</h3></a><h4>LinkedIn Co {i}</h4></div>'),
+    "/Job/jobs.htm": lambda i: (f'<li class="react-job-listing"><a class="jobLink" href="/job-listing/{i}">'
+                                f'ML Engineer {i}</a><div class="jobHeader">Glassdoor Co {i}</div></li>'),
+}
+
+
+def page_number(path, params):
+    """Result page requested, with the same parameters as jobs.PAGINATION."""
+    if path == "/Job/jobs.htm":
+        return int(params.get("p", ["1"])[0]) - 1
+    return int(params.get("start", ["0"])[0]) // (10 if path == "/jobs" else 25)
+
+
+def page_html(path, page):
+    if page >= STUB_PAGES:
+        return ""
+    return "".join(CARDS[path](i) for i in range(page * 10, page * 10 + 10))
+
+
+class StubJobBoard(BaseHTTPRequestHandler):
+    delay = 0.0
+    failing = set()  # paths that answer 503
+    requests = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path
+        time.sleep(self.delay)
+        StubJobBoard.requests += 1
+        if path in self.failing or path not in CARDS:
+            self.send_response(503 if path in self.failing else 404)
+            self.end_headers()
+            return
+        body = f"<html><body>{page_html(path, page_number(path, parse_qs(url.query)))}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(port=PORT, delay=0.0):
+    StubJobBoard.delay = delay
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubJobBoard)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.3, help="seconds each stub response takes")
+    parser.add_argument("--serve", action="store_true", help="only run the stub server")
+    args = parser.parse_args()
+
+    server = start_stub(delay=args.delay)
+    if args.serve:
+        print(f"Stub job boards on http://127.0.0.1:{PORT} (Ctrl+C to stop)")
+        threading.Event().wait()
+
+    os.environ["JOB_BOARD_BASE_URL"] = f"http://127.0.0.1:{PORT}"
+    import jobs
+    from job_store import JobStore
+
+    query = "Python,Machine Learning,SQL"
+    tmp = tempfile.TemporaryDirectory()
+
+    def sequential():
+        return [job for scrape in jobs.SCRAPERS.values() for job in scrape(query, 10)]
+
+    _, seq_ms = timed(sequential)
+    store = JobStore(os.path.join(tmp.name, "jobs.sqlite"))
+    StubJobBoard.requests = 0
+    fresh, conc_ms = timed(jobs.fetch_jobs_from_multiple_sources, query, 30, store)
+    first_requests = StubJobBoard.requests
+    cached, cached_ms = timed(jobs.fetch_jobs_from_multiple_sources, "sql, python,machine learning", 30, store)
+    assert cached is fresh and len(fresh) == 30
+
+    # A later re-scrape for more jobs only fetches the pages it hasn't seen
+    jobs.job_cache.clear()
+    StubJobBoard.requests = 0
+    more, more_ms = timed(jobs.fetch_jobs_from_multiple_sources, query, 60, store)
+    more_requests = StubJobBoard.requests
+
+    jobs.job_cache.clear()
+    StubJobBoard.failing = {"/Job/jobs.htm"}
+    partial_store = JobStore(os.path.join(tmp.name, "partial.sqlite"))
+    partial, partial_ms = timed(jobs.fetch_jobs_from_multiple_sources, query, 30, partial_store)
+
+    print(f"sequential scrape:        {seq_ms:8.1f} ms")
+    print(f"concurrent scrape:        {conc_ms:8.1f} ms ({len(fresh)} jobs, {first_requests} pages fetched)")
+    print(f"cached (reordered query): {cached_ms:8.3f} ms")
+    print(f"incremental, 60 jobs:     {more_ms:8.1f} ms ({len(more)} jobs, {more_requests} new pages fetched)")
+    print(f"one board failing:        {partial_ms:8.1f} ms ({len(partial)} jobs)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark suite for the pipeline stages, on the seeded synthetic corpus
+(benchmarks/corpus.py), at several input sizes.
+
+Stages: extract_text_from_pdf, extract_skills, extract_experience,
+score_resume, match_resumes_to_jobs, fill_template, convert_docx_to_pdf.
+Sizes: small / medium / large resumes (body lines) and job lists.
+
+Run from the repo root:
+    python benchmarks/suite.py --save baseline.json          # record a baseline
+    python benchmarks/suite.py --compare baseline.json       # exit 1 on regressions
+Results are the median and minimum of --repeat runs per (stage, size), in ms.
+A stage regresses when its median is more than --tolerance slower than the
+baseline's and at least --floor-ms slower, which keeps timer noise out.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import ROOT, make_jobs, make_resume, resume_pdf, resume_text  # noqa: E402
+
+sys.path.insert(0, ROOT)
+
+from analyzer import extract_experience, extract_skills, extract_text_from_pdf, score_resume  # noqa: E402
+from generator import convert_docx_to_pdf, fill_template  # noqa: E402
+from job_index import JobIndex, match_resumes_to_jobs  # noqa: E402
+
+SIZES = {
+    # size name: (resume body lines, jobs to match against)
+    "small": (30, 100),
+    "medium": (150, 1000),
+    "large": (600, 5000),
+}
+TEMPLATE = os.path.join(ROOT, "templates", "Business Operation Manager.docx")
+
+
+def time_ms(func, repeat):
+    func()  # warm-up: lazy imports, compiled templates, caches
+    times = []
+    gc.disable()  # like timeit: collections would land on random runs
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    return {"median_ms": round(statistics.median(times), 3), "min_ms": round(min(times), 3)}
+
+
+def run_suite(seed, repeat, skill_density, sizes):
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            lines, job_count = SIZES[size]
+            resume = make_resume(rng, lines, skill_density)
+            text = resume_text(resume)
+            pdf = resume_pdf(resume)
+            skills = extract_skills(text)
+            years = extract_experience(text)["years_of_experience"]
+            jobs = make_jobs(rng, job_count)
+            index = JobIndex(os.path.join(tmp, f"index-{size}"))
+            index.fit(jobs)
+            doc = fill_template(TEMPLATE, resume)
+
+            stages = {
+                "extract_text_from_pdf": lambda: extract_text_from_pdf(io.BytesIO(pdf)),
+                "extract_skills": lambda: extract_skills(text),
+                "extract_experience": lambda: extract_experience(text),
+                "score_resume": lambda: score_resume(text, skills, years),
+                "match_resumes_to_jobs": lambda: match_resumes_to_jobs(skills, jobs, index=index),
+                "fill_template": lambda: fill_template(TEMPLATE, resume),
+                "convert_docx_to_pdf": lambda: convert_docx_to_pdf(doc),
+            }
+            for stage, func in stages.items():
+                result = time_ms(func, repeat)
+                result["input"] = {"chars": len(text), "pdf_bytes": len(pdf), "skills": len(skills), "jobs": job_count}
+                results[f"{stage}/{size}"] = result
+                print(f"{stage + '/' + size:<36}{result['median_ms']:>10.2f} ms (min {result['min_ms']:.2f})",
+                      file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    """Returns [(name, baseline ms, current ms)] for every stage that got slower than allowed."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        old, new = before["median_ms"], result["median_ms"]
+        if new > old * (1 + tolerance) and new - old >= floor_ms:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--skill-density", type=float, default=0.2)
+    parser.add_argument("--sizes", default=",".join(SIZES))
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--floor-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    results = run_suite(args.seed, args.repeat, args.skill_density, args.sizes.split(","))
+    report = {
+        "meta": {
+            "seed": args.seed, "repeat": args.repeat, "skill_density": args.skill_density,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+        print(f"{'stage/size':<36}{'baseline ms':>12}{'now ms':>10}{'change':>9}")
+        for name, result in results.items():
+            old = baseline["results"].get(name, {}).get("median_ms")
+            change = f"{(result['median_ms'] / old - 1) * 100:+.0f}%" if old else "new"
+            flag = "  REGRESSION" if any(name == r[0] for r in regressions) else ""
+            print(f"{name:<36}{old if old is not None else '-':>12}{result['median_ms']:>10.2f}{change:>9}{flag}")
+        if regressions:
+            sys.exit(f"{len(regressions)} regression(s) over {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
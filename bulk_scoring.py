@@ -0,0 +1,145 @@
+"""
+Bulk version of analyzer.score_resume for scoring many resume texts at once.
+
+Texts are lowercased once and joined into a single NUL-separated string.
+Each keyword is searched across that whole string in one pass that jumps to
+the next resume after a hit, giving a sparse (resumes x keywords) hit matrix. Skill relevance comes from a sparse
+(resumes x industry keywords) matrix built from the extracted skills. Only
+readability (textstat, optionally spread over a process pool) and, when not
+supplied, years of experience are still computed per resume. Readability is
+textstat's Flesch reading ease, worked out here with the syllable count of
+each distinct word looked up once for the whole batch: that pyphen lookup is
+most of the cost of scoring a resume. It follows textstat 0.7.3's internals,
+which is why requirements.txt pins that version.
+
+Scores are identical to calling score_resume() on each resume
+(tests/test_bulk_scoring.py checks it).
+"""
+import bisect
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import textstat
+from scipy import sparse
+
+from analyzer import extract_experience, extract_skills
+from skill_matcher import get_taxonomy
+
+PUNCTUATION = re.compile(r"[^\w\s]")  # textstat's remove_punctuation()
+SENTENCE = re.compile(r"\b[^.!?]+[.!?]*")  # textstat's sentence_count()
+# textstat's English Flesch constants, the language score_resume runs it in
+FLESCH = {"fre_base": 206.835, "fre_sentence_length": 1.015, "fre_syll_per_word": 84.6}
+
+
+def _legacy_round(number, points=0):
+    # textstat's rounding (half away from zero), so the scores match its own
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+def keyword_hits(lowered, keywords):
+    """Sparse boolean (len(lowered) x len(keywords)) matrix: does resume i contain keyword j."""
+    joined = "\0".join(lowered)
+    starts = [0]
+    for text in lowered:
+        starts.append(starts[-1] + len(text) + 1)
+    rows, cols = [], []
+    for col, keyword in enumerate(keywords):
+        position = joined.find(keyword)
+        while position != -1:
+            row = bisect.bisect_right(starts, position) - 1
+            rows.append(row)
+            cols.append(col)
+            position = joined.find(keyword, starts[row + 1])  # skip the rest of this resume
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, cols)), shape=(len(lowered), len(keywords))
+    )
+
+
+def flesch_reading_ease(texts):
+    """textstat.flesch_reading_ease() for each text, with syllables counted once per distinct word."""
+    syllables = {}
+    scores = []
+    for text in texts:
+        words = len(PUNCTUATION.sub("", text).split())
+        sentences = SENTENCE.findall(text)
+        short = sum(len(PUNCTUATION.sub("", sentence).split()) <= 2 for sentence in sentences)
+        sentence_length = _legacy_round(float(words / max(1, len(sentences) - short)), 1)
+        syllable_count = 0
+        for word in PUNCTUATION.sub("", text.lower()).split():
+            count = syllables.get(word)
+            if count is None:
+                count = syllables[word] = len(textstat.pyphen.positions(word)) + 1
+            syllable_count += count
+        syllables_per_word = _legacy_round(float(syllable_count) / float(words), 1) if words else 0.0
+        scores.append(_legacy_round(
+            FLESCH["fre_base"] - float(FLESCH["fre_sentence_length"] * sentence_length)
+            - float(FLESCH["fre_syll_per_word"] * syllables_per_word), 2,
+        ))
+    return scores
+
+
+def skill_matrix(skills_lists, industry_keywords):
+    """Sparse (resumes x industry_keywords) indicator of which keywords each resume lists as a skill."""
+    columns = {keyword: i for i, keyword in enumerate(industry_keywords)}
+    rows, cols = [], []
+    for row, skills in enumerate(skills_lists):
+        for col in {columns[skill] for skill in map(str.lower, skills) if skill in columns}:
+            rows.append(row)
+            cols.append(col)
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(skills_lists), len(industry_keywords))
+    )
+
+
+def score_resumes(texts, skills_lists=None, experience_years=None, workers=None):
+    """
+    Scores N resumes at once.
+
+    Parameters:
+    texts (list): Resume texts.
+    skills_lists (list): extract_skills() output per resume; computed when omitted.
+    experience_years (list): years_of_experience per resume; computed when omitted.
+    workers (int): Processes for the readability pass, the only costly per-resume step left.
+
+    Returns:
+    DataFrame: one row per resume with keyword_score, experience_score,
+    readability_score, skill_score, ats_score and the rounded total in score.
+    """
+    texts = list(texts)
+    if skills_lists is None:
+        skills_lists = [extract_skills(text) for text in texts]
+    if experience_years is None:
+        experience_years = [extract_experience(text)["years_of_experience"] for text in texts]
+
+    taxonomy = get_taxonomy()
+    industry_keywords, ats_sections = taxonomy.industry_keywords, taxonomy.ats_sections
+    lowered = [text.lower() for text in texts]
+    hits = keyword_hits(lowered, industry_keywords + ats_sections).toarray()
+    industry_hits = hits[:, :len(industry_keywords)].sum(axis=1)
+    ats_hits = hits[:, len(industry_keywords):].sum(axis=1)
+
+    years = np.asarray(experience_years, dtype=np.int64).reshape(len(texts))
+    if workers and workers > 1 and len(texts) > 1:
+        size = -(-len(texts) // workers)  # one chunk per worker, so each shares its syllable cache widely
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            readability = sum(pool.map(flesch_reading_ease, [texts[i:i + size] for i in range(0, len(texts), size)]), [])
+    else:
+        readability = flesch_reading_ease(texts)
+    readability = np.array(readability, dtype=np.float64)
+    skill_hits = np.asarray(skill_matrix(skills_lists, industry_keywords).sum(axis=1)).ravel()
+
+    scores = pd.DataFrame({
+        "keyword_score": (industry_hits / len(industry_keywords)) * 20,
+        "experience_score": np.select([years >= 3, years >= 1], [20, 10], 5),
+        "readability_score": np.select([readability > 50, readability > 30], [20, 10], 5),
+        "skill_score": (skill_hits / len(industry_keywords)) * 20,
+        "ats_score": (ats_hits / len(ats_sections)) * 20,
+    })
+    total = (scores["keyword_score"] + scores["experience_score"] + scores["readability_score"]
+             + scores["skill_score"] + scores["ats_score"])
+    scores["score"] = [round(value, 2) for value in total.tolist()]  # Python round(), as in score_resume
+    return scores
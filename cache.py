@@ -0,0 +1,192 @@
+"""
+Content-hash cache for resume analysis results.
+
+Results are keyed by the SHA-256 of the uploaded file plus analyzer.pipeline_version()
+(PIPELINE_VERSION and the skill taxonomy's hash), so re-uploads and Streamlit reruns
+skip PDF parsing entirely, and bumping the version or editing skills.yaml invalidates
+everything computed by an older pipeline.
+
+Two tiers:
+- memory: a small LRU of decoded results, per process, bounded by count and by
+  payload bytes (results carry up to MAX_TEXT_BYTES of resume text each)
+- disk: a SQLite table, bounded by total payload bytes with least-recently-used eviction
+"""
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+from analyzer import (ResumeStream, extract_experience, extract_skills, extract_text_from_pdf, iter_pdf_pages,
+                      pipeline_version, score_resume)
+
+CACHE_PATH = os.environ.get("RESUME_CACHE_PATH", os.path.join(".cache", "results.sqlite"))
+MEMORY_ITEMS = 128
+MEMORY_BYTES = 32 * 1024 * 1024
+MAX_DISK_BYTES = 256 * 1024 * 1024
+
+
+def content_key(data, version=None):
+    return digest_key(hashlib.sha256(data).hexdigest(), version)
+
+
+def digest_key(digest, version=None):
+    """content_key() from an already computed SHA-256 hex digest, e.g. uploads.SpooledUpload.digest."""
+    return f"{digest}:{version or pipeline_version()}"
+
+
+class ResultCache:
+    def __init__(self, path=CACHE_PATH, memory_items=MEMORY_ITEMS, max_disk_bytes=MAX_DISK_BYTES,
+                 memory_bytes=MEMORY_BYTES):
+        self.memory = OrderedDict()  # key -> (value, payload size)
+        self.memory_items = memory_items
+        self.memory_bytes = memory_bytes
+        self.memory_size = 0
+        self.max_disk_bytes = max_disk_bytes
+        self.lock = threading.Lock()
+        self.stats_counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self.db = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+            self.db.commit()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats_counts["memory_hits"] += 1
+                return self.memory[key][0]
+            if self.db is not None:
+                row = self.db.execute("SELECT payload FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.db.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+                    self.db.commit()
+                    value = json.loads(row[0])
+                    self._remember(key, value, len(row[0]))
+                    self.stats_counts["disk_hits"] += 1
+                    return value
+            self.stats_counts["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        payload = json.dumps(value).encode("utf-8")
+        with self.lock:
+            self._remember(key, value, len(payload))
+            if self.db is None:
+                return
+            self.db.execute(
+                "INSERT OR REPLACE INTO results (key, payload, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time()),
+            )
+            self._evict_disk()
+            self.db.commit()
+
+    def _remember(self, key, value, size):
+        if key in self.memory:
+            self.memory_size -= self.memory.pop(key)[1]
+        self.memory[key] = (value, size)
+        self.memory_size += size
+        while len(self.memory) > self.memory_items or (self.memory_size > self.memory_bytes and len(self.memory) > 1):
+            self.memory_size -= self.memory.popitem(last=False)[1][1]
+
+    def _evict_disk(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+            if total <= self.max_disk_bytes:
+                break
+            self.db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            self.stats_counts["evictions"] += 1
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.stats_counts, memory_bytes=self.memory_size)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.memory_size = 0
+            if self.db is not None:
+                self.db.execute("DELETE FROM results")
+                self.db.commit()
+
+
+_default_cache = None
+
+
+def get_result_cache():
+    """Process-wide cache, shared by every Streamlit session and rerun."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+        metrics.register_collector("result_cache", _default_cache.stats)
+    return _default_cache
+
+
+def analyze_pdf_bytes(data, cache=None):
+    """
+    Extracts text, skills, experience and score from PDF bytes, using the cache when possible.
+
+    Returns:
+    dict: {"text", "skills", "experience", "score"} where "experience" is the extract_experience() dict.
+    """
+    with metrics.trace("analyze"), metrics.span("analyze_pdf_bytes"):
+        return _analyze(content_key(data), lambda: io.BytesIO(data), cache)
+
+
+def analyze_upload(upload, cache=None, on_page=None):
+    """
+    analyze_pdf_bytes() for an uploads.SpooledUpload: keyed by its digest, parsed from its (mmap'd) stream.
+    `on_page(pages_read, stream)` is called after each page with the analyzer.ResumeStream so far.
+    """
+    with metrics.trace("analyze"), metrics.span("analyze_upload"):
+        return _analyze(digest_key(upload.digest), upload.open, cache, on_page)
+
+
+def _analyze(key, open_pdf, cache=None, on_page=None):
+    if cache is None:
+        cache = get_result_cache()
+    result = cache.get(key)
+    if result is None:
+        with open_pdf() as pdf:  # the PDF is only open while its text is extracted
+            if on_page is None:
+                text = extract_text_from_pdf(pdf)
+            else:
+                stream = ResumeStream()
+                for page_text in iter_pdf_pages(pdf):
+                    stream.feed(page_text)
+                    on_page(len(stream.pages), stream)
+                text = stream.text  # the pages joined as extract_text_from_pdf joins them
+        if on_page is None:
+            skills = extract_skills(text)
+            experience = extract_experience(text)
+        else:  # the stream already found them, as extract_skills / extract_experience would on the text
+            skills = stream.skills
+            experience = stream.final_experience()
+            metrics.incr("skills_found", len(skills))
+        result = {
+            "text": text,
+            "skills": skills,
+            "experience": experience,
+            "score": score_resume(text, skills, experience["years_of_experience"]),
+        }
+        cache.put(key, result)
+    return result
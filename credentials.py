@@ -0,0 +1,187 @@
+"""
+Username/password store for the login and sign-up forms.
+
+Backends share one small interface (get_hash / add_user) so the app does not
+care where accounts live:
+- SqliteCredentialStore (default): one row per user, a unique index on the
+  username, WAL mode and a busy timeout, so concurrent sign-ups from several
+  sessions or processes never lose accounts, and a login is one indexed lookup
+  whatever the user count. Hashes that were looked up are kept in a small LRU.
+- YamlCredentialStore: the original credentials.yaml file, kept for setups that
+  still want it (CREDENTIALS_BACKEND=yaml). Writes are serialized in-process only.
+
+The first time the SQLite store is opened, accounts from credentials.yaml are
+copied into it once. bcrypt hashing and checking run on a bounded thread pool,
+so a burst of logins cannot take every CPU.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+CREDENTIALS_BACKEND = os.environ.get("CREDENTIALS_BACKEND", "sqlite")
+CREDENTIALS_DB_PATH = os.environ.get("CREDENTIALS_DB_PATH", "credentials.sqlite")
+CREDENTIALS_YAML_PATH = "credentials.yaml"
+READ_CACHE_SIZE = 1024
+HASH_WORKERS = 4
+
+
+class YamlCredentialStore:
+    def __init__(self, path=CREDENTIALS_YAML_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def load(self):
+        import yaml
+
+        # ✅ Check if the file exists
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as file:
+            credentials = yaml.safe_load(file) or {}  # Ensure it never returns None
+        return credentials.get("credentials") or {}
+
+    def get_hash(self, username):
+        user = self.load().get(username)
+        return user["password"] if user else None
+
+    def add_user(self, username, password_hash):
+        """Returns False if the username is taken."""
+        import yaml
+
+        with self.lock:
+            users = self.load()
+            if username in users:
+                return False
+            users[username] = {"password": password_hash}
+            # Written to a temp file and swapped in, so readers never see a half-written file
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as file:
+                yaml.dump({"credentials": users}, file, default_flow_style=False)
+            os.replace(tmp, self.path)
+            return True
+
+
+class SqliteCredentialStore:
+    def __init__(self, path=CREDENTIALS_DB_PATH, cache_size=READ_CACHE_SIZE):
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            "id INTEGER PRIMARY KEY, username TEXT NOT NULL, password_hash TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self.db.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, applied REAL NOT NULL)")
+        self.db.commit()
+
+    def get_hash(self, username):
+        with self.lock:
+            if username in self.cache:
+                self.cache.move_to_end(username)
+                return self.cache[username]
+            row = self.db.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                # Misses are not cached: another process may create the account
+                return None
+            self._remember(username, row[0])
+            return row[0]
+
+    def add_user(self, username, password_hash):
+        """Returns False if the username is taken."""
+        with self.lock:
+            try:
+                with self.db:
+                    self.db.execute(
+                        "INSERT INTO users (username, password_hash, created) VALUES (?, ?, ?)",
+                        (username, password_hash, time.time()),
+                    )
+            except sqlite3.IntegrityError:
+                return False
+            self._remember(username, password_hash)
+            return True
+
+    def _remember(self, username, password_hash):
+        self.cache[username] = password_hash
+        self.cache.move_to_end(username)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def migrate_from_yaml(self, yaml_path=CREDENTIALS_YAML_PATH):
+        """Copies accounts from credentials.yaml once; later calls (and existing usernames) are skipped. Returns the number copied."""
+        name = f"yaml:{os.path.abspath(yaml_path)}"
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone():
+                return 0
+            users = YamlCredentialStore(yaml_path).load()
+            with self.db:
+                before = self.db.total_changes
+                self.db.executemany(
+                    "INSERT OR IGNORE INTO users (username, password_hash, created) VALUES (?, ?, ?)",
+                    [(username, user["password"], time.time()) for username, user in users.items()
+                     if user and user.get("password")],
+                )
+                copied = self.db.total_changes - before
+                self.db.execute("INSERT OR IGNORE INTO migrations (name, applied) VALUES (?, ?)", (name, time.time()))
+            return copied
+
+
+class Accounts:
+    """Sign-up and login on top of a credential store, with bcrypt on a bounded pool."""
+
+    def __init__(self, store, workers=HASH_WORKERS, rounds=12):
+        self.store = store
+        self.rounds = rounds
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    def hash_password(self, password):
+        return self.pool.submit(
+            lambda: bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+        ).result()
+
+    def authenticate(self, username, password):
+        stored = self.store.get_hash(username)
+        if stored is None:
+            return False
+        return self.pool.submit(bcrypt.checkpw, password.encode(), stored.encode()).result()
+
+    def create_account(self, username, password):
+        """Returns False if the username is taken."""
+        if self.store.get_hash(username) is not None:
+            return False  # skip hashing for the common case; the unique index still decides races
+        return self.store.add_user(username, self.hash_password(password))
+
+
+def open_store(backend=CREDENTIALS_BACKEND):
+    if backend == "yaml":
+        return YamlCredentialStore()
+    if backend == "sqlite":
+        store = SqliteCredentialStore()
+        store.migrate_from_yaml()
+        return store
+    raise ValueError(f"unknown credentials backend: {backend!r}")
+
+
+_default_accounts = None
+_default_lock = threading.Lock()
+
+
+def get_accounts():
+    """Process-wide accounts, shared by every Streamlit session and rerun."""
+    global _default_accounts
+    with _default_lock:
+        if _default_accounts is None:
+            _default_accounts = Accounts(open_store())
+        return _default_accounts
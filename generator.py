@@ -0,0 +1,179 @@
+"""
+Resume Generator: fills the DOCX templates in templates/ and converts them to PDF.
+Preview images come from previews.get_preview_cache().
+
+Only imported by the "Resume Generator" page, so python-docx and fpdf
+are never loaded for the other pages.
+
+Rendering happens in memory: render_resume() returns the DOCX/PDF bytes, so
+concurrent users never share a file on disk. render_batch() / write_zip()
+render many records x templates on a process pool and stream them into a zip:
+
+    from generator import write_zip
+    write_zip(records, ["templates/Business Operation Manager.docx"], "resumes.zip", workers=4)
+"""
+import io
+import os
+import zipfile
+from multiprocessing import Pool
+
+from fpdf import FPDF
+
+import metrics
+from template_engine import render_template
+
+
+# Function to replace placeholders in a template
+def fill_template(template_path, user_data):
+    # ✅ Parsed once per template (re-parsed when the file changes); only the placeholder runs are rewritten
+    return render_template(template_path, user_data)
+
+
+def docx_to_bytes(doc):
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# Function to convert DOCX to PDF
+def convert_docx_to_pdf(doc, pdf_path=None):
+    """Writes the PDF to `pdf_path`, or returns it as bytes when no path is given."""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    for para in doc.paragraphs:
+        pdf.multi_cell(200, 10, txt=para.text.encode("latin-1", "ignore").decode("latin-1"), align='L')
+    if pdf_path is not None:
+        pdf.output(pdf_path)
+        return None
+    # ✅ fpdf 1.x returns a latin-1 str for dest="S", fpdf2 returns a bytearray
+    output = pdf.output(dest="S")
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+@metrics.timed("render_resume")
+def render_resume(template_path, user_data, formats=("docx", "pdf")):
+    """Fills the template and returns {format: bytes} for each requested format ("docx", "pdf")."""
+    doc = fill_template(template_path, user_data)
+    rendered = {}
+    if "docx" in formats:
+        rendered["docx"] = docx_to_bytes(doc)
+    if "pdf" in formats:
+        rendered["pdf"] = convert_docx_to_pdf(doc)
+    return rendered
+
+
+# ✅ Live preview line per field: (markdown label, text shown while the field is empty)
+PREVIEW_FIELDS = {
+    "NAME": ("**👤 Name:**", "Your Name"),
+    "EMAIL": ("📧 **Email:**", "your.email@example.com"),
+    "PHONE": ("📞 **Phone:**", "123-456-7890"),
+    "EDUCATION": ("🎓 **Education:**", "Your Degree, University Name"),
+    "EXPERIENCE": ("💼 **Experience:**", "Your work experience details..."),
+    "SKILLS": ("🛠 **Skills:**", "List your skills..."),
+    "CERTIFICATIONS": ("🏆 **Certifications:**", "Your certifications..."),
+}
+
+
+class ResumeDraft:
+    """
+    The Generator page's document, kept across reruns: field values, the preview
+    line of each field, and the last rendered DOCX/PDF. update() only rebuilds the
+    preview lines of fields that changed, and render() reuses the rendered files
+    while the template and the fields are unchanged.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.preview = {key: f"{label} {default}" for key, (label, default) in PREVIEW_FIELDS.items()}
+        self.renders = 0
+        self._rendered = None
+        self._rendered_key = None
+
+    def update(self, fields):
+        """Applies the new field values and returns the keys that changed."""
+        changed = [key for key, value in fields.items() if self.fields.get(key) != value]
+        for key in changed:
+            self.fields[key] = fields[key]
+            if key in PREVIEW_FIELDS:
+                label, default = PREVIEW_FIELDS[key]
+                self.preview[key] = f"{label} {fields[key] or default}"
+        return changed
+
+    def _key(self, template_path):
+        stat = os.stat(template_path)
+        return os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size, tuple(sorted(self.fields.items()))
+
+    def cached(self, template_path):
+        """The files rendered for exactly this template and these fields, or None."""
+        return self._rendered if self._rendered_key == self._key(template_path) else None
+
+    def render(self, template_path):
+        key = self._key(template_path)
+        if key != self._rendered_key:
+            self._rendered = render_resume(template_path, self.fields)
+            self._rendered_key = key
+            self.renders += 1
+        return self._rendered
+
+    @property
+    def nbytes(self):
+        """Bytes held by the rendered files."""
+        return sum(len(data) for data in self._rendered.values()) if self._rendered else 0
+
+    def drop_renders(self):
+        """Frees the rendered files; the next render() rebuilds them."""
+        self._rendered = self._rendered_key = None
+
+
+def _render_one(task):
+    # Runs in a worker process; each worker compiles a template once and reuses it.
+    index, template_path, user_data, formats = task
+    stem = os.path.splitext(os.path.basename(template_path))[0]
+    try:
+        rendered, error = render_resume(template_path, user_data, formats), None
+    except Exception as exc:  # one bad record must not stop the batch
+        rendered, error = {}, f"{type(exc).__name__}: {exc}"
+    return index, stem, rendered, error
+
+
+def render_batch(records, template_paths, formats=("docx", "pdf"), workers=None, chunksize=4):
+    """
+    Renders every record with every template and yields (index, template_name, {format: bytes}, error)
+    as each render finishes (completion order, not input order).
+
+    Parameters:
+    records (iterable): user_data dicts; consumed lazily.
+    template_paths (list): DOCX templates to render each record with.
+    formats (tuple): Any of "docx", "pdf".
+    workers (int): Worker processes (default: CPU count). 1 renders inline without a pool.
+    chunksize (int): Renders handed to a worker at a time.
+    """
+    tasks = (
+        (index, template_path, user_data, tuple(formats))
+        for index, user_data in enumerate(records)
+        for template_path in template_paths
+    )
+    if workers == 1:
+        for task in tasks:
+            yield _render_one(task)
+        return
+    with Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(_render_one, tasks, chunksize=chunksize)
+
+
+def write_zip(records, template_paths, output, formats=("docx", "pdf"), workers=None, chunksize=4):
+    """
+    Streams render_batch() into a zip archive at `output` (a path or a writable binary file)
+    as "<record index>-<template name>.<format>" entries. Returns {"renders": n, "errors": [...]}.
+    """
+    renders, errors = 0, []
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for index, stem, rendered, error in render_batch(records, template_paths, formats, workers, chunksize):
+            if error is not None:
+                errors.append({"index": index, "template": stem, "error": error})
+                continue
+            for fmt, data in rendered.items():
+                archive.writestr(f"{index:05d}-{stem}.{fmt}", data)
+            renders += 1
+    return {"renders": renders, "errors": errors}
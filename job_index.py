@@ -0,0 +1,278 @@
+"""
+Persistent TF-IDF index of scraped jobs.
+
+The vectorizer is fitted once and saved with the index, so scores are comparable
+across calls. Terms it has never seen are dropped from new jobs; once more than
+REFIT_DRIFT of the words indexed since the last fit were unknown, the index is
+refitted on all its jobs. Job vectors are stored as append-only CSR segments (plain .npy
+files, memory-mapped on load); adding jobs writes a new segment instead of
+rewriting the index. Rows are L2-normalized, so a sparse matrix-vector product
+gives cosine similarity directly and top-k comes from argpartition.
+
+    index = get_job_index()
+    index.add_jobs(jobs)                      # deduplicated jobs from fetch_jobs_from_multiple_sources
+    index.query(["Python", "SQL"], k=10)      # [(job dict, score), ...]
+
+get_job_index() reloads the index when another process (the app adding jobs,
+a refit) has changed it on disk, checked at most every RELOAD_CHECK_SECONDS, as
+get_taxonomy() does for skills.yaml.
+"""
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import metrics
+from skill_matcher import RELOAD_CHECK_SECONDS, get_taxonomy
+
+JOB_INDEX_PATH = os.environ.get("JOB_INDEX_PATH", os.path.join(".cache", "job_index"))
+MAX_SEGMENTS = 16  # merge segments once there are more than this
+REFIT_DRIFT = 0.2  # share of out-of-vocabulary words indexed since the last fit that triggers a refit
+
+
+def job_text(job):
+    return job["title"]
+
+
+def fit_vectorizer(jobs):
+    """The TF-IDF vectorizer every job ranking uses: fitted on the job texts plus the skills vocabulary."""
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    vectorizer.fit([job_text(job) for job in jobs] + get_taxonomy().skills)
+    return vectorizer
+
+
+class JobIndex:
+    def __init__(self, path=JOB_INDEX_PATH, repair=True):
+        self.path = path
+        self.repair = repair  # False: load what is on disk as is, leaving crash recovery to the writer
+        self.lock = threading.Lock()
+        self.vectorizer = None
+        self.jobs = []
+        self.links = set()
+        self.segments = []  # CSR matrices, in job order
+        self.drift = {"words": 0, "unknown": 0}  # words indexed since the last fit, and how many were dropped
+        os.makedirs(path, exist_ok=True)
+        self._load()
+        self.stamp = self.disk_stamp()
+
+    def disk_stamp(self):
+        """Changes whenever any process fits the index or adds jobs to it; None while a fit is in progress."""
+        try:
+            return [os.stat(self._file(name)).st_mtime_ns for name in ("vectorizer.pkl", "jobs.jsonl")] + \
+                [os.path.getsize(self._file("jobs.jsonl"))] + self.segment_names()
+        except OSError:
+            return None
+
+    # ---------- persistence ----------
+
+    def _file(self, *parts):
+        return os.path.join(self.path, *parts)
+
+    def _load(self):
+        if os.path.exists(self._file("jobs.jsonl")):
+            with open(self._file("jobs.jsonl"), encoding="utf-8") as file:
+                self.jobs = [json.loads(line) for line in file if line.strip()]
+        if not os.path.exists(self._file("vectorizer.pkl")):
+            # A crash in the middle of fit(): the segments can't be read without it, so rebuild from the jobs
+            if self.repair and (self.jobs or self.segment_names()):
+                self.fit(self.jobs)
+            return
+        with open(self._file("vectorizer.pkl"), "rb") as file:
+            self.vectorizer = pickle.load(file)
+        if os.path.exists(self._file("drift.json")):
+            with open(self._file("drift.json"), encoding="utf-8") as file:
+                self.drift = json.load(file)
+        for name in self.segment_names():
+            self.segments.append(self._read_segment(name))
+        # A crash between writing jobs.jsonl and its segment leaves extra job rows; drop them.
+        indexed = sum(segment.shape[0] for segment in self.segments)
+        if len(self.jobs) > indexed:
+            del self.jobs[indexed:]
+            if self.repair:  # else they may be a writer's jobs whose segment is on its way
+                self._rewrite_jobs()
+        self.links = {job["link"] for job in self.jobs}
+
+    def _rewrite_jobs(self):
+        with open(self._file("jobs.jsonl"), "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(job) + "\n" for job in self.jobs)
+
+    def _read_segment(self, name):
+        arrays = [np.load(self._file(name, f"{part}.npy"), mmap_mode="r") for part in ("data", "indices", "indptr")]
+        return sparse.csr_matrix(tuple(arrays), shape=(len(arrays[2]) - 1, len(self.vectorizer.vocabulary_)), copy=False)
+
+    def _write_segment(self, matrix, replaces=()):
+        names = self.segment_names()
+        name = f"seg-{int(names[-1][4:]) + 1 if names else 0:05d}"
+        tmp = self._file(name + ".tmp")
+        os.makedirs(tmp, exist_ok=True)
+        for part in ("data", "indices", "indptr"):
+            np.save(os.path.join(tmp, f"{part}.npy"), getattr(matrix, part))
+        for old in replaces:
+            self._remove_segment(old)
+        os.replace(tmp, self._file(name))  # readers never see a half-written segment
+        return name
+
+    def _remove_segment(self, name):
+        for part in ("data", "indices", "indptr"):
+            os.remove(self._file(name, f"{part}.npy"))
+        os.rmdir(self._file(name))
+
+    def segment_names(self):
+        return sorted(name for name in os.listdir(self.path) if name.startswith("seg-") and not name.endswith(".tmp"))
+
+    # ---------- building ----------
+
+    def fit(self, jobs):
+        """(Re)fits the vectorizer on `jobs` plus the skills vocabulary and rebuilds the index from scratch."""
+        jobs = list(jobs)
+        with self.lock:
+            vectorizer = fit_vectorizer(jobs)
+            # The vectorizer goes first: until a new one is in place, _load() rebuilds from jobs.jsonl
+            if os.path.exists(self._file("vectorizer.pkl")):
+                os.remove(self._file("vectorizer.pkl"))
+            self.segments = []  # release the memory maps before deleting their files
+            for name in self.segment_names():
+                self._remove_segment(name)
+            with open(self._file("vectorizer.pkl.tmp"), "wb") as file:
+                pickle.dump(vectorizer, file)
+            os.replace(self._file("vectorizer.pkl.tmp"), self._file("vectorizer.pkl"))
+            open(self._file("jobs.jsonl"), "w").close()
+            self.vectorizer, self.jobs, self.links = vectorizer, [], set()
+            self.drift = {"words": 0, "unknown": 0}
+            self._write_drift()
+            self.stamp = self.disk_stamp()
+        metrics.incr("job_index_fits")
+        self.add_jobs(jobs)
+
+    def rebuild(self):
+        """Refits the vectorizer on the jobs already indexed, so words from jobs added since the last fit count."""
+        self.fit(self.jobs)
+
+    def add_jobs(self, jobs):
+        """
+        Appends jobs (skipping links already indexed) as a new segment.
+        Terms the vectorizer has never seen are dropped; once they make up more than
+        REFIT_DRIFT of the words indexed since the last fit, the whole index is refitted.
+        """
+        jobs = list(jobs)
+        with self.lock:
+            # Under the lock that guards self.links, so concurrent calls cannot both add the same link
+            jobs = list({job["link"]: job for job in jobs if job["link"] not in self.links}.values())
+            if not jobs:
+                return
+            if self.vectorizer is None:
+                refit = jobs
+            else:
+                texts = [job_text(job) for job in jobs]
+                analyzer, vocabulary = self.vectorizer.build_analyzer(), self.vectorizer.vocabulary_
+                words = [word for text in texts for word in analyzer(text)]
+                self.drift["words"] += len(words)
+                self.drift["unknown"] += sum(word not in vocabulary for word in words)
+                if self.drift["unknown"] > REFIT_DRIFT * self.drift["words"]:
+                    refit = self.jobs + jobs
+                else:
+                    refit = None
+                    matrix = self.vectorizer.transform(texts).tocsr()
+                    with open(self._file("jobs.jsonl"), "a", encoding="utf-8") as file:
+                        file.writelines(json.dumps(job) + "\n" for job in jobs)
+                    self.segments.append(self._read_segment(self._write_segment(matrix)))
+                    self._write_drift()
+                    self.jobs.extend(jobs)
+                    self.links.update(job["link"] for job in jobs)
+                    if len(self.segments) > MAX_SEGMENTS:
+                        self._compact()
+                    self.stamp = self.disk_stamp()  # this process's own change needs no reload
+        if refit is not None:
+            self.fit(refit)
+
+    def _write_drift(self):
+        with open(self._file("drift.json"), "w", encoding="utf-8") as file:
+            json.dump(self.drift, file)
+
+    def _compact(self):
+        merged = sparse.vstack(self.segments, format="csr")
+        self.segments = []  # release the memory maps before deleting their files
+        name = self._write_segment(merged, replaces=self.segment_names())
+        self.segments = [self._read_segment(name)]
+
+    # ---------- querying ----------
+
+    def vectorize(self, texts):
+        return self.vectorizer.transform(texts)
+
+    def scores(self, resume_skills):
+        """Cosine similarity of the resume's skills against every indexed job, as a dense array."""
+        if self.vectorizer is None or not self.jobs:
+            return np.zeros(0, dtype=np.float32)
+        query = self.vectorize([" ".join(resume_skills)]).toarray().ravel()
+        return np.concatenate([segment @ query for segment in self.segments])
+
+    @metrics.timed("job_query")
+    def query(self, resume_skills, k=10):
+        """Top-k jobs for a resume as [(job, score), ...], best first."""
+        scores = self.scores(resume_skills)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.jobs[i], float(scores[i])) for i in top]
+
+    @metrics.timed("job_rank")
+    def rank(self, resume_skills, jobs):
+        """Orders `jobs` (indexed or not) by similarity to the resume, as [(job, score), ...]."""
+        jobs = list(jobs)
+        if self.vectorizer is None or not jobs:
+            return [(job, 0.0) for job in jobs]
+        query = self.vectorize([" ".join(resume_skills)]).toarray().ravel()
+        scores = self.vectorize([job_text(job) for job in jobs]) @ query
+        return [(jobs[i], float(scores[i])) for i in np.argsort(-scores, kind="stable")]
+
+    def __len__(self):
+        return len(self.jobs)
+
+
+_default_index = None
+_default_index_checked = 0.0
+_default_index_lock = threading.Lock()
+
+
+def get_job_index():
+    """The job index, reloaded when it changed on disk (checked at most every RELOAD_CHECK_SECONDS)."""
+    global _default_index, _default_index_checked
+    with _default_index_lock:
+        now = time.monotonic()
+        if _default_index is None:
+            _default_index, _default_index_checked = JobIndex(), now
+        elif now - _default_index_checked >= RELOAD_CHECK_SECONDS:
+            _default_index_checked = now
+            stamp = _default_index.disk_stamp()
+            if stamp is not None and stamp != _default_index.stamp:
+                _default_index = JobIndex(repair=False)
+                metrics.incr("job_index_reloads")
+        return _default_index
+
+
+# Function to match resume skills with job descriptions
+def match_resumes_to_jobs(resume_skills, job_list=None, index=None, store=None):
+    """
+    Similarity of each resume skill (rows) to each job title (columns), using the
+    persistent index's vectorizer so scores are comparable between calls.
+    Without a job list, the jobs are the deduplicated job store's (one per posting).
+    """
+    if job_list is None:
+        from job_store import get_job_store
+
+        job_list = (store or get_job_store()).jobs()
+    if index is None:
+        index = get_job_index()
+    if index.vectorizer is None:
+        index.fit(job_list)
+    resume_vectors = index.vectorize(resume_skills)
+    job_vectors = index.vectorize([job_text(job) for job in job_list])
+    return (resume_vectors @ job_vectors.T).toarray()
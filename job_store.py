@@ -0,0 +1,260 @@
+"""
+Local SQLite store of scraped jobs, deduplicated across boards.
+
+The same posting is often syndicated on Indeed, LinkedIn and Glassdoor with a
+slightly different title, company spelling and tracking URL. Every scraped job
+is upserted by its normalized URL, then assigned to a cluster of near-duplicates:
+
+- titles are shingled (character 4-grams of the normalized title) and MinHashed
+- the signature is split into LSH bands, bucketed per normalized company, so only
+  postings from the same company with a similar title are ever compared
+- a candidate joins the cluster of the most similar posting whose estimated
+  Jaccard similarity is at least NEAR_DUPLICATE_THRESHOLD
+
+Queries return one job per cluster. The store also remembers which result pages
+of which board were fetched for which query, so re-scrapes can skip pages that
+are still fresh (see jobs.fetch_jobs_from_multiple_sources).
+
+    store = get_job_store()
+    store.upsert(jobs, query="python,sql", source="indeed", page=0)
+    store.jobs(query="python,sql", limit=10)   # deduplicated, best-ranked first
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+import metrics
+
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH", os.path.join(".cache", "jobs.sqlite"))
+NUM_PERM = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 similarity usually share a bucket
+SHINGLE_SIZE = 4
+NEAR_DUPLICATE_THRESHOLD = 0.7
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = re.compile(r"^(utm_.*|ref|refid|trackingid|trk|from|src|source|position|pagenum|vjk|tk|ao|guid)$", re.I)
+COMPANY_SUFFIXES = {"inc", "incorporated", "ltd", "limited", "llc", "plc", "corp", "corporation", "co", "company",
+                    "gmbh", "ag", "sa", "group"}
+TITLE_ABBREVIATIONS = {"sr": "senior", "jr": "junior", "mgr": "manager", "eng": "engineer", "dev": "developer"}
+TITLE_NOISE = {"remote", "hybrid", "onsite", "m", "f", "d", "w"}  # location and gender tags boards append
+
+
+def normalize_url(link):
+    """Lowercases scheme and host, drops tracking parameters, fragments and trailing slashes."""
+    parts = urlsplit(link.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", urlencode(query), ""))
+
+
+def _words(text):
+    return re.findall(r"[a-z0-9+#]+", (text or "").lower())
+
+
+def normalize_title(title):
+    return " ".join(TITLE_ABBREVIATIONS.get(word, word) for word in _words(title) if word not in TITLE_NOISE)
+
+
+def normalize_company(company):
+    words = _words(company)
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures, permuting 32-bit shingle hashes with (a * h + b) mod PRIME."""
+
+    PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 31, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 32, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles(text)),
+            dtype=np.uint64,
+        )
+        # a < 2**31 and h, b < 2**32 keep a * h + b below 2**64, so nothing wraps before the modulo
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % self.PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def band_buckets(signature, company, bands=BANDS):
+    rows = len(signature) // bands
+    buckets = []
+    for band in range(bands):
+        digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=7,
+                                 person=b"band%d" % band)
+        digest.update(company.encode())
+        buckets.append(int.from_bytes(digest.digest(), "little"))  # 56 bits fit SQLite's INTEGER
+    return buckets
+
+
+class JobStore:
+    def __init__(self, path=JOB_STORE_PATH, hasher=None, threshold=NEAR_DUPLICATE_THRESHOLD):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.hasher = hasher or MinHasher()
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY, url_key TEXT NOT NULL UNIQUE, title TEXT NOT NULL, company TEXT NOT NULL,"
+            " link TEXT NOT NULL, source TEXT, cluster INTEGER NOT NULL, signature BLOB NOT NULL,"
+            " first_seen REAL NOT NULL, last_seen REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS jobs_cluster ON jobs (cluster);"
+            "CREATE TABLE IF NOT EXISTS lsh (band INTEGER NOT NULL, bucket INTEGER NOT NULL, job_id INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS lsh_bucket ON lsh (bucket);"
+            "CREATE TABLE IF NOT EXISTS query_jobs ("
+            " query TEXT NOT NULL, job_id INTEGER NOT NULL, source TEXT, page INTEGER NOT NULL, position INTEGER NOT NULL,"
+            " PRIMARY KEY (query, job_id));"
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " source TEXT NOT NULL, query TEXT NOT NULL, page INTEGER NOT NULL, fetched_at REAL NOT NULL,"
+            " job_count INTEGER NOT NULL, PRIMARY KEY (source, query, page));"
+        )
+        self.db.commit()
+        self.counts = {"new": 0, "updated": 0, "near_duplicates": 0}
+
+    # ---------- writing ----------
+
+    @metrics.timed("job_store_upsert")
+    def upsert(self, jobs, query=None, source=None, page=0):
+        """
+        Inserts or refreshes scraped jobs and links them to `query` at their rank on `page`.
+
+        Returns:
+        int: how many jobs had a URL the store had never seen.
+        """
+        now, new = time.time(), 0
+        with self.lock:
+            for position, job in enumerate(jobs):
+                url_key = normalize_url(job["link"])
+                row = self.db.execute("SELECT id FROM jobs WHERE url_key = ?", (url_key,)).fetchone()
+                if row is not None:
+                    job_id = row[0]
+                    self.db.execute("UPDATE jobs SET title = ?, company = ?, link = ?, last_seen = ? WHERE id = ?",
+                                    (job["title"], job["company"], job["link"], now, job_id))
+                    self.counts["updated"] += 1
+                else:
+                    job_id = self._insert(url_key, job, source, now)
+                    new += 1
+                if query is not None:
+                    self.db.execute("INSERT OR REPLACE INTO query_jobs (query, job_id, source, page, position) "
+                                    "VALUES (?, ?, ?, ?, ?)", (query, job_id, source, page, position))
+            self.db.commit()
+        metrics.incr("job_store_new", new)
+        return new
+
+    def _insert(self, url_key, job, source, now):
+        signature = self.hasher.signature(normalize_title(job["title"]))
+        buckets = band_buckets(signature, normalize_company(job["company"]))
+        cluster, best = None, self.threshold
+        candidates = self.db.execute(
+            f"SELECT DISTINCT j.id, j.cluster, j.signature FROM lsh JOIN jobs j ON j.id = lsh.job_id "
+            f"WHERE lsh.bucket IN ({','.join('?' * len(buckets))})", buckets).fetchall()
+        for candidate_id, candidate_cluster, candidate_signature in candidates:
+            score = similarity(signature, np.frombuffer(candidate_signature, dtype=np.uint32))
+            if score >= best:
+                cluster, best = candidate_cluster, score
+        cursor = self.db.execute(
+            "INSERT INTO jobs (url_key, title, company, link, source, cluster, signature, first_seen, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (url_key, job["title"], job["company"], job["link"], source, cluster or 0, signature.tobytes(), now, now))
+        job_id = cursor.lastrowid
+        if cluster is None:
+            self.db.execute("UPDATE jobs SET cluster = ? WHERE id = ?", (job_id, job_id))
+            self.counts["new"] += 1
+        else:
+            self.counts["near_duplicates"] += 1
+        self.db.executemany("INSERT INTO lsh (band, bucket, job_id) VALUES (?, ?, ?)",
+                            [(band, bucket, job_id) for band, bucket in enumerate(buckets)])
+        return job_id
+
+    def mark_page(self, source, query, page, job_count):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO pages (source, query, page, fetched_at, job_count) "
+                            "VALUES (?, ?, ?, ?, ?)", (source, query, page, time.time(), job_count))
+            self.db.commit()
+
+    # ---------- reading ----------
+
+    def page_state(self, source, query, page):
+        """(fetched_at, job_count) of a result page fetched before, or None."""
+        with self.lock:
+            return self.db.execute("SELECT fetched_at, job_count FROM pages WHERE source = ? AND query = ? AND page = ?",
+                                   (source, query, page)).fetchone()
+
+    def jobs(self, query=None, limit=None, source_order=()):
+        """
+        One job per near-duplicate cluster, as {"title", "company", "link", "sources"} dicts.
+
+        With a query, only jobs scraped for it are returned, ordered by result page,
+        then by board (in `source_order`), then by rank on the page; each cluster is
+        represented by its best-ranked posting. Without one, every cluster in the
+        store is returned, oldest first.
+        """
+        with self.lock:
+            if query is None:
+                rows = self.db.execute("SELECT id, title, company, link, source, cluster, 0, 0 FROM jobs "
+                                       "ORDER BY id").fetchall()
+            else:
+                rows = self.db.execute(
+                    "SELECT j.id, j.title, j.company, j.link, q.source, j.cluster, q.page, q.position "
+                    "FROM query_jobs q JOIN jobs j ON j.id = q.job_id WHERE q.query = ?", (query,)).fetchall()
+        order = {name: i for i, name in enumerate(source_order)}
+        rows.sort(key=lambda row: (row[6], order.get(row[4], len(order)), row[7], row[0]))
+        clusters = {}
+        for job_id, title, company, link, source, cluster, _, _ in rows:
+            job = clusters.get(cluster)
+            if job is None:
+                clusters[cluster] = {"title": title, "company": company, "link": link, "sources": [source]}
+            elif source not in job["sources"]:
+                job["sources"].append(source)
+        jobs = list(clusters.values())
+        return jobs if limit is None else jobs[:limit]
+
+    def stats(self):
+        with self.lock:
+            jobs, clusters = self.db.execute("SELECT COUNT(*), COUNT(DISTINCT cluster) FROM jobs").fetchone()
+            counts = dict(self.counts)
+        return {"jobs": jobs, "clusters": clusters, "duplicates": jobs - clusters, **counts}
+
+    def clear(self):
+        with self.lock:
+            for table in ("jobs", "lsh", "query_jobs", "pages"):
+                self.db.execute(f"DELETE FROM {table}")
+            self.db.commit()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_job_store():
+    """Process-wide job store, shared by every Streamlit session and rerun."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = JobStore()
+            metrics.register_collector("job_store", _default_store.stats)
+        return _default_store
@@ -0,0 +1,291 @@
+"""
+Job-board scraping for "Get Job Recommendations".
+
+The three boards are fetched concurrently over one pooled HTTP session, each with
+its own timeout. A board that times out, errors or changes its markup just
+contributes no jobs instead of failing the whole page. Results are kept in a
+TTL cache keyed by the normalized query, so Streamlit reruns don't re-scrape.
+
+Scraped jobs are upserted into the deduplicated job store (job_store.py), and
+results come from there: a posting syndicated on several boards is returned once.
+Re-scrapes are incremental: result pages fetched recently are not fetched again,
+and a board stops paging as soon as a page brings nothing the store hasn't seen.
+
+Point every board at a local stub server (serving canned HTML on the same paths)
+with the JOB_BOARD_BASE_URL environment variable, e.g. http://127.0.0.1:8765.
+"""
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+JOB_BOARD_BASE_URL = os.environ.get("JOB_BOARD_BASE_URL")
+
+# name: (site root, search path, query parameter)
+JOB_SOURCES = {
+    "indeed": ("https://www.indeed.com", "/jobs", "q"),
+    "linkedin": ("https://www.linkedin.com", "/jobs/search", "keywords"),
+    "glassdoor": ("https://www.glassdoor.com", "/Job/jobs.htm", "sc.keyword"),
+}
+# name: (page parameter, value for the first page, step per page)
+PAGINATION = {
+    "indeed": ("start", 0, 10),
+    "linkedin": ("start", 0, 25),
+    "glassdoor": ("p", 1, 1),
+}
+SOURCE_TIMEOUTS = {"indeed": 8, "linkedin": 8, "glassdoor": 8}  # seconds to read a response
+CONNECT_TIMEOUT = 3.05
+
+CACHE_TTL = 15 * 60  # seconds a complete result stays cached
+PARTIAL_CACHE_TTL = 60  # shorter when a board failed, so it gets retried soon
+CACHE_MAX_ENTRIES = 256
+FIRST_PAGE_TTL = CACHE_TTL  # new postings land on the first result page, so it goes stale first
+PAGE_TTL = 24 * 60 * 60  # deeper pages are re-fetched at most daily
+MAX_PAGES = 3  # result pages per board and query
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Shared keep-alive session; connections are reused across reruns and users."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(JOB_SOURCES), pool_maxsize=16)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "Mozilla/5.0 (compatible; Resume-Parser)"
+            _session = session
+        return _session
+
+
+def source_url(name):
+    root, path, _ = JOB_SOURCES[name]
+    return (JOB_BOARD_BASE_URL or root).rstrip("/") + path
+
+
+def _get_soup(name, query, session=None, timeout=None, page=0):
+    _, _, param = JOB_SOURCES[name]
+    params = {param: query}
+    if page:
+        page_param, first, step = PAGINATION[name]
+        params[page_param] = first + page * step
+    session = session or get_session()
+    response = session.get(
+        source_url(name),
+        params=params,
+        timeout=(CONNECT_TIMEOUT, timeout or SOURCE_TIMEOUTS[name]),
+    )
+    response.raise_for_status()
+    return BeautifulSoup(response.text, "html.parser"), response.url
+
+
+def _text(tag):
+    return tag.get_text().strip() if tag is not None else None
+
+
+def _collect(cards, num_jobs, parse_card):
+    job_list = []
+    for job_card in cards:
+        job = parse_card(job_card)
+        if job is not None:  # skip cards whose markup doesn't match
+            job_list.append(job)
+            if len(job_list) >= num_jobs:
+                break
+    return job_list
+
+
+# Function to scrape jobs from Indeed
+@metrics.timed("scrape_indeed")
+def scrape_indeed_jobs(query, num_jobs=5, session=None, timeout=None, page=0):
+    soup, page_url = _get_soup("indeed", query, session, timeout, page)
+
+    def parse_card(job_card):
+        title, company, link = job_card.find("h2"), job_card.find("span", class_="companyName"), job_card.find("a")
+        if title is None or company is None or link is None or not link.get("href"):
+            return None
+        return {"title": _text(title), "company": _text(company), "link": urljoin(page_url, link["href"])}
+
+    return _collect(soup.find_all("div", class_="job_seen_beacon"), num_jobs, parse_card)
+
+
+# Function to scrape jobs from LinkedIn
+@metrics.timed("scrape_linkedin")
+def scrape_linkedin_jobs(query, num_jobs=5, session=None, timeout=None, page=0):
+    soup, page_url = _get_soup("linkedin", query, session, timeout, page)
+
+    def parse_card(job_card):
+        title, company, link = job_card.find("h3"), job_card.find("h4"), job_card.find("a")
+        if title is None or company is None or link is None or not link.get("href"):
+            return None
+        return {"title": _text(title), "company": _text(company), "link": urljoin(page_url, link["href"])}
+
+    return _collect(soup.find_all("div", class_="base-search-card"), num_jobs, parse_card)
+
+
+# Function to scrape jobs from Glassdoor
+@metrics.timed("scrape_glassdoor")
+def scrape_glassdoor_jobs(query, num_jobs=5, session=None, timeout=None, page=0):
+    soup, page_url = _get_soup("glassdoor", query, session, timeout, page)
+
+    def parse_card(job_card):
+        title, company, link = job_card.find("a", class_="jobLink"), job_card.find("div", class_="jobHeader"), job_card.find("a")
+        if title is None or company is None or link is None or not link.get("href"):
+            return None
+        return {"title": _text(title), "company": _text(company), "link": urljoin(page_url, link["href"])}
+
+    return _collect(soup.find_all("li", class_="react-job-listing"), num_jobs, parse_card)
+
+
+SCRAPERS = {
+    "indeed": scrape_indeed_jobs,
+    "linkedin": scrape_linkedin_jobs,
+    "glassdoor": scrape_glassdoor_jobs,
+}
+
+
+class TTLCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.entries = {}
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def put(self, key, value, ttl):
+        with self.lock:
+            now = time.monotonic()
+            if len(self.entries) >= self.max_entries:
+                # Drop expired entries first, then the ones closest to expiring
+                for stale in [k for k, (expires, _) in self.entries.items() if expires <= now]:
+                    del self.entries[stale]
+                while len(self.entries) >= self.max_entries:
+                    del self.entries[min(self.entries, key=lambda k: self.entries[k][0])]
+            self.entries[key] = (now + ttl, value)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+job_cache = TTLCache()
+metrics.register_collector("job_cache", lambda: {
+    "hits": job_cache.hits,
+    "misses": job_cache.misses,
+    "hit_rate": round(job_cache.hits / (job_cache.hits + job_cache.misses), 3) if job_cache.hits + job_cache.misses else 0.0,
+})
+
+
+def normalize_query(query):
+    """Lowercases, collapses whitespace and sorts the comma-separated terms, so skill order doesn't matter."""
+    terms = {re.sub(r"\s+", " ", term).strip().lower() for term in query.split(",")}
+    return ",".join(sorted(term for term in terms if term))
+
+
+def _page_is_fresh(state, page):
+    return state is not None and time.time() - state[0] < (FIRST_PAGE_TTL if page == 0 else PAGE_TTL)
+
+
+def scrape_incrementally(store, name, query, num_jobs=5, session=None, max_pages=MAX_PAGES):
+    """
+    Pages through one board into the store until it has `num_jobs` results for
+    the query, skipping pages fetched recently and stopping at the first fetched
+    page that is empty or holds only jobs the store already has.
+
+    Returns:
+    int: result pages actually fetched.
+    """
+    key, seen, fetched = normalize_query(query), 0, 0
+    for page in range(max_pages):
+        if seen >= num_jobs:
+            break
+        state = store.page_state(name, key, page)
+        if _page_is_fresh(state, page):
+            seen += state[1]
+            continue
+        jobs = SCRAPERS[name](query, num_jobs, session, page=page)
+        fetched += 1
+        new = store.upsert(jobs, query=key, source=name, page=page)
+        store.mark_page(name, key, page, len(jobs))
+        seen += len(jobs)
+        if not jobs or not new:
+            break
+    metrics.incr(f"pages_fetched_{name}", fetched)
+    return fetched
+
+
+def refresh_job_store(query, num_jobs=5, store=None, sources=None, session=None, on_source=None):
+    """
+    Incrementally scrapes the boards concurrently into the job store, asking
+    each board for its share of `num_jobs`. `on_source(name, error)` is called
+    as each board finishes (error is None on success), in the calling thread.
+
+    Returns:
+    tuple: ({source name: pages fetched}, {source name: error message})
+    """
+    from job_store import get_job_store
+
+    store = store or get_job_store()
+    names = list(sources or JOB_SOURCES)
+    session = session or get_session()
+    per_source = -(-num_jobs // len(names))
+    fetched, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        futures = {pool.submit(scrape_incrementally, store, name, query, per_source, session): name for name in names}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                fetched[name] = future.result()
+            except Exception as exc:  # timeouts, HTTP errors, unexpected markup
+                errors[name] = f"{type(exc).__name__}: {exc}"
+            if on_source is not None:
+                on_source(name, errors.get(name))
+    return fetched, errors
+
+
+# Function to fetch jobs from multiple sources
+@metrics.timed("fetch_jobs")
+def fetch_jobs_from_multiple_sources(query, num_jobs=5, store=None, on_progress=None):
+    """
+    Deduplicated jobs for the query, best-ranked first: first result pages before
+    later ones, and Indeed, LinkedIn, Glassdoor order within a page.
+    `on_progress(jobs, sources_done)` gets the jobs found so far as each board finishes.
+    """
+    from job_store import get_job_store
+
+    key = (normalize_query(query), num_jobs)
+    jobs = job_cache.get(key)
+    if jobs is not None:
+        return jobs
+
+    store = store or get_job_store()
+    done = []
+
+    def source_done(name, error):
+        done.append(name)
+        on_progress(store.jobs(query=key[0], limit=num_jobs, source_order=list(JOB_SOURCES)), list(done))
+
+    _, errors = refresh_job_store(query, num_jobs, store, on_source=source_done if on_progress else None)
+    jobs = store.jobs(query=key[0], limit=num_jobs, source_order=list(JOB_SOURCES))
+    job_cache.put(key, jobs, PARTIAL_CACHE_TTL if errors else CACHE_TTL)
+    return jobs
@@ -0,0 +1,174 @@
+"""
+Many-to-many resume x job matching: ranks every resume against every job at once.
+
+Both corpora are vectorized once with the same TF-IDF vectorizer (the persistent
+job index's when it has one, so scores match the app's). Rows come out
+L2-normalized, so the (resumes x jobs) cosine similarities are a sparse matrix
+product, computed one block of resume rows at a time. Only the top k jobs per resume are kept from
+each block (argpartition), so memory is bounded by block_rows x jobs, not by
+resumes x jobs. Blocks can be spread over a process pool.
+
+Usage:
+    python matching.py results.jsonl jobs.jsonl -k 10 -o ranked.csv --block-rows 2048 --workers 8
+
+where results.jsonl is batch.py output (one {"source", "skills"} object per line)
+and jobs.jsonl has one {"title", "company", "link"} object per line.
+
+From Python:
+    from matching import match_many
+    table = match_many(skill_lists, jobs, k=10)   # DataFrame: resume, rank, job, title, company, link, score
+"""
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from job_index import fit_vectorizer, job_text
+
+BLOCK_ROWS = 2048  # resumes per block; a block's dense scores take block_rows x jobs x 4 bytes
+
+
+def resume_text(resume):
+    """A resume's matching text: its skill list joined, as in JobIndex.query, or the text itself."""
+    return resume if isinstance(resume, str) else " ".join(resume)
+
+
+def top_k(block, job_matrix_t, k):
+    """
+    Top-k columns of (block @ job_matrix_t) per row.
+
+    Returns:
+    tuple: (indices, scores), both (rows x k) and best first; ties keep the lower job index.
+    """
+    scores = (block @ job_matrix_t).toarray()
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.lexsort((candidates, -candidate_scores), axis=1)
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+_worker_jobs_t = None
+
+
+def _init_worker(job_matrix_t):
+    global _worker_jobs_t
+    _worker_jobs_t = job_matrix_t
+
+
+def _top_k_block(args):
+    # Runs in a worker process; the job matrix was sent once, by _init_worker
+    block, k = args
+    return top_k(block, _worker_jobs_t, k)
+
+
+def iter_blocks(resume_matrix, job_matrix_t, k, block_rows=BLOCK_ROWS, workers=None):
+    """Yields (start row, indices, scores) per block of resume rows, in order."""
+    starts = range(0, resume_matrix.shape[0], block_rows)
+    if not workers or workers <= 1:
+        for start in starts:
+            yield (start, *top_k(resume_matrix[start:start + block_rows], job_matrix_t, k))
+        return
+    blocks = ((resume_matrix[start:start + block_rows], k) for start in starts)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(job_matrix_t,)) as pool:
+        for start, (indices, scores) in zip(starts, pool.map(_top_k_block, blocks)):
+            yield start, indices, scores
+
+
+def match_many(resumes, jobs, k=10, block_rows=BLOCK_ROWS, workers=None, vectorizer=None, resume_ids=None,
+               min_score=0.0):
+    """
+    Ranks every resume against every job.
+
+    Parameters:
+    resumes (list): Skill lists (or plain texts), one per resume.
+    jobs (list): Job dicts with "title", "company" and "link".
+    k (int): Jobs kept per resume.
+    block_rows (int): Resumes scored per block; caps memory at about block_rows x len(jobs) x 4 bytes per worker.
+    workers (int): Processes scoring blocks in parallel; None or 1 scores them inline.
+    vectorizer: A fitted TfidfVectorizer; defaults to the job index's, or one fitted on `jobs`.
+    resume_ids (list): Labels for the resume column (default: 0..n-1).
+    min_score (float): Matches scoring this or less are left out.
+
+    Returns:
+    DataFrame: resume, rank (1 = best), job (index into `jobs`), title, company, link and score,
+    sorted by resume then rank.
+    """
+    resumes, jobs = list(resumes), list(jobs)
+    columns = ["resume", "rank", "job", "title", "company", "link", "score"]
+    if not resumes or not jobs:
+        return pd.DataFrame(columns=columns)
+    if vectorizer is None:
+        from job_index import get_job_index
+
+        vectorizer = get_job_index().vectorizer or fit_vectorizer(jobs)
+    job_matrix_t = vectorizer.transform([job_text(job) for job in jobs]).T.tocsr()  # rows are L2-normalized
+    resume_matrix = vectorizer.transform([resume_text(resume) for resume in resumes]).tocsr()
+
+    all_indices = np.empty((len(resumes), min(k, len(jobs))), dtype=np.int64)
+    all_scores = np.empty(all_indices.shape, dtype=np.float32)
+    for start, indices, scores in iter_blocks(resume_matrix, job_matrix_t, k, block_rows, workers):
+        all_indices[start:start + len(indices)] = indices
+        all_scores[start:start + len(scores)] = scores
+
+    keep = all_scores > min_score
+    rows = np.nonzero(keep)[0]
+    job_indices = all_indices[keep]
+    ids = np.asarray(resume_ids if resume_ids is not None else range(len(resumes)))
+    titles, companies, links = (np.array([job[field] for job in jobs], dtype=object)
+                                for field in ("title", "company", "link"))
+    return pd.DataFrame({
+        "resume": ids[rows],
+        "rank": np.nonzero(keep)[1] + 1,
+        "job": job_indices,
+        "title": titles[job_indices],
+        "company": companies[job_indices],
+        "link": links[job_indices],
+        "score": all_scores[keep].round(4),
+    }, columns=columns)
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def write_table(table, path):
+    if path.endswith(".parquet"):
+        table.to_parquet(path, index=False)
+    elif path.endswith(".jsonl"):
+        table.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        table.to_csv(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank many resumes against many jobs.")
+    parser.add_argument("resumes", help="batch.py results (.jsonl with source and skills per line)")
+    parser.add_argument("jobs", help="jobs (.jsonl with title, company and link per line)")
+    parser.add_argument("-k", type=int, default=10, help="jobs kept per resume")
+    parser.add_argument("-o", "--output", default="ranked.csv", help="ranked table (.csv, .jsonl or .parquet)")
+    parser.add_argument("--block-rows", type=int, default=BLOCK_ROWS, help="resumes per block (bounds memory)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="processes scoring blocks")
+    args = parser.parse_args(argv)
+    if args.output.endswith(".parquet"):  # checked before the matching, not after it
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as exc:
+            raise SystemExit("Parquet output needs pyarrow (pip install pyarrow), or use a .csv or .jsonl output.") from exc
+
+    resumes = [record for record in read_jsonl(args.resumes) if not record.get("error")]
+    table = match_many([record.get("skills", []) for record in resumes], read_jsonl(args.jobs), k=args.k,
+                       block_rows=args.block_rows, workers=args.workers,
+                       resume_ids=[record.get("source", i) for i, record in enumerate(resumes)])
+    write_table(table, args.output)
+    print(f"{len(table)} matches for {len(resumes)} resumes written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
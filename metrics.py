@@ -0,0 +1,324 @@
+"""
+Lightweight instrumentation for the resume pipeline: per-stage timers, counters,
+Prometheus text export, JSON trace files and an optional sampling profiler.
+
+Everything is off unless RESUME_METRICS=1 is set when this module is first
+imported. When off, @timed returns the function unchanged, span() returns a
+shared no-op context manager and incr() returns immediately, so the pipeline
+pays (almost) nothing.
+
+    RESUME_METRICS=1          record stage timings and counters
+    RESUME_TRACE_DIR=traces/  also write one Chrome-trace JSON file per traced
+                              request (open in chrome://tracing or Perfetto)
+    RESUME_PROFILE=1          run a sampling profiler thread (every RESUME_PROFILE_INTERVAL
+                              seconds, default 0.005) and report the hottest stacks
+
+The exports also include what other processes recorded (e.g. the task_queue.py
+workers, which drain() their metrics into the task database after each task),
+through sources registered with register_source().
+
+    from metrics import timed, span, incr
+    @timed("extract_skills")
+    def extract_skills(text): ...
+"""
+import contextvars
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+ENABLED = os.environ.get("RESUME_METRICS", "").lower() in ("1", "true", "yes")
+TRACE_DIR = os.environ.get("RESUME_TRACE_DIR") if ENABLED else None
+PROFILE = os.environ.get("RESUME_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_INTERVAL = float(os.environ.get("RESUME_PROFILE_INTERVAL", 0.005))
+
+# Upper bounds in seconds of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_stages = {}      # stage name -> [count, total seconds, max seconds, bucket counts]
+_counters = Counter()
+_collectors = {}  # name -> function returning {metric: number}, read at export time
+_sources = {}  # name -> (read, reset): metrics recorded by other processes, merged at export time
+_trace = contextvars.ContextVar("resume_trace", default=None)
+
+
+def _observe(name, seconds):
+    with _lock:
+        stage = _stages.get(name)
+        if stage is None:
+            stage = _stages[name] = [0, 0.0, 0.0, [0] * len(BUCKETS)]
+        stage[0] += 1
+        stage[1] += seconds
+        stage[2] = max(stage[2], seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                stage[3][i] += 1
+                break
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _observe(self.name, end - self.start)
+        events = _trace.get()
+        if events is not None:
+            events.append({
+                "name": self.name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                "ts": self.start * 1e6, "dur": (end - self.start) * 1e6,
+            })
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Times the `with` block as stage `name`."""
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name):
+    """Decorator timing every call as stage `name`; a no-op when metrics are off."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def incr(name, value=1):
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] += value
+
+
+def register_collector(name, func):
+    """`func()` returns {metric: number}; exported as resume_<name>_<metric> gauges, e.g. cache hit rates."""
+    _collectors[name] = func
+
+
+def register_source(name, read, reset=None):
+    """
+    `read()` returns {process label: drain() result, accumulated} for other processes. Their
+    stages and counters are added to this process's in every export, and their collectors are
+    exported as <collector>_<label>. reset() also calls `reset()`.
+    """
+    _sources[name] = (read, reset)
+
+
+def drain():
+    """
+    This process's stages, counters and collector values as JSON-able data, for another process
+    to export (see register_source). The stages and counters are reset, so each drain is a delta.
+    """
+    with _lock:
+        stages = {name: [count, total, peak, list(buckets)] for name, (count, total, peak, buckets) in _stages.items()}
+        counters = dict(_counters)
+        _stages.clear()
+        _counters.clear()
+    return {"stages": stages, "counters": counters, "collectors": _collect()}
+
+
+def merge(into, state):
+    """Adds the stages and counters of a drain() result to `into` (another one); collectors are replaced."""
+    for name, (count, total, peak, buckets) in state.get("stages", {}).items():
+        stage = into["stages"].setdefault(name, [0, 0.0, 0.0, [0] * len(BUCKETS)])
+        stage[0] += count
+        stage[1] += total
+        stage[2] = max(stage[2], peak)
+        stage[3] = [a + b for a, b in zip(stage[3], buckets)]
+    for name, value in state.get("counters", {}).items():
+        into["counters"][name] = into["counters"].get(name, 0) + value
+    into["collectors"] = state.get("collectors", {})
+    return into
+
+
+def _collect():
+    collected = {}
+    for name, func in list(_collectors.items()):
+        try:
+            collected[name] = func()
+        except Exception:  # a broken collector must not break the export
+            continue
+    return collected
+
+
+def _merged():
+    # (stages, counters, collectors) of this process plus every registered source
+    with _lock:
+        stages = {name: [count, total, peak, list(buckets)] for name, (count, total, peak, buckets) in _stages.items()}
+        counters = dict(_counters)
+    merged = {"stages": stages, "counters": counters, "collectors": {}}
+    collected = _collect()
+    for read, _ in list(_sources.values()):
+        try:
+            states = read()
+        except Exception:  # nor a broken source
+            continue
+        for label, state in states.items():
+            merge(merged, state)
+            label = re.sub(r"\W", "_", label)
+            collected.update({f"{name}_{label}": values for name, values in state.get("collectors", {}).items()})
+    return merged["stages"], merged["counters"], collected
+
+
+class trace:
+    """
+    Groups the spans of one request; with RESUME_TRACE_DIR set, writes them to
+    <dir>/<name>-<timestamp>.json as Chrome trace events when the block ends.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.token = None
+
+    def __enter__(self):
+        if TRACE_DIR and _trace.get() is None:
+            self.token = _trace.set([])
+        return self
+
+    def __exit__(self, *exc):
+        if self.token is None:
+            return False
+        events = _trace.get()
+        _trace.reset(self.token)
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        path = os.path.join(TRACE_DIR, f"{self.name}-{time.time():.6f}-{threading.get_ident()}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return False
+
+
+def snapshot():
+    """{"stages": {name: {count, total_s, mean_ms, max_ms}}, "counters": {...}, "collectors": {...}}"""
+    stages, counters, collected = _merged()
+    stages = {
+        name: {"count": count, "total_s": round(total, 4), "mean_ms": round(total / count * 1000, 3),
+               "max_ms": round(peak * 1000, 3)}
+        for name, (count, total, peak, _) in sorted(stages.items())
+    }
+    return {"enabled": ENABLED, "stages": stages, "counters": dict(sorted(counters.items())), "collectors": collected}
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP resume_stage_seconds Time spent in each pipeline stage.",
+        "# TYPE resume_stage_seconds histogram",
+    ]
+    stages, counters, collected = _merged()
+    for name, (count, total, _, buckets) in sorted(stages.items()):
+        cumulative = 0
+        for bound, hits in zip(BUCKETS, buckets):
+            cumulative += hits
+            lines.append(f'resume_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'resume_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {count}')
+        lines.append(f'resume_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+        lines.append(f'resume_stage_seconds_count{{stage="{name}"}} {count}')
+    for name, value in sorted(counters.items()):
+        lines.append(f"# TYPE resume_{name}_total counter")
+        lines.append(f"resume_{name}_total {value}")
+    for name, values in collected.items():
+        for metric, value in sorted(values.items()):
+            if isinstance(value, (int, float)):
+                lines.append(f"# TYPE resume_{name}_{metric} gauge")
+                lines.append(f"resume_{name}_{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+    for _, reset_source in list(_sources.values()):
+        if reset_source is not None:
+            reset_source()
+
+
+class SamplingProfiler:
+    """Samples every thread's stack every `interval` seconds and counts the collapsed stacks."""
+
+    def __init__(self, interval=PROFILE_INTERVAL, depth=30):
+        self.interval = interval
+        self.depth = depth
+        self.stacks = Counter()
+        self.samples = 0
+        self.thread = None
+        self.running = False
+
+    def start(self):
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        me = threading.get_ident()
+        while self.running:
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                names = []
+                while frame is not None and len(names) < self.depth:
+                    names.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                key = ";".join(reversed(names))  # root first, as flamegraph.pl expects
+                with _lock:
+                    self.stacks[key] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def top(self, n=20):
+        """[(collapsed stack, samples), ...], most sampled first; the stacks are flamegraph.pl input."""
+        with _lock:
+            return self.stacks.most_common(n)
+
+
+_profiler = None
+
+
+def get_profiler():
+    """The sampling profiler, started on first call when RESUME_PROFILE=1; None otherwise."""
+    global _profiler
+    if PROFILE and _profiler is None:
+        with _lock:
+            if _profiler is None:
+                _profiler = SamplingProfiler()
+                _profiler.start()
+    return _profiler
@@ -0,0 +1,236 @@
+"""
+OCR fallback for scanned resumes: pages that have no text layer but do carry
+images are rasterized and OCR'd, so image-only PDFs get real text (and real
+scores) instead of an empty string.
+
+- Only those pages are touched: each one is copied into a one-page PDF and
+  sent to a process pool, while pages with text pass straight through and
+  page order is preserved. Every process that OCRs (each task worker, each API
+  pool worker) has its own pool, so it is small: RESUME_OCR_WORKERS processes,
+  default 2; 0 OCRs inline. Inside a daemonic worker (batch.py's Pool), which
+  may not start processes of its own, the pages are always OCR'd inline.
+- At most `page_budget` pages are OCR'd per document; the rest stay empty.
+- Results are cached by a hash of the page's content stream and image data
+  (in .cache/ocr.sqlite), so a re-uploaded or duplicated scan is not OCR'd twice.
+
+Rasterizing and recognizing are two small interfaces that stubs can replace:
+    rasterizer.rasterize(page_pdf_bytes, dpi) -> PIL image
+    engine.image_to_text(image) -> str
+The defaults are pdf2image/Poppler (or the page's embedded scan when Poppler is
+not installed) and Tesseract via pytesseract. Without Tesseract the fallback is
+disabled and image-only pages stay empty, as before. RESUME_OCR=0 disables it.
+"""
+import hashlib
+import io
+import multiprocessing
+import os
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from metrics import incr, span
+
+OCR_ENABLED = os.environ.get("RESUME_OCR", "1").lower() not in ("0", "false", "no")
+OCR_CACHE_PATH = os.environ.get("OCR_CACHE_PATH", os.path.join(".cache", "ocr.sqlite"))
+OCR_VERSION = "1"  # bump when the OCR engine or its settings change
+OCR_DPI = 300
+OCR_PAGE_BUDGET = 10  # pages OCR'd per document
+OCR_WORKERS = int(os.environ.get("RESUME_OCR_WORKERS", 2))  # per process that OCRs; 0 OCRs inline
+MIN_TEXT_CHARS = 20  # pages with less extracted text than this count as image-only
+
+
+class TesseractEngine:
+    def __init__(self, lang="eng"):
+        self.lang = lang
+
+    def available(self):
+        try:
+            import pytesseract  # noqa: F401
+        except ImportError:
+            return False
+        return shutil.which("tesseract") is not None
+
+    def image_to_text(self, image):
+        import pytesseract
+
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+
+class Pdf2ImageRasterizer:
+    def __init__(self, poppler_path=None):
+        if poppler_path is None:
+            from previews import POPPLER_PATH
+
+            poppler_path = POPPLER_PATH
+        self.poppler_path = poppler_path if poppler_path and os.path.isdir(poppler_path) else None
+
+    def available(self):
+        return self.poppler_path is not None or shutil.which("pdftoppm") is not None
+
+    def rasterize(self, page_pdf, dpi):
+        from pdf2image import convert_from_bytes
+
+        return convert_from_bytes(page_pdf, dpi=dpi, first_page=1, last_page=1, poppler_path=self.poppler_path)[0]
+
+
+class EmbeddedImageRasterizer:
+    """Uses the largest image embedded in the page (the scan itself) instead of rendering the page."""
+
+    def available(self):
+        return True
+
+    def rasterize(self, page_pdf, dpi):
+        import PyPDF2
+        from PIL import Image
+
+        page = PyPDF2.PdfReader(io.BytesIO(page_pdf)).pages[0]
+        images = [Image.open(io.BytesIO(image.data)) for image in page.images]
+        if not images:
+            raise ValueError("page has no embedded image")
+        return max(images, key=lambda image: image.width * image.height)
+
+
+def image_xobjects(page):
+    """The page's image XObjects (scanned pages are usually one full-page image)."""
+    resources = page.get("/Resources")
+    if resources is None:
+        return []
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return []
+    xobjects = xobjects.get_object()
+    found = [xobjects[name].get_object() for name in xobjects]
+    return [xobject for xobject in found if xobject.get("/Subtype") == "/Image"]
+
+
+def page_hash(page, images):
+    digest = hashlib.sha256()
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    for image in images:
+        digest.update(image.get_data())
+    return digest.hexdigest()
+
+
+def page_pdf_bytes(page):
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _ocr_page(page_pdf, dpi, rasterizer, engine):
+    # Runs in a worker process
+    return engine.image_to_text(rasterizer.rasterize(page_pdf, dpi))
+
+
+class OcrFallback:
+    def __init__(self, engine=None, rasterizer=None, workers=OCR_WORKERS, page_budget=OCR_PAGE_BUDGET,
+                 dpi=OCR_DPI, cache=None, cache_path=OCR_CACHE_PATH):
+        self.engine = engine or TesseractEngine()
+        if rasterizer is None:
+            rasterizer = Pdf2ImageRasterizer()
+            if not rasterizer.available():
+                rasterizer = EmbeddedImageRasterizer()
+        self.rasterizer = rasterizer
+        self.workers = workers
+        self.page_budget = page_budget
+        self.dpi = dpi
+        if cache is None:
+            from cache import ResultCache
+
+            cache = ResultCache(cache_path)
+        self.cache = cache
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def _pool(self):
+        with self.lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self.pool
+
+    def _submit(self, page_pdf):
+        if self.workers < 1 or multiprocessing.current_process().daemon:
+            # Daemonic processes (multiprocessing.Pool workers) may not have children: OCR inline
+            future = Future()
+            try:
+                future.set_result(_ocr_page(page_pdf, self.dpi, self.rasterizer, self.engine))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        return self._pool().submit(_ocr_page, page_pdf, self.dpi, self.rasterizer, self.engine)
+
+    def close(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
+
+    def _key(self, digest):
+        return f"{digest}:{OCR_VERSION}:{self.dpi}"
+
+    def texts(self, pages):
+        """
+        Takes (page, extracted text) pairs and yields each page's text in order,
+        with image-only pages replaced by their OCR text. Up to 2 x workers pages
+        are in flight at once, so OCR runs in parallel while pages stream through.
+        """
+        budget = self.page_budget
+        window = deque()  # (text, None, None) or (None, OCR future, cache key), in page order
+        for page, text in pages:
+            item = (text, None, None)
+            if len(text.strip()) < MIN_TEXT_CHARS and budget:
+                images = image_xobjects(page)
+                if images:
+                    budget -= 1
+                    key = self._key(page_hash(page, images))
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        incr("ocr_cache_hits")
+                        item = (cached["text"], None, None)
+                    else:
+                        with span("ocr_submit"):
+                            future = self._submit(page_pdf_bytes(page))
+                        item = (None, future, key)
+            window.append(item)
+            while window and (window[0][1] is None or window[0][1].done() or len(window) > 2 * self.workers):
+                yield self._finish(window.popleft())
+        while window:
+            yield self._finish(window.popleft())
+
+    def _finish(self, item):
+        text, future, key = item
+        if future is None:
+            return text
+        try:
+            with span("ocr_wait"):
+                text = future.result()
+        except Exception:  # an unreadable scan only loses its own page
+            incr("ocr_errors")
+            return ""
+        incr("ocr_pages")
+        self.cache.put(key, {"text": text})
+        return text
+
+
+_default_fallback = None
+_default_checked = False
+_default_lock = threading.Lock()
+
+
+def get_ocr_fallback():
+    """Process-wide OCR fallback, or None when it is disabled or no OCR engine is installed."""
+    global _default_fallback, _default_checked
+    with _default_lock:
+        if not _default_checked:
+            _default_checked = True
+            engine = TesseractEngine()
+            if OCR_ENABLED and engine.available():
+                _default_fallback = OcrFallback(engine)
+        return _default_fallback
@@ -0,0 +1,166 @@
+"""
+First-page thumbnails of the DOCX templates for the Resume Generator page.
+
+Each template is converted once, on a background thread pool, and the PNG is
+stored in a content-addressed cache: the file name is the SHA-256 of the
+template bytes plus the DPI, so an edited template gets a new thumbnail and
+unchanged templates are never converted again, across restarts too. The page
+only reads cached PNG bytes and never waits on a conversion. A failed
+conversion is remembered for ERROR_RETRY_SECONDS, then tried again, so a
+converter that was missing or briefly broken does not cost the preview for good.
+
+Conversion is behind a small interface (`convert(docx_bytes, dpi) -> PNG bytes`).
+The default, LibreOfficeConverter, runs LibreOffice headless (DOCX -> PDF) and
+rasterizes page 1 only with pdf2image/Poppler. Tests and machines without
+LibreOffice can pass any object with a `convert` method instead.
+"""
+import glob
+import hashlib
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PREVIEW_CACHE_PATH = os.environ.get("PREVIEW_CACHE_PATH", os.path.join(".cache", "previews"))
+PREVIEW_DPI = 50
+PREVIEW_WORKERS = 2
+CONVERT_TIMEOUT = 120
+ERROR_RETRY_SECONDS = 5 * 60  # a failed conversion is retried this long after it failed
+
+# ✅ Poppler's bin directory on Windows; on Linux/macOS pdftoppm is found on PATH
+POPPLER_PATH = os.environ.get("POPPLER_PATH", r"C:\Users\HP\Documents\poppler-24.08.0\Library\bin")
+
+
+class LibreOfficeConverter:
+    def __init__(self, binary=None, poppler_path=POPPLER_PATH, timeout=CONVERT_TIMEOUT):
+        self.binary = binary or shutil.which("soffice") or shutil.which("libreoffice") or "libreoffice"
+        self.poppler_path = poppler_path if poppler_path and os.path.isdir(poppler_path) else None
+        self.timeout = timeout
+
+    def to_pdf(self, docx_bytes):
+        with tempfile.TemporaryDirectory() as tmp:
+            docx_path = os.path.join(tmp, "template.docx")
+            with open(docx_path, "wb") as f:
+                f.write(docx_bytes)
+            # A profile per call, so several conversions can run at once
+            profile = "file://" + os.path.join(tmp, "profile").replace(os.sep, "/")
+            subprocess.run(
+                [self.binary, f"-env:UserInstallation={profile}", "--headless",
+                 "--convert-to", "pdf", "--outdir", tmp, docx_path],
+                check=True, capture_output=True, timeout=self.timeout,
+            )
+            with open(os.path.join(tmp, "template.pdf"), "rb") as f:
+                return f.read()
+
+    def convert(self, docx_bytes, dpi):
+        from pdf2image import convert_from_bytes
+
+        images = convert_from_bytes(self.to_pdf(docx_bytes), dpi=dpi, first_page=1, last_page=1,
+                                    poppler_path=self.poppler_path)
+        if not images:
+            raise ValueError("converted PDF has no pages")
+        buffer = io.BytesIO()
+        images[0].save(buffer, "PNG")
+        return buffer.getvalue()
+
+
+class PreviewCache:
+    def __init__(self, path=PREVIEW_CACHE_PATH, converter=None, dpi=PREVIEW_DPI, workers=PREVIEW_WORKERS,
+                 retry_after=ERROR_RETRY_SECONDS):
+        self.path = path
+        self.converter = converter or LibreOfficeConverter()
+        self.dpi = dpi
+        self.retry_after = retry_after
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preview")
+        self.lock = threading.Lock()
+        self.hashes = {}    # template path -> ((mtime_ns, size), sha256)
+        self.pending = {}   # cache key -> Future
+        self.errors = {}    # cache key -> (error message, time.monotonic() of the failure)
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, template_path):
+        stat = os.stat(template_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.hashes.get(template_path)
+        if cached is None or cached[0] != signature:
+            with open(template_path, "rb") as f:
+                cached = (signature, hashlib.sha256(f.read()).hexdigest())
+            self.hashes[template_path] = cached
+        return f"{cached[1]}-{self.dpi}dpi"
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".png")
+
+    def _render(self, template_path, key):
+        try:
+            with open(template_path, "rb") as f:
+                png = self.converter.convert(f.read(), self.dpi)
+            tmp = self._file(key) + f".{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(png)
+            os.replace(tmp, self._file(key))
+        except Exception as exc:  # a broken template or missing converter only loses its preview
+            with self.lock:
+                self.errors[key] = (f"{type(exc).__name__}: {exc}", time.monotonic())
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def submit(self, template_path):
+        """Queues a conversion unless the thumbnail is cached, queued or recently failed. Returns the cache key."""
+        key = self.key(template_path)
+        with self.lock:
+            error = self.errors.get(key)
+            if error is not None and time.monotonic() - error[1] >= self.retry_after:
+                del self.errors[key]  # retry it
+                error = None
+            if key in self.pending or error is not None or os.path.exists(self._file(key)):
+                return key
+            self.pending[key] = self.pool.submit(self._render, template_path, key)
+        return key
+
+    def warm(self, template_dir):
+        """Queues every template in `template_dir`; returns immediately."""
+        for template_path in sorted(glob.glob(os.path.join(template_dir, "*.docx"))):
+            self.submit(template_path)
+
+    def get(self, template_path, timeout=0):
+        """
+        PNG bytes of the template's first page, or None if it is not ready
+        (queued, or failed: see error()). Waits up to `timeout` seconds for a
+        queued conversion; the default never blocks.
+        """
+        key = self.submit(template_path)
+        future = self.pending.get(key)
+        if future is not None and timeout:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+        try:
+            with open(self._file(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def error(self, template_path):
+        """The last conversion error for this template, or None; cleared when the retry is queued."""
+        error = self.errors.get(self.key(template_path))
+        return error[0] if error is not None else None
+
+
+_default_previews = None
+_default_lock = threading.Lock()
+
+
+def get_preview_cache():
+    """Process-wide preview cache, shared by every Streamlit session and rerun."""
+    global _default_previews
+    with _default_lock:
+        if _default_previews is None:
+            _default_previews = PreviewCache()
+        return _default_previews
@@ -0,0 +1,425 @@
+"""
+Persistent store of analyzed resumes, searchable by skills, years and score.
+
+Every analysis (extract_skills, extract_experience, score_resume) is kept as a
+row. Skills are dictionary-encoded as integer IDs: the dictionary starts as
+the skill taxonomy's skills (in file order), and grows when a new skill shows up, so IDs never change.
+
+- meta.sqlite holds one row per resume (content key, source, owner, skill IDs,
+  years, score), deduplicated by content key. It is the source of truth.
+- Rows are sealed into append-only column segments of SEGMENT_ROWS rows
+  (.npy files, memory-mapped on load, like the job index): years (int16),
+  scores (float32) and one sorted posting list per skill (the segment rows
+  that have it), stored back to back with per-skill offsets. They take space in
+  proportion to the (resume, skill) pairs, however many skills the taxonomy
+  grows to. Rows not sealed yet are read from SQLite and queried the same way.
+- Segments are compacted by size tier: a segment of at least segment_rows *
+  MERGE_FACTOR**t rows is in tier t, and MERGE_FACTOR adjacent segments of one
+  tier are merged into one of a higher tier. A row is rewritten about once per
+  tier, log(rows) times in all, and a store keeps O(MERGE_FACTOR * log(rows)) segments.
+- The segments table in meta.sqlite lists the live segments. Several processes
+  can share a store: writes (new rows, sealing, compaction) are BEGIN IMMEDIATE
+  transactions, so one process writes at a time, and every read first checks
+  PRAGMA data_version to reload the segment list when another process changed
+  it. Segment directories no longer listed are deleted by a later write.
+
+A query intersects (or merges) the skills' posting lists, shortest first, then
+filters on the years and score columns, so "Python AND Kubernetes, >= 3 years,
+score >= 70" touches a few posting lists and the years and scores of the rows
+left instead of every resume.
+
+    store = get_result_store()
+    store.add(key, "jane.pdf", "alice", skills, years, score)
+    rows = store.query(all_skills=["Python", "Kubernetes"], min_years=3, min_score=70)
+    store.fetch(rows[:50])   # [{"row", "source", "owner", "skills", "years", "score", "created"}, ...]
+"""
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+import metrics
+from skill_matcher import get_taxonomy
+
+RESULT_STORE_PATH = os.environ.get("RESULT_STORE_PATH", os.path.join(".cache", "result_store"))
+SEGMENT_ROWS = 4096  # unsealed rows are written out as a segment once there are this many
+MERGE_FACTOR = 4  # this many adjacent segments of one size tier are merged into one
+FETCH_BATCH = 500  # rows per SELECT ... IN (...) when fetching records
+
+
+def encode_lists(skill_lists):
+    """(offsets, ids): row i's skill IDs are ids[offsets[i]:offsets[i + 1]]."""
+    offsets = np.zeros(len(skill_lists) + 1, dtype=np.int64)
+    np.cumsum([len(ids) for ids in skill_lists], out=offsets[1:])
+    ids = np.fromiter((i for row in skill_lists for i in row), dtype=np.uint32, count=int(offsets[-1]))
+    return offsets, ids
+
+
+def posting_lists(skill_of, row_of, skill_count):
+    """
+    Inverts (skill, row) pairs, given in row order, into posting lists: skill s's
+    rows are posting_rows[posting_offsets[s]:posting_offsets[s + 1]], ascending.
+    """
+    posting_offsets = np.zeros(skill_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(skill_of, minlength=skill_count), out=posting_offsets[1:])
+    return {"posting_offsets": posting_offsets, "posting_rows": row_of[np.argsort(skill_of, kind="stable")]}
+
+
+def build_columns(years, scores, offsets, ids, skill_count):
+    """Column arrays and per-skill posting lists for a run of rows (skill IDs as encode_lists returns them)."""
+    row_of = np.repeat(np.arange(len(offsets) - 1, dtype=np.uint32), np.diff(offsets))
+    return {
+        "years": np.asarray(years, dtype=np.int16),
+        "scores": np.asarray(scores, dtype=np.float32),
+        **posting_lists(ids, row_of, skill_count),
+    }
+
+
+class Segment:
+    def __init__(self, name, start, columns):
+        self.name = name  # None for the rows not sealed yet
+        self.start = start
+        self.rows = len(columns["years"])
+        self.columns = columns
+
+    def postings(self, skill_id):
+        """Rows of this segment that have the skill, ascending."""
+        offsets = self.columns["posting_offsets"]
+        if skill_id + 1 >= len(offsets):  # skill added after this segment was sealed
+            return np.zeros(0, dtype=np.uint32)
+        return self.columns["posting_rows"][offsets[skill_id]:offsets[skill_id + 1]]
+
+    def matching(self, all_ids, any_ids, min_years, min_score):
+        rows = None
+        for postings in sorted((self.postings(i) for i in all_ids), key=len):
+            if rows is None:
+                rows = postings
+            elif len(rows):  # keep the (shorter) candidates found in the next list
+                found = np.searchsorted(postings, rows)
+                rows = rows[(found < len(postings)) & (postings[np.minimum(found, len(postings) - 1)] == rows)]
+        if any_ids:
+            either = np.zeros(self.rows, dtype=bool)
+            for skill_id in any_ids:
+                either[self.postings(skill_id)] = True
+            rows = np.flatnonzero(either) if rows is None else rows[either[rows]]
+        if rows is None:
+            mask = np.ones(self.rows, dtype=bool)
+            if min_years is not None:
+                mask &= self.columns["years"] >= min_years
+            if min_score is not None:
+                mask &= self.columns["scores"] >= min_score
+            return np.flatnonzero(mask) + self.start
+        rows = np.asarray(rows, dtype=np.int64)
+        if min_years is not None:
+            rows = rows[self.columns["years"][rows] >= min_years]
+        if min_score is not None:
+            rows = rows[self.columns["scores"][rows] >= min_score]
+        return rows + self.start
+
+
+class ResultStore:
+    def __init__(self, path=RESULT_STORE_PATH, segment_rows=SEGMENT_ROWS):
+        self.path = path
+        self.segment_rows = segment_rows
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        # isolation_level=None: writes are explicit BEGIN IMMEDIATE transactions, so processes sharing
+        # the store take turns adding rows and writing segments
+        self.db = sqlite3.connect(os.path.join(path, "meta.sqlite"), timeout=30, check_same_thread=False,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS skills (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE COLLATE NOCASE);"
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            " row INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, source TEXT, owner TEXT, skill_ids TEXT NOT NULL,"
+            " years INTEGER NOT NULL, score REAL NOT NULL, created REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS segments (name TEXT PRIMARY KEY, start INTEGER NOT NULL, rows INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS resumes_owner ON resumes (owner, row);"
+        )
+        self.skill_names, self.skill_ids, self.segments = [], {}, []
+        self._tail = None  # Segment of unsealed rows, rebuilt after writes
+        self._version = None  # PRAGMA data_version the in-memory state was loaded at
+
+        def work():
+            if self.db.execute("SELECT COUNT(*) FROM skills").fetchone()[0] == 0:
+                self.db.executemany("INSERT INTO skills (id, name) VALUES (?, ?)", enumerate(get_taxonomy().skills))
+                self._reload()
+            self._seal()
+
+        self._transaction(work)
+
+    def _transaction(self, work):
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self._refresh()
+                result = work()
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                self._version = None  # skills and segments added in memory were rolled back
+                raise
+            self.db.execute("COMMIT")
+            return result
+
+    def _refresh(self):
+        # Called under self.lock, inside a transaction: picks up rows, skills and segments other
+        # processes committed (data_version only changes on their commits, not this connection's)
+        version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version:
+            self._reload()
+            self._version = version
+
+    def _begin_read(self):
+        # Called under self.lock: starts a read snapshot and refreshes from it. A snapshot taken just before a
+        # compaction committed lists segments the next write may delete; then start over from a newer snapshot
+        for attempt in range(3):
+            self.db.execute("BEGIN")
+            try:
+                self._refresh()
+                return
+            except FileNotFoundError:
+                self.db.execute("COMMIT")
+                if attempt == 2:
+                    raise
+
+    def _reload(self):
+        self.skill_names = [name for _, name in self.db.execute("SELECT id, name FROM skills ORDER BY id")]
+        self.skill_ids = {name.lower(): i for i, name in enumerate(self.skill_names)}
+        loaded = {segment.name: segment for segment in self.segments}
+        self.segments = [loaded.get(name) or self._read_segment(name, start)
+                         for name, start in self.db.execute("SELECT name, start FROM segments ORDER BY start")]
+        self._tail = None
+
+    # ---------- persistence ----------
+
+    def _file(self, *parts):
+        return os.path.join(self.path, *parts)
+
+    def segment_names(self):
+        return [segment.name for segment in self.segments]
+
+    def _read_segment(self, name, start):
+        columns = {part: np.load(self._file(name, f"{part}.npy"), mmap_mode="r")
+                   for part in ("years", "scores", "posting_offsets", "posting_rows")}
+        return Segment(name, start, columns)
+
+    def _write_segment(self, start, columns, replaces=()):
+        # Called inside a write transaction; the segments table, not the directory, says which segments exist
+        name = f"seg-{start:010d}-{len(columns['years']):010d}"
+        tmp = self._file(name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for part, array in columns.items():
+            np.save(os.path.join(tmp, f"{part}.npy"), array)
+        shutil.rmtree(self._file(name), ignore_errors=True)  # an unlisted leftover of a rolled back write
+        os.replace(tmp, self._file(name))  # readers never see a half-written segment
+        self.db.executemany("DELETE FROM segments WHERE name = ?", [(old,) for old in replaces])
+        self.db.execute("INSERT INTO segments (name, start, rows) VALUES (?, ?, ?)", (name, start, len(columns["years"])))
+        return self._read_segment(name, start)
+
+    def _remove_unlisted(self):
+        # Segments replaced by a compaction are deleted at the next write: other processes may still have them
+        # memory-mapped (which stops the delete on Windows, hence ignore_errors) until they refresh
+        listed = set(self.segment_names())
+        for name in os.listdir(self.path):
+            if name.startswith("seg-") and name not in listed:
+                shutil.rmtree(self._file(name), ignore_errors=True)
+
+    @property
+    def sealed_rows(self):
+        return sum(segment.rows for segment in self.segments)
+
+    def _unsealed(self):
+        return self.db.execute("SELECT skill_ids, years, score FROM resumes WHERE row >= ? ORDER BY row",
+                               (self.sealed_rows,)).fetchall()
+
+    def _seal(self):
+        # Replaced by an earlier, committed compaction, left by a writer that crashed, or from before
+        # segments were recorded
+        self._remove_unlisted()
+        rows = self._unsealed()
+        while len(rows) >= self.segment_rows:
+            chunk, rows = rows[:self.segment_rows], rows[self.segment_rows:]
+            columns = build_columns([r[1] for r in chunk], [r[2] for r in chunk],
+                                    *encode_lists([json.loads(r[0]) for r in chunk]), len(self.skill_names))
+            self.segments.append(self._write_segment(self.sealed_rows, columns))
+        self._compact()
+
+    def _tier(self, rows):
+        tier, size = 0, self.segment_rows * MERGE_FACTOR
+        while rows >= size:
+            tier, size = tier + 1, size * MERGE_FACTOR
+        return tier
+
+    def _compact(self):
+        # Merge the oldest run of MERGE_FACTOR same-tier segments until there is none. Segments stay
+        # in tier order, largest first, and a merge may complete a run in the tier above
+        while True:
+            tiers = [self._tier(segment.rows) for segment in self.segments]
+            first = next((i for i in range(len(tiers) - MERGE_FACTOR + 1)
+                          if len(set(tiers[i:i + MERGE_FACTOR])) == 1), None)
+            if first is None:
+                break
+            self._merge(first, first + MERGE_FACTOR)
+
+    def _merge(self, first, last):
+        # Adjacent segments are consecutive in row order, so each skill's merged posting list stays ascending
+        merging = self.segments[first:last]
+        start = merging[0].start
+        skill_of = np.concatenate([
+            np.repeat(np.arange(len(s.columns["posting_offsets"]) - 1, dtype=np.uint32),
+                      np.diff(s.columns["posting_offsets"]))
+            for s in merging
+        ])
+        row_of = np.concatenate([s.columns["posting_rows"] + np.uint32(s.start - start) for s in merging])
+        merged = {
+            "years": np.concatenate([s.columns["years"] for s in merging]),
+            "scores": np.concatenate([s.columns["scores"] for s in merging]),
+            **posting_lists(skill_of, row_of, len(self.skill_names)),
+        }
+        names = [segment.name for segment in merging]
+        del skill_of, row_of, merging
+        self.segments[first:last] = []  # release the memory maps before their files are deleted
+        self.segments.insert(first, self._write_segment(start, merged, replaces=names))
+
+    # ---------- writing ----------
+
+    def _encode(self, skills):
+        ids = set()
+        for skill in skills:
+            skill_id = self.skill_ids.get(skill.lower())
+            if skill_id is None:
+                skill_id = len(self.skill_names)
+                self.db.execute("INSERT INTO skills (id, name) VALUES (?, ?)", (skill_id, skill))
+                self.skill_names.append(skill)
+                self.skill_ids[skill.lower()] = skill_id
+            ids.add(skill_id)
+        return sorted(ids)
+
+    def add_many(self, records):
+        """
+        Stores analysis results, skipping content keys that are already stored.
+
+        Parameters:
+        records (iterable): dicts with "key", "source", "owner", "skills", "years" and "score".
+
+        Returns:
+        int: rows added.
+        """
+        now = time.time()
+
+        def work():
+            added = 0
+            row = self.db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM resumes").fetchone()[0]
+            for record in records:
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO resumes (row, key, source, owner, skill_ids, years, score, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row, record["key"], record.get("source"), record.get("owner"),
+                     json.dumps(self._encode(record["skills"])), int(record["years"]), float(record["score"]), now))
+                if cursor.rowcount:
+                    row += 1
+                    added += 1
+            if added:
+                self._tail = None
+                self._seal()
+            return added
+
+        added = self._transaction(work)
+        metrics.incr("result_store_rows", added)
+        return added
+
+    def add(self, key, source, owner, skills, years, score):
+        return self.add_many([{"key": key, "source": source, "owner": owner, "skills": skills,
+                               "years": years, "score": score}])
+
+    # ---------- querying ----------
+
+    def _current_segments(self):
+        # Called under self.lock; one snapshot for the segment list, the skills and the unsealed rows
+        self._begin_read()
+        try:
+            if self._tail is None:
+                rows = self._unsealed()
+                columns = build_columns([r[1] for r in rows], [r[2] for r in rows],
+                                        *encode_lists([json.loads(r[0]) for r in rows]), len(self.skill_names))
+                self._tail = Segment(None, self.sealed_rows, columns)
+        finally:
+            self.db.execute("COMMIT")
+        return self.segments + [self._tail]
+
+    @metrics.timed("result_query")
+    def query(self, all_skills=(), any_skills=(), min_years=None, min_score=None, owner=None):
+        """
+        Rows of the resumes that have every skill in `all_skills`, at least one of
+        `any_skills` (when given), and at least `min_years` / `min_score`. With
+        `owner`, only that user's resumes.
+
+        Returns:
+        ndarray: row numbers, ascending (oldest first).
+        """
+        with self.lock:
+            segments = self._current_segments()
+            all_ids = [self.skill_ids.get(skill.lower(), -1) for skill in all_skills]
+            any_ids = [self.skill_ids[skill.lower()] for skill in any_skills if skill.lower() in self.skill_ids]
+            if owner is not None:
+                end = sum(segment.rows for segment in segments)  # rows added since are not in the columns yet
+                owned = np.array([row for row, in self.db.execute(
+                    "SELECT row FROM resumes WHERE owner = ? AND row < ? ORDER BY row", (owner, end))], dtype=np.int64)
+        if -1 in all_ids or (any_skills and not any_ids):
+            return np.zeros(0, dtype=np.int64)
+        found = [segment.matching(all_ids, any_ids, min_years, min_score) for segment in segments]
+        rows = np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+        return rows if owner is None else rows[np.isin(rows, owned, assume_unique=True)]
+
+    def fetch(self, rows):
+        """Records for the given rows, in the order given."""
+        rows = [int(row) for row in rows]
+        found = {}
+        with self.lock:
+            self._begin_read()
+            try:
+                for i in range(0, len(rows), FETCH_BATCH):
+                    batch = rows[i:i + FETCH_BATCH]
+                    for row, source, owner, skill_ids, years, score, created in self.db.execute(
+                            f"SELECT row, source, owner, skill_ids, years, score, created FROM resumes "
+                            f"WHERE row IN ({','.join('?' * len(batch))})", batch):
+                        found[row] = {"row": row, "source": source, "owner": owner,
+                                      "skills": [self.skill_names[i] for i in json.loads(skill_ids)],
+                                      "years": years, "score": score, "created": created}
+            finally:
+                self.db.execute("COMMIT")
+        return [found[row] for row in rows if row in found]
+
+    def top(self, rows, limit):
+        """The `limit` best-scoring of `rows`, best first."""
+        rows = np.asarray(rows)
+        if len(rows) == 0:
+            return rows
+        with self.lock:
+            segments = self._current_segments()
+        scores = np.concatenate([segment.columns["scores"] for segment in segments])[rows]
+        limit = min(limit, len(rows))
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        return rows[best[np.argsort(-scores[best], kind="stable")]]
+
+    def __len__(self):
+        with self.lock:
+            return sum(segment.rows for segment in self._current_segments())
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_result_store():
+    """Process-wide result store, shared by every Streamlit session and rerun."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ResultStore()
+        return _default_store
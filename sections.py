@@ -0,0 +1,66 @@
+"""
+Splits resume text into sections (experience, education, skills, projects,
+certifications) in one linear pass.
+
+A section starts at a heading line: a line holding only one of the known headers,
+optionally followed by ":" ("Experience", "Skills:"). Body lines that merely
+start with a header word ("Experience-driven analyst...", "Skills: Python") are
+not headings. A section runs until the next heading or the end of the text. The heading regex
+is compiled once at import, is anchored to line starts and has no nested
+quantifiers, so scanning stays linear however adversarial the input.
+"""
+import re
+from collections import namedtuple
+
+SECTION_HEADERS = {
+    "experience": [
+        "Work Experience/Internships", "work experience", "professional experience",
+        "employment history", "career summary", "job experience", "work history", "experience",
+    ],
+    "education": ["education", "academic background", "educational qualifications", "academics"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies"],
+    "projects": ["projects", "academic projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses & certifications", "licenses and certifications"],
+}
+
+_HEADER_NAMES = {header.lower(): name for name, headers in SECTION_HEADERS.items() for header in headers}
+
+# Longest headers first so "work experience" wins over "experience".
+HEADING_PATTERN = re.compile(
+    r"^[ \t]*+(?P<header>{})[ \t]*+:?[ \t]*+\r?$".format(
+        "|".join(re.escape(header) for header in sorted(_HEADER_NAMES, key=len, reverse=True))
+    ),
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# name: canonical section name; start: offset of the heading; body_start: where the content starts; end: next heading or end of text
+Section = namedtuple("Section", ["name", "header", "start", "body_start", "end"])
+
+
+def find_headings(text, offset=0):
+    """Returns (name, header, start, body_start) for every heading line, with offsets shifted by `offset`."""
+    return [
+        (_HEADER_NAMES[match.group("header").lower()], match.group("header"), offset + match.start(), offset + match.end())
+        for match in HEADING_PATTERN.finditer(text)
+    ]
+
+
+def sections_from_headings(headings, text_length):
+    return [
+        Section(name, header, start, body_start, headings[i + 1][2] if i + 1 < len(headings) else text_length)
+        for i, (name, header, start, body_start) in enumerate(headings)
+    ]
+
+
+def segment_resume(text):
+    """Returns the resume's sections, in document order."""
+    return sections_from_headings(find_headings(text), len(text))
+
+
+def get_section(sections, name):
+    """First section called `name`, or None."""
+    return next((section for section in sections if section.name == name), None)
+
+
+def section_text(text, section):
+    return text[section.body_start:section.end].strip()
@@ -0,0 +1,369 @@
+"""
+Skill extraction against the skill taxonomy in skills.yaml.
+
+The taxonomy (skills by category, their aliases, and the keywords score_resume
+looks for) is compiled into a SkillIndex, a token trie, and the compiled form is
+cached with marshal in TAXONOMY_ARTIFACT_PATH: loading it takes milliseconds and
+needs no YAML parser. The artifact records the file it was built from and is
+rebuilt when that file changes.
+
+get_taxonomy() / get_skill_index() return the current taxonomy, checking the file
+at most every RELOAD_CHECK_SECONDS, so edits reach a running app without a restart.
+A file that no longer compiles is reported (metric "taxonomy_reload_errors") and
+the previous taxonomy stays in use.
+
+Prebuild the artifact (e.g. in a deploy step):
+    python skill_matcher.py [--taxonomy skills.yaml] [--artifact .cache/skills.marshal]
+"""
+import argparse
+import hashlib
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+
+import metrics
+
+# skills.yaml ships next to this module, so it is found whatever the working directory
+TAXONOMY_PATH = os.environ.get("SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.yaml"))
+TAXONOMY_ARTIFACT_PATH = os.environ.get("SKILL_TAXONOMY_ARTIFACT", os.path.join(".cache", "skills.marshal"))
+ARTIFACT_FORMAT = 1  # bump when the artifact layout changes
+RELOAD_CHECK_SECONDS = 2.0
+
+
+class TaxonomyError(ValueError):
+    pass
+
+
+# A token is a run of letters/digits, optionally followed by "++" or "#" so that
+# "C++" and "C#" survive. Everything else (spaces, ".", "/", "-") separates tokens,
+# which lets "Node.js", "CI/CD" and "Scikit-Learn" match as multi-token skills.
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?:\+\+|#)?")
+
+_SEPARATOR = "\0"  # joins the tokens of a trie key; never part of a token
+
+
+def normalize_tokens(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+class SkillIndex:
+    """
+    Token trie over normalized skill names, compiled once.
+
+    Every token position in the text is walked at most `max_depth` levels deep
+    (the longest skill, in tokens), so a scan is linear in the resume length and
+    independent of how many skills are in the index.
+
+    The trie is one flat dict from each token prefix (tokens joined by NUL) to the
+    skill ending there, or "" if none does: a single object to serialize, and
+    half the load time of nested per-node dicts at 20k skills.
+    """
+
+    def __init__(self, skills, aliases=None):
+        """`aliases` maps other names to a skill; matches of an alias report the skill."""
+        self.skills = list(dict.fromkeys(skills))
+        self.trie = {}
+        self.max_depth = 0
+        names = [(skill, skill) for skill in self.skills] + list((aliases or {}).items())
+        for name, skill in names:
+            tokens = normalize_tokens(name)
+            if not tokens:
+                continue
+            for depth in range(1, len(tokens)):
+                self.trie.setdefault(_SEPARATOR.join(tokens[:depth]), "")
+            key = _SEPARATOR.join(tokens)
+            if not self.trie.get(key):  # the first skill listed for these tokens wins
+                self.trie[key] = skill
+            self.max_depth = max(self.max_depth, len(tokens))
+
+    @classmethod
+    def from_trie(cls, skills, trie, max_depth):
+        """An index over an already built trie, e.g. one loaded from a taxonomy artifact."""
+        index = cls.__new__(cls)
+        index.skills, index.trie, index.max_depth = skills, trie, max_depth
+        return index
+
+    def find(self, text):
+        """
+        Returns every skill occurrence as a (start, end, skill) tuple, where
+        start/end are character offsets into `text`. Overlapping matches are
+        all reported (e.g. "Google Cloud" and "Cloud Security").
+        """
+        spans = [(m.start(), m.end(), m.group().lower()) for m in TOKEN_PATTERN.finditer(text)]
+        return self._walk(spans)
+
+    def _walk(self, spans, first_end=0):
+        # Only matches whose last token is at index >= first_end are reported.
+        trie = self.trie
+        matches = []
+        for i in range(len(spans)):
+            key = spans[i][2]
+            skill = trie.get(key)
+            j = i
+            while skill is not None:
+                if skill and j >= first_end:
+                    matches.append((spans[i][0], spans[j][1], skill))
+                j += 1
+                if j >= len(spans):
+                    break
+                key = f"{key}{_SEPARATOR}{spans[j][2]}"
+                skill = trie.get(key)
+        return matches
+
+    def extract(self, text):
+        """Returns the distinct skills found in `text`, in order of first appearance."""
+        return list(dict.fromkeys(skill for _, _, skill in self.find(text)))
+
+
+class SkillScanner:
+    """
+    Incremental SkillIndex.find() for text that arrives in chunks, such as PDF
+    pages. Offsets refer to the chunks joined with `separator`, and skills that
+    span a chunk boundary are still found.
+    """
+
+    def __init__(self, index=None, separator="\n"):
+        self.index = index or get_skill_index()
+        self.separator = separator
+        self.offset = 0
+        self.carry = []  # last tokens of the previous chunk that may start a multi-token skill
+        self.matches = []
+
+    def feed(self, chunk):
+        """Scans one chunk and returns the matches it completed."""
+        if self.offset:
+            self.offset += len(self.separator)
+        spans = self.carry + [(self.offset + m.start(), self.offset + m.end(), m.group().lower())
+                              for m in TOKEN_PATTERN.finditer(chunk)]
+        new = self.index._walk(spans, first_end=len(self.carry))
+        self.carry = spans[max(0, len(spans) - self.index.max_depth + 1):] if self.index.max_depth > 1 else []
+        self.offset += len(chunk)
+        self.matches.extend(new)
+        return new
+
+    @property
+    def skills(self):
+        return list(dict.fromkeys(skill for _, _, skill in self.matches))
+
+
+
+class Taxonomy:
+    """A compiled skills.yaml: canonical skills, their categories and aliases, the scoring keywords and the SkillIndex."""
+
+    def __init__(self, skills, categories, aliases, industry_keywords, ats_sections, index, digest=""):
+        self.skills = skills  # canonical names, in file order
+        self.categories = categories  # skill -> category
+        self.aliases = aliases  # alias -> skill
+        self.industry_keywords = industry_keywords
+        self.ats_sections = ats_sections
+        self.index = index
+        self.digest = digest  # SHA-256 of the source file
+
+    def category(self, skill):
+        return self.categories.get(skill)
+
+    def by_category(self, skills):
+        """Groups skills by category, in order of first appearance; skills not in the taxonomy go under "Other"."""
+        groups = {}
+        for skill in skills:
+            groups.setdefault(self.categories.get(skill, "Other"), []).append(skill)
+        return groups
+
+    def to_payload(self):
+        # Built-in types only, so the artifact can be written with marshal
+        return {
+            "skills": self.skills, "categories": self.categories, "aliases": self.aliases,
+            "industry_keywords": self.industry_keywords, "ats_sections": self.ats_sections,
+            "trie": self.index.trie, "max_depth": self.index.max_depth, "digest": self.digest,
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        index = SkillIndex.from_trie(payload["skills"], payload["trie"], payload["max_depth"])
+        return cls(payload["skills"], payload["categories"], payload["aliases"], payload["industry_keywords"],
+                   payload["ats_sections"], index, payload["digest"])
+
+
+def _entry_names(category, entry):
+    # A skill entry is "Name" or {"Name": [aliases]}
+    if isinstance(entry, dict) and len(entry) == 1:
+        (name, aliases), = entry.items()
+        if aliases is not None and not isinstance(aliases, list):
+            raise TaxonomyError(f"{category}: the aliases of {name!r} should be a list")
+        return str(name), [str(alias) for alias in aliases or []]
+    if isinstance(entry, (str, int, float)):
+        return str(entry), []
+    raise TaxonomyError(f"{category}: can't read the skill entry {entry!r}")
+
+
+def compile_taxonomy(data, digest=""):
+    """
+    Builds a Taxonomy from parsed skills.yaml data.
+
+    Raises:
+    TaxonomyError: a required section is missing, an entry is malformed, or two
+    skills/aliases match the same words (matching ignores case and punctuation).
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("categories"), dict):
+        raise TaxonomyError("the taxonomy has no 'categories' mapping")
+    scoring = data.get("scoring") or {}
+    keywords = {field: [str(word).lower() for word in scoring.get(field) or []]
+                for field in ("industry_keywords", "ats_sections")}
+    for field, words in keywords.items():
+        if not words:
+            raise TaxonomyError(f"scoring.{field} is missing or empty")
+
+    skills, categories, aliases, owners = [], {}, {}, {}
+    for category, entries in data["categories"].items():
+        for entry in entries or []:
+            skill, names = _entry_names(category, entry)
+            for name in [skill] + names:
+                tokens = tuple(normalize_tokens(name))
+                if not tokens:
+                    raise TaxonomyError(f"{category}: {name!r} has no letters or digits to match")
+                owner = owners.get(tokens)
+                if owner is not None and (name is skill or owner != skill):
+                    raise TaxonomyError(f"{category}: {name!r} matches the same words as {owner!r} "
+                                        f"({categories[owner]})")
+                owners[tokens] = skill
+                if name is not skill:
+                    aliases[name] = skill
+            skills.append(skill)
+            categories[skill] = str(category)
+    index = SkillIndex(skills, aliases)
+    return Taxonomy(skills, categories, aliases, keywords["industry_keywords"], keywords["ats_sections"],
+                    index, digest)
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+
+def _read_artifact(artifact_path):
+    try:
+        with open(artifact_path, "rb") as file:
+            artifact_format, python, source, payload = marshal.loads(file.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        return None, None
+    # marshal's format is only stable within one Python version
+    if artifact_format != ARTIFACT_FORMAT or python != list(sys.version_info[:2]):
+        return None, None
+    return source, payload
+
+
+def write_artifact(taxonomy, source, artifact_path=TAXONOMY_ARTIFACT_PATH):
+    """Writes the compiled taxonomy atomically, tagged with the `source` stamp it was built from."""
+    if os.path.dirname(artifact_path):
+        os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+    data = marshal.dumps((ARTIFACT_FORMAT, list(sys.version_info[:2]), source, taxonomy.to_payload()))
+    tmp = f"{artifact_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as file:
+        file.write(data)
+    os.replace(tmp, artifact_path)
+    return len(data)
+
+
+@metrics.timed("load_taxonomy")
+def load_taxonomy(path=TAXONOMY_PATH, artifact_path=TAXONOMY_ARTIFACT_PATH):
+    """
+    The compiled taxonomy for `path`: read from the artifact when it was built from
+    this version of the file, otherwise compiled (and the artifact rewritten).
+    """
+    stamp = _source_stamp(path)
+    source, payload = _read_artifact(artifact_path) if artifact_path else (None, None)
+    if payload is not None and source == stamp:
+        return Taxonomy.from_payload(payload)
+    with open(path, "rb") as file:
+        raw = file.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if payload is not None and payload["digest"] == digest:  # touched or copied, not changed
+        taxonomy = Taxonomy.from_payload(payload)
+    else:
+        import yaml
+
+        try:
+            data = yaml.safe_load(raw)
+        except yaml.YAMLError as exc:
+            raise TaxonomyError(f"{path} is not valid YAML: {exc}") from exc
+        taxonomy = compile_taxonomy(data, digest)
+        metrics.incr("taxonomy_compiles")
+    if artifact_path:
+        try:
+            write_artifact(taxonomy, stamp, artifact_path)
+        except OSError:
+            pass  # read-only checkout: compile again next time
+    return taxonomy
+
+
+_taxonomy = None
+_taxonomy_stamp = None
+_taxonomy_checked = 0.0
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """The current taxonomy, reloaded when TAXONOMY_PATH has changed (checked at most every RELOAD_CHECK_SECONDS)."""
+    global _taxonomy, _taxonomy_stamp, _taxonomy_checked
+    if _taxonomy is not None and time.monotonic() - _taxonomy_checked < RELOAD_CHECK_SECONDS:
+        return _taxonomy
+    with _taxonomy_lock:
+        now = time.monotonic()
+        if _taxonomy is not None and now - _taxonomy_checked < RELOAD_CHECK_SECONDS:
+            return _taxonomy
+        stamp = None
+        try:
+            stamp = _source_stamp(TAXONOMY_PATH)
+            if stamp != _taxonomy_stamp:
+                taxonomy = load_taxonomy(TAXONOMY_PATH)
+                if _taxonomy is not None:
+                    metrics.incr("taxonomy_reloads")
+                _taxonomy, _taxonomy_stamp = taxonomy, stamp
+        except (OSError, TaxonomyError):
+            if _taxonomy is None:
+                raise
+            metrics.incr("taxonomy_reload_errors")  # keep matching with the last good taxonomy
+            _taxonomy_stamp = stamp or _taxonomy_stamp  # and don't retry this version of the file
+        _taxonomy_checked = now
+        return _taxonomy
+
+
+def get_skill_index():
+    return get_taxonomy().index
+
+
+def __getattr__(name):
+    # SKILLS_LIST and SKILL_INDEX used to be module constants; they now come from the current taxonomy
+    if name == "SKILLS_LIST":
+        return list(get_taxonomy().skills)
+    if name == "SKILL_INDEX":
+        return get_skill_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the skill taxonomy into its matcher artifact.")
+    parser.add_argument("--taxonomy", default=TAXONOMY_PATH, help="taxonomy file (.yaml)")
+    parser.add_argument("--artifact", default=TAXONOMY_ARTIFACT_PATH, help="compiled artifact to write")
+    args = parser.parse_args(argv)
+
+    import yaml
+
+    start = time.perf_counter()
+    with open(args.taxonomy, "rb") as file:
+        raw = file.read()
+    taxonomy = compile_taxonomy(yaml.safe_load(raw), hashlib.sha256(raw).hexdigest())
+    size = write_artifact(taxonomy, _source_stamp(args.taxonomy), args.artifact)
+    compiled_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    load_taxonomy(args.taxonomy, args.artifact)
+    print(f"{len(taxonomy.skills)} skills and {len(taxonomy.aliases)} aliases in "
+          f"{len(set(taxonomy.categories.values()))} categories compiled in {compiled_ms:.0f} ms; "
+          f"{args.artifact} ({size / 1024:.0f} KB) loads in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+"""
+Local background task queue, so PDF analysis and job-board scrapes run in worker
+processes instead of inside the Streamlit script: a slow scrape no longer blocks
+the page, and a rerun no longer cancels the work.
+
+- Tasks live in one SQLite table (TASK_DB_PATH, WAL) shared by the app and the workers.
+- submit() deduplicates by input hash: while a task with the same hash is queued or
+  running (or finished less than `max_age` seconds ago) its ID is returned instead of
+  a new task. A partial UNIQUE index on in-flight hashes enforces it across processes.
+- Workers claim the oldest queued task under a lease (LEASE_SECONDS) that a heartbeat
+  thread renews. When a worker process dies, the pool requeues its task at once; if
+  the whole app dies, any worker picks the task up again once the lease has expired.
+  A task is run at most MAX_ATTEMPTS times, so one that keeps killing its worker fails.
+- Handlers report partial results while they run (skills after each page, jobs after
+  each board). status() returns them, and the UI polls it until the result is in.
+- Workers add their metrics (metrics.drain()) to the worker_metrics table after each
+  task; the app's metrics exports include them (metrics.register_source).
+
+    queue = get_task_queue()                   # also starts TASK_WORKERS worker processes
+    task_id = submit_analysis(upload)          # or submit_recommendations(skills, num_jobs)
+    task = queue.status(task_id)               # {"status", "progress", "result", "error", ...}
+
+Workers can also run on their own, next to an app started with RESUME_TASK_WORKERS=0:
+    python task_queue.py --workers 4
+"""
+import argparse
+import atexit
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import metrics
+
+TASK_DB_PATH = os.environ.get("TASK_DB_PATH", os.path.join(".cache", "tasks.sqlite"))
+TASK_INPUT_DIR = os.environ.get("TASK_INPUT_DIR", os.path.join(".cache", "task_inputs"))
+TASK_WORKERS = int(os.environ.get("RESUME_TASK_WORKERS", 2))
+LEASE_SECONDS = 30  # a running task whose worker hasn't renewed its lease for this long is run again
+MAX_ATTEMPTS = 3
+IDLE_POLL_SECONDS = 0.2  # how often an idle worker looks for work
+TASK_TTL = 24 * 60 * 60  # finished tasks are deleted after a day
+
+# kind -> "module:function" run in the worker; resolved there, so the app process doesn't import them
+HANDLERS = {
+    "analyze": "task_queue:analyze_task",
+    "recommend": "task_queue:recommend_task",
+}
+
+
+def input_hash(kind, payload):
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TaskQueue:
+    def __init__(self, path=TASK_DB_PATH, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE), so claims don't race across processes
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")  # every progress report is a commit; safe with WAL
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id INTEGER PRIMARY KEY, kind TEXT NOT NULL, input_hash TEXT NOT NULL, payload TEXT NOT NULL,"
+            " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, worker TEXT, lease_until REAL,"
+            " progress TEXT, result TEXT, error TEXT, created REAL NOT NULL, started REAL, finished REAL);"
+            "CREATE UNIQUE INDEX IF NOT EXISTS tasks_in_flight ON tasks (input_hash)"
+            " WHERE status IN ('queued', 'running');"
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, id);"
+            "CREATE INDEX IF NOT EXISTS tasks_hash ON tasks (input_hash, id);"
+            "CREATE TABLE IF NOT EXISTS worker_metrics (worker TEXT PRIMARY KEY, state TEXT NOT NULL);"
+        )
+
+    def _transaction(self, work):
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                result = work()
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+            return result
+
+    # ---------- producers ----------
+
+    def submit(self, kind, payload, task_hash=None, max_age=0):
+        """
+        Queues a task, or returns the ID of the same task (by `task_hash`, default:
+        a hash of kind and payload) if it is in flight or finished successfully
+        less than `max_age` seconds ago.
+        """
+        return self.enqueue(kind, payload, task_hash, max_age)[0]
+
+    def enqueue(self, kind, payload, task_hash=None, max_age=0):
+        """submit(), returning (task ID, whether a new task was queued) for callers that clean up after duplicates."""
+        task_hash = task_hash or input_hash(kind, payload)
+
+        def work():
+            row = self.db.execute(
+                "SELECT id FROM tasks WHERE input_hash = ? AND (status IN ('queued', 'running')"
+                " OR (status = 'done' AND finished >= ?)) ORDER BY id DESC LIMIT 1",
+                (task_hash, time.time() - max_age if max_age else float("inf")),
+            ).fetchone()
+            if row is not None:
+                metrics.incr("tasks_deduplicated")
+                return row[0], False
+            metrics.incr("tasks_submitted")
+            return self.db.execute(
+                "INSERT INTO tasks (kind, input_hash, payload, status, created) VALUES (?, ?, ?, 'queued', ?)",
+                (kind, task_hash, json.dumps(payload), time.time()),
+            ).lastrowid, True
+
+        return self._transaction(work)
+
+    def status(self, task_id):
+        """The task as a dict (progress and result decoded), or None if there is no such task."""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT id, kind, status, attempts, progress, result, error, created, started, finished"
+                " FROM tasks WHERE id = ?", (task_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        task = dict(zip(("id", "kind", "status", "attempts", "progress", "result", "error", "created", "started",
+                         "finished"), row))
+        task["progress"] = json.loads(task["progress"]) if task["progress"] else {}
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
+
+    def wait(self, task_ids, timeout=None, poll=0.05):
+        """Blocks until every task is done or failed; returns the IDs still unfinished when `timeout` runs out."""
+        pending, deadline = set(task_ids), None if timeout is None else time.monotonic() + timeout
+        while pending:
+            with self.lock:
+                finished = {row[0] for row in self.db.execute(
+                    f"SELECT id FROM tasks WHERE status IN ('done', 'failed') AND id IN ({','.join('?' * len(pending))})",
+                    list(pending),
+                )}
+            pending -= finished
+            if not pending or (deadline is not None and time.monotonic() > deadline):
+                break
+            time.sleep(poll)
+        return pending
+
+    # ---------- workers ----------
+
+    def claim(self, worker):
+        """Leases the oldest runnable task to `worker`; returns (id, kind, payload) or None when there is none."""
+        def work():
+            while True:
+                now = time.time()
+                row = self.db.execute(
+                    "SELECT id, kind, payload, attempts FROM tasks WHERE status = 'queued'"
+                    " OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1", (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+                task_id, kind, payload, attempts = row
+                if attempts >= self.max_attempts:  # it was running each time its worker died
+                    self.db.execute(
+                        "UPDATE tasks SET status = 'failed', error = ?, worker = NULL, finished = ? WHERE id = ?",
+                        (f"gave up after {attempts} attempts: the worker stopped while running it", now, task_id),
+                    )
+                    metrics.incr("tasks_failed")
+                    _remove_input(json.loads(payload))
+                    continue
+                if attempts:
+                    metrics.incr("tasks_retried")
+                self.db.execute(
+                    "UPDATE tasks SET status = 'running', worker = ?, attempts = attempts + 1, lease_until = ?,"
+                    " started = ? WHERE id = ?", (worker, now + self.lease_seconds, now, task_id),
+                )
+                return task_id, kind, json.loads(payload)
+
+        return self._transaction(work)
+
+    def _update(self, task_id, worker, assignments, values):
+        # Only the worker holding the task may update it; False means the lease was lost
+        with self.lock:
+            cursor = self.db.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ? AND worker = ? AND status = 'running'",
+                (*values, task_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, task_id, worker):
+        return self._update(task_id, worker, "lease_until = ?", (time.time() + self.lease_seconds,))
+
+    def report(self, task_id, worker, progress):
+        """Replaces the task's partial result and renews its lease."""
+        return self._update(task_id, worker, "progress = ?, lease_until = ?",
+                            (json.dumps(progress), time.time() + self.lease_seconds))
+
+    def complete(self, task_id, worker, result):
+        done = self._update(task_id, worker, "status = 'done', result = ?, worker = NULL, finished = ?",
+                            (json.dumps(result), time.time()))
+        metrics.incr("tasks_done")
+        return done
+
+    def fail(self, task_id, worker, error):
+        failed = self._update(task_id, worker, "status = 'failed', error = ?, worker = NULL, finished = ?",
+                              (error, time.time()))
+        metrics.incr("tasks_failed")
+        return failed
+
+    def requeue_worker(self, worker):
+        """Puts the tasks a dead worker was running back in the queue; returns how many."""
+        with self.lock:
+            cursor = self.db.execute(
+                "UPDATE tasks SET status = 'queued', worker = NULL, lease_until = NULL"
+                " WHERE worker = ? AND status = 'running'", (worker,),
+            )
+        return cursor.rowcount
+
+    # ---------- metrics ----------
+
+    def add_metrics(self, worker, state):
+        """Adds a metrics.drain() result of `worker` to what it recorded before."""
+        def work():
+            row = self.db.execute("SELECT state FROM worker_metrics WHERE worker = ?", (worker,)).fetchone()
+            total = metrics.merge(json.loads(row[0]) if row else {"stages": {}, "counters": {}}, state)
+            self.db.execute("INSERT OR REPLACE INTO worker_metrics (worker, state) VALUES (?, ?)",
+                            (worker, json.dumps(total)))
+
+        self._transaction(work)
+
+    def worker_metrics(self):
+        """{worker: accumulated metrics.drain() results}, a metrics source."""
+        with self.lock:
+            rows = self.db.execute("SELECT worker, state FROM worker_metrics").fetchall()
+        return {worker: json.loads(state) for worker, state in rows}
+
+    def reset_worker_metrics(self):
+        with self.lock:
+            self.db.execute("DELETE FROM worker_metrics")
+
+    # ---------- housekeeping ----------
+
+    def prune(self, max_age=TASK_TTL):
+        with self.lock:
+            return self.db.execute(
+                "DELETE FROM tasks WHERE status IN ('done', 'failed') AND finished < ?", (time.time() - max_age,),
+            ).rowcount
+
+    def counts(self):
+        with self.lock:
+            counts = dict(self.db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in ("queued", "running", "done", "failed")}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+# ---------- worker processes ----------
+
+def worker_id(pid=None):
+    return f"{socket.gethostname()}:{pid or os.getpid()}"
+
+
+def _resolve(spec):
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _remove_input(payload):
+    if payload.get("input_file"):  # the queue's own copy of the input, no longer needed
+        try:
+            os.remove(payload["input_file"])
+        except OSError:
+            pass
+
+
+def run_task(queue, worker, task_id, kind, payload, handlers=HANDLERS):
+    """Runs one claimed task, renewing its lease in the background until the handler returns."""
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(queue.lease_seconds / 3):
+            queue.renew(task_id, worker)
+
+    beat = threading.Thread(target=heartbeat, daemon=True)
+    beat.start()
+    try:
+        handler = _resolve(handlers[kind])
+        result = handler(payload, lambda progress: queue.report(task_id, worker, progress))
+    except Exception as exc:  # deterministic failures are not retried; crashes are
+        error = f"{type(exc).__name__}: {exc}"
+    else:
+        error = None
+    finally:
+        stop.set()
+        beat.join()
+    _remove_input(payload)
+    if error is None:
+        queue.complete(task_id, worker, result)
+    else:
+        queue.fail(task_id, worker, error)
+
+
+def worker_loop(path=TASK_DB_PATH, handlers=None, stop=None, lease_seconds=LEASE_SECONDS, parent=None):
+    """Claims and runs tasks until `stop` is set or the parent process (if given) has gone away."""
+    queue = TaskQueue(path, lease_seconds)
+    worker, handlers, stop = worker_id(), handlers or HANDLERS, stop or threading.Event()
+    while not stop.is_set() and (parent is None or os.getppid() == parent):
+        task = queue.claim(worker)
+        if task is None:
+            stop.wait(IDLE_POLL_SECONDS)
+            continue
+        run_task(queue, worker, *task, handlers=handlers)
+        if metrics.ENABLED:
+            queue.add_metrics(worker, metrics.drain())
+    if metrics.ENABLED:
+        queue.add_metrics(worker, {"collectors": {}})  # its cache stats are gone with it; its timings stay
+    queue.close()
+
+
+class WorkerPool:
+    """
+    Worker processes plus a supervisor thread that requeues a dead worker's task and
+    starts a replacement. Workers are fresh interpreters running `task_queue.py --worker`
+    rather than multiprocessing children, which would re-run the parent's __main__:
+    under Streamlit, that is app.py.
+    """
+
+    def __init__(self, workers=TASK_WORKERS, path=TASK_DB_PATH, handlers=None, lease_seconds=LEASE_SECONDS):
+        self.workers = workers
+        self.path = path
+        self.handlers = handlers or HANDLERS
+        self.lease_seconds = lease_seconds
+        self.processes = []
+        self.restarts = 0
+        self.stopping = threading.Event()
+        self.supervisor = None
+
+    def _spawn(self):
+        # The parent's sys.path, so handlers in modules it can import (e.g. benchmark scripts) resolve
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(entry for entry in sys.path if entry))
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--db", self.path,
+             "--handlers", json.dumps(self.handlers), "--lease", str(self.lease_seconds), "--parent", str(os.getpid())],
+            env=env,
+        )
+
+    def start(self, supervise=True):
+        self.processes = [self._spawn() for _ in range(self.workers)]
+        if supervise:
+            self.supervisor = threading.Thread(target=self._supervise, daemon=True)
+            self.supervisor.start()
+        return self
+
+    def _supervise(self):
+        queue = TaskQueue(self.path, self.lease_seconds)
+        while not self.stopping.wait(1.0):
+            for i, process in enumerate(self.processes):
+                if process.poll() is None:
+                    continue
+                requeued = queue.requeue_worker(worker_id(process.pid))
+                if metrics.ENABLED:
+                    queue.add_metrics(worker_id(process.pid), {"collectors": {}})
+                metrics.incr("task_worker_restarts")
+                metrics.incr("tasks_requeued", requeued)
+                self.restarts += 1
+                self.processes[i] = self._spawn()
+        queue.close()
+
+    def stop(self, timeout=10):
+        """Asks each worker to finish its current task and exit (SIGTERM); kills and requeues any that don't."""
+        self.stopping.set()
+        if self.supervisor is not None:
+            self.supervisor.join()
+        for process in self.processes:
+            process.terminate()
+        queue = TaskQueue(self.path, self.lease_seconds)
+        for process in self.processes:
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                queue.requeue_worker(worker_id(process.pid))
+        queue.close()
+
+
+_default_queue = None
+_default_pool = None
+_default_lock = threading.Lock()
+
+
+def get_task_queue():
+    """Process-wide queue; the first call also starts TASK_WORKERS worker processes (none when it is 0)."""
+    global _default_queue, _default_pool
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = TaskQueue()
+            _default_queue.prune()
+            metrics.register_collector("tasks", _default_queue.counts)
+            metrics.register_source("task_workers", _default_queue.worker_metrics, _default_queue.reset_worker_metrics)
+            if TASK_WORKERS > 0:
+                _default_pool = WorkerPool(TASK_WORKERS).start()
+                atexit.register(_default_pool.stop)
+        return _default_queue
+
+
+# ---------- tasks the app submits ----------
+
+def submit_analysis(upload, queue=None):
+    """
+    Queues the Resume Analyzer pipeline for an uploads.SpooledUpload. Each task
+    gets its own copy of the file in TASK_INPUT_DIR (the session may release the
+    upload, and a finished task deletes its copy); a duplicate's copy is dropped.
+    """
+    from cache import digest_key
+
+    queue = queue or get_task_queue()
+    os.makedirs(TASK_INPUT_DIR, exist_ok=True)
+    path = os.path.join(TASK_INPUT_DIR, f"{upload.digest[:16]}-{os.getpid()}-{time.time_ns()}.pdf")
+    if upload.path is not None:
+        shutil.copyfile(upload.path, path)
+    else:
+        with open(path, "wb") as file:
+            file.write(upload.data)
+    task_id, created = queue.enqueue("analyze", {"input_file": path, "name": upload.name, "digest": upload.digest},
+                                     task_hash=f"analyze:{digest_key(upload.digest)}")
+    if not created:
+        os.remove(path)
+    return task_id
+
+
+def submit_recommendations(skills, num_jobs=10, queue=None):
+    """Queues a job search for the skills; a search for the same skills finished within jobs.CACHE_TTL is reused."""
+    from jobs import CACHE_TTL
+
+    queue = queue or get_task_queue()
+    return queue.submit("recommend", {"query": ",".join(skills), "num_jobs": num_jobs}, max_age=CACHE_TTL)
+
+
+def analyze_task(payload, report):
+    from cache import analyze_upload
+    from uploads import SpooledUpload
+
+    # The task's copy of the file, parsed through a read-only mmap like a spooled upload in the app
+    path = payload["input_file"]
+    upload = SpooledUpload(payload["name"], os.path.getsize(path), payload["digest"], path=path)
+    result = analyze_upload(upload, on_page=lambda pages, stream: report({"pages": pages, "skills": stream.skills}))
+    return {name: value for name, value in result.items() if name != "text"}  # the text stays in the result cache
+
+
+def recommend_task(payload, report):
+    from jobs import fetch_jobs_from_multiple_sources
+
+    jobs = fetch_jobs_from_multiple_sources(
+        payload["query"], payload["num_jobs"],
+        on_progress=lambda jobs, sources: report({"jobs": jobs, "sources": sources}),
+    )
+    return {"jobs": jobs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run background task workers for the resume app.")
+    parser.add_argument("-w", "--workers", type=int, default=max(1, TASK_WORKERS))
+    parser.add_argument("--db", default=TASK_DB_PATH, help="task database shared with the app")
+    # Used by WorkerPool to start one worker process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--handlers", type=json.loads, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS, help=argparse.SUPPRESS)
+    parser.add_argument("--parent", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())  # finish the current task, then exit
+        worker_loop(args.db, args.handlers, stop, args.lease, args.parent)
+        return
+
+    queue = TaskQueue(args.db)
+    pool = WorkerPool(args.workers, args.db).start()
+    print(f"{args.workers} workers on {args.db}; Ctrl+C to stop")
+    try:
+        while True:
+            queue.prune()
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
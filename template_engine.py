@@ -0,0 +1,185 @@
+"""
+Compiled DOCX resume templates.
+
+Each template is parsed once. Compiling records where every {PLACEHOLDER}
+sits: which part (body, header or footer, tables included), which paragraph
+and which runs' text (w:t) elements, even when Word has split "{", "NAME" and
+"}" into separate runs. Rendering deep-copies the parsed document and rewrites
+only those text elements, so the rest of the formatting, and any tab, break,
+drawing or field in the same runs, is untouched and there is no paragraph x
+key loop.
+
+Compiled templates are kept in an LRU keyed by path and invalidated when the
+file's mtime or size changes.
+"""
+import copy
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+import docx
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+
+import metrics
+
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+TEMPLATE_CACHE_SIZE = 16
+
+# A placeholder spanning texts[start_run] (from start_offset) to texts[end_run] (up to end_offset),
+# where texts are the paragraph's _text_elements()
+Placeholder = namedtuple("Placeholder", ["key", "start_run", "start_offset", "end_run", "end_offset"])
+_RUN, _PARAGRAPH, _TEXT_BOX, _TEXT = qn("w:r"), qn("w:p"), qn("w:txbxContent"), qn("w:t")
+_SPACE = qn("xml:space")
+
+
+def iter_parts(document):
+    """(name, part) for the main document part and every header/footer part."""
+    yield "document", document.part
+    for rel in document.part.rels.values():
+        if rel.reltype in (RT.HEADER, RT.FOOTER) and not rel.is_external:
+            yield str(rel.target_part.partname), rel.target_part
+
+
+def _runs(paragraph_element):
+    """
+    The paragraph's own runs, including those inside hyperlinks, fields and other
+    inline wrappers, but not the runs of paragraphs nested in a text box: those
+    paragraphs are compiled on their own.
+    """
+    runs = []
+
+    def walk(element):
+        for child in element:
+            if child.tag == _RUN:
+                runs.append(child)  # a text box inside the run (w:drawing, w:pict) is not walked
+            elif child.tag not in (_PARAGRAPH, _TEXT_BOX):
+                walk(child)
+
+    walk(paragraph_element)
+    return runs
+
+
+def _text_elements(paragraph_element):
+    """The w:t elements of the paragraph's own runs, in order: the only elements rendering rewrites."""
+    return [text for run in _runs(paragraph_element) for text in run.iterchildren(_TEXT)]
+
+
+def _find_placeholders(run_texts):
+    text = "".join(run_texts)
+    if "{" not in text:
+        return []
+    # run_starts[i] = offset of run i in the paragraph text
+    run_starts, position = [], 0
+    for run_text in run_texts:
+        run_starts.append(position)
+        position += len(run_text)
+
+    def locate(offset, is_end):
+        # index of the run holding `offset` (for an end offset, the run holding the last character)
+        target = offset - 1 if is_end else offset
+        for i in range(len(run_texts) - 1, -1, -1):
+            if run_starts[i] <= target and run_texts[i]:
+                return i, offset - run_starts[i]
+        return 0, offset
+
+    placeholders = []
+    for match in PLACEHOLDER_PATTERN.finditer(text):
+        start_run, start_offset = locate(match.start(), False)
+        end_run, end_offset = locate(match.end(), True)
+        placeholders.append(Placeholder(match.group(1), start_run, start_offset, end_run, end_offset))
+    return placeholders
+
+
+class CompiledTemplate:
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.document = docx.Document(path)
+        # part name -> [(paragraph ordinal within the part, [Placeholder, ...]), ...]
+        self.locations = {}
+        for name, part in iter_parts(self.document):
+            found = []
+            for ordinal, paragraph in enumerate(part.element.iter(qn("w:p"))):
+                placeholders = _find_placeholders([text.text or "" for text in _text_elements(paragraph)])
+                if placeholders:
+                    found.append((ordinal, placeholders))
+            if found:
+                self.locations[name] = found
+
+    @property
+    def placeholders(self):
+        """Placeholder keys used by the template, in order of first appearance."""
+        return list(dict.fromkeys(
+            placeholder.key
+            for found in self.locations.values()
+            for _, placeholders in found
+            for placeholder in placeholders
+        ))
+
+    @metrics.timed("template_render")
+    def render(self, user_data):
+        """Returns a new docx.Document with every known {KEY} replaced; unknown keys are left as they are."""
+        document = copy.deepcopy(self.document)
+        parts = dict(iter_parts(document))
+        for name, found in self.locations.items():
+            paragraphs = list(parts[name].element.iter(qn("w:p")))
+            for ordinal, placeholders in found:
+                elements = _text_elements(paragraphs[ordinal])
+                texts = [element.text or "" for element in elements]
+                changed = set()
+                # Right to left, so earlier offsets stay valid while later text changes length
+                for placeholder in reversed(placeholders):
+                    if placeholder.key not in user_data:
+                        continue
+                    value = str(user_data[placeholder.key])
+                    first, last = placeholder.start_run, placeholder.end_run
+                    if first == last:
+                        texts[first] = texts[first][:placeholder.start_offset] + value + texts[first][placeholder.end_offset:]
+                    else:
+                        texts[first] = texts[first][:placeholder.start_offset] + value
+                        for i in range(first + 1, last):
+                            texts[i] = ""
+                        texts[last] = texts[last][placeholder.end_offset:]
+                    changed.update(range(first, last + 1))
+                for i in changed:
+                    elements[i].text = texts[i]
+                    if texts[i] != texts[i].strip():
+                        elements[i].set(_SPACE, "preserve")  # else Word drops the leading/trailing spaces
+        return document
+
+
+class TemplateCache:
+    def __init__(self, maxsize=TEMPLATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self.lock:
+            template = self.templates.get(path)
+            if template is not None and template.signature == (stat.st_mtime_ns, stat.st_size):
+                self.templates.move_to_end(path)
+                self.hits += 1
+                return template
+            self.misses += 1
+        template = CompiledTemplate(path)
+        with self.lock:
+            self.templates[path] = template
+            self.templates.move_to_end(path)
+            while len(self.templates) > self.maxsize:
+                self.templates.popitem(last=False)
+        return template
+
+
+template_cache = TemplateCache()
+
+
+def render_template(template_path, user_data):
+    return template_cache.get(template_path).render(user_data)
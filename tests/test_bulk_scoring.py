@@ -0,0 +1,46 @@
+import random
+
+import textstat
+
+from analyzer import extract_experience, extract_skills, score_resume
+from bulk_scoring import flesch_reading_ease, score_resumes
+from skill_matcher import SKILLS_LIST, get_taxonomy
+
+FILLER = ["Designed and delivered reporting for the finance team", "Improved the quality of customer data",
+          "Worked with stakeholders across regions!", "Built internal tools used every day?", "Led a team of 5"]
+
+
+def make_resume(rng):
+    taxonomy = get_taxonomy()
+    lines = ["Jane Doe"]
+    for section in rng.sample(taxonomy.ats_sections, rng.randint(1, len(taxonomy.ats_sections))):
+        lines.append(section.title())
+        if section == "experience":
+            lines.append(f"Analyst at ABC Ltd for {rng.randint(0, 8)} years")
+        for _ in range(rng.randint(1, 6)):
+            words = rng.sample(SKILLS_LIST, 3) + rng.sample(taxonomy.industry_keywords, rng.randint(0, 2))
+            lines.append(f"{rng.choice(FILLER)} using {', '.join(words)}.")
+    return "\n".join(lines)
+
+
+# Texts where readability is easy to get wrong: no words, no sentence ends, short sentences, punctuation
+EDGE_CASES = ["", "Python", "Python. SQL. Docker.", "C++, C#, .NET & Node.js; e-mail: jane@doe.com",
+              "One two three four five six seven eight nine ten eleven twelve", "Hi! Ok? Yes."]
+
+
+def test_flesch_reading_ease_matches_textstat():
+    rng = random.Random(1)
+    texts = EDGE_CASES + [make_resume(rng) for _ in range(50)]
+    assert flesch_reading_ease(texts) == [textstat.flesch_reading_ease(text) for text in texts]
+
+
+def test_score_resumes_matches_score_resume():
+    rng = random.Random(0)
+    texts = EDGE_CASES[1:] + [make_resume(rng) for _ in range(200)]
+    skills = [extract_skills(text) for text in texts]
+    expected = [score_resume(text, skill_list) for text, skill_list in zip(texts, skills)]
+
+    assert score_resumes(texts, skills)["score"].tolist() == expected
+    assert score_resumes(texts)["score"].tolist() == expected  # skills and years computed in bulk
+    years = [extract_experience(text)["years_of_experience"] for text in texts]
+    assert score_resumes(texts, skills, years, workers=2)["score"].tolist() == expected
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from result_store import MERGE_FACTOR, ResultStore
+from skill_matcher import SKILLS_LIST
+
+SEGMENT_ROWS = 20
+QUERIES = [
+    {},
+    {"all_skills": ["Python"]},
+    {"all_skills": ["python", "SQL"], "min_years": 3},  # skill names match in any case
+    {"any_skills": ["Docker", "Kubernetes", "AWS"], "min_score": 60},
+    {"all_skills": ["Python"], "any_skills": ["Docker", "AWS"], "min_years": 2, "min_score": 40},
+    {"min_years": 10, "min_score": 90},
+    {"all_skills": ["Python", "Not A Skill"]},
+]
+
+
+def make_records(count, seed=0):
+    rng = random.Random(seed)
+    popular = ["Python", "SQL", "Docker", "Kubernetes", "AWS"]
+    return [{"key": f"{i:08x}", "source": f"resume-{i}.pdf", "owner": f"user-{i % 3}",
+             "skills": sorted(set(rng.sample(SKILLS_LIST, rng.randint(0, 6)) + rng.sample(popular, rng.randint(0, 3)))),
+             "years": rng.randint(0, 15), "score": round(rng.uniform(20, 100), 2)}
+            for i in range(count)]
+
+
+def scan(records, all_skills=(), any_skills=(), min_years=None, min_score=None, owner=None):
+    def has(record, skill):
+        return skill.lower() in (name.lower() for name in record["skills"])
+
+    return [i for i, r in enumerate(records)
+            if all(has(r, skill) for skill in all_skills)
+            and (not any_skills or any(has(r, skill) for skill in any_skills))
+            and (min_years is None or r["years"] >= min_years)
+            and (min_score is None or r["score"] >= min_score)
+            and (owner is None or r["owner"] == owner)]
+
+
+@pytest.fixture(scope="module")
+def stored(tmp_path_factory):
+    records = make_records(1500)
+    path = str(tmp_path_factory.mktemp("result_store"))
+    store = ResultStore(path, segment_rows=SEGMENT_ROWS)
+    for i in range(0, len(records), 37):  # batches that don't line up with segments
+        store.add_many(records[i:i + 37])
+    return records, path, store
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_query_matches_scan(stored, query):
+    records, path, store = stored
+    expected = scan(records, **query)
+    assert store.query(**query).tolist() == expected
+    assert ResultStore(path, segment_rows=SEGMENT_ROWS).query(**query).tolist() == expected  # reopened
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_owner_scoped_query(stored, query):
+    records, path, store = stored
+    assert store.query(owner="user-1", **query).tolist() == scan(records, owner="user-1", **query)
+    assert store.query(owner="nobody", **query).tolist() == []
+
+
+def test_fetch_and_top(stored):
+    records, path, store = stored
+    rows = store.query(all_skills=["Python"])
+    fetched = store.fetch(rows[::-1][:10])
+    assert [record["row"] for record in fetched] == rows[::-1][:10].tolist()
+    for record in fetched:
+        expected = records[record["row"]]
+        assert (record["source"], record["owner"], record["years"], record["score"]) == \
+            (expected["source"], expected["owner"], expected["years"], expected["score"])
+        assert sorted(skill.lower() for skill in record["skills"]) == sorted(skill.lower() for skill in expected["skills"])
+
+    best = store.top(rows, 5).tolist()
+    assert [records[row]["score"] for row in best] == sorted((records[row]["score"] for row in rows), reverse=True)[:5]
+
+
+def test_duplicate_keys_are_skipped(stored):
+    records, path, store = stored
+    assert store.add_many(records[:10]) == 0
+    assert len(store) == len(records)
+
+
+def test_segments_are_size_tiered(stored):
+    records, path, store = stored
+    sizes = [segment.rows for segment in store.segments]
+    assert sum(sizes) == len(records) // SEGMENT_ROWS * SEGMENT_ROWS
+    assert sizes == sorted(sizes, reverse=True)
+    # fewer than MERGE_FACTOR segments of any one size are left unmerged
+    assert all(sizes.count(size) < MERGE_FACTOR for size in sizes)
@@ -0,0 +1,67 @@
+import time
+
+from task_queue import TaskQueue
+
+
+def make_queue(tmp_path, **kwargs):
+    return TaskQueue(str(tmp_path / "tasks.sqlite"), **kwargs)
+
+
+def test_submit_deduplicates_in_flight_tasks(tmp_path):
+    queue = make_queue(tmp_path)
+    task_id, created = queue.enqueue("analyze", {"digest": "a"})
+    assert created
+    assert queue.enqueue("analyze", {"digest": "a"}) == (task_id, False)
+    assert queue.submit("analyze", {"digest": "b"}) != task_id
+    assert queue.submit("recommend", {"digest": "a"}) != task_id  # the kind is part of the hash
+    # an explicit task_hash deduplicates payloads that differ, e.g. by temp file name
+    same = queue.submit("analyze", {"input_file": "x", "digest": "c"}, task_hash="analyze:c")
+    assert queue.submit("analyze", {"input_file": "y", "digest": "c"}, task_hash="analyze:c") == same
+
+    claimed = queue.claim("worker-1")  # the oldest task first
+    assert claimed == (task_id, "analyze", {"digest": "a"})
+    assert queue.submit("analyze", {"digest": "a"}) == task_id  # still deduplicated while running
+    assert queue.complete(task_id, "worker-1", {"score": 1})
+
+    assert queue.submit("analyze", {"digest": "a"}, max_age=60) == task_id  # a recent result is reused
+    assert queue.submit("analyze", {"digest": "a"}) != task_id  # without max_age, finished tasks run again
+    assert queue.counts() == {"queued": 4, "running": 0, "done": 1, "failed": 0}
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.2)
+    task_id = queue.submit("analyze", {"digest": "a"})
+    assert queue.claim("worker-1")[0] == task_id
+    assert queue.claim("worker-2") is None  # leased to worker-1
+
+    time.sleep(0.3)
+    assert queue.claim("worker-2")[0] == task_id
+    # worker-1 lost the lease: its late updates are refused
+    assert not queue.renew(task_id, "worker-1")
+    assert not queue.complete(task_id, "worker-1", {"score": 1})
+    assert queue.complete(task_id, "worker-2", {"score": 2})
+    task = queue.status(task_id)
+    assert (task["status"], task["attempts"], task["result"]) == ("done", 2, {"score": 2})
+
+
+def test_renewed_lease_is_kept(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.3)
+    task_id = queue.submit("analyze", {"digest": "a"})
+    queue.claim("worker-1")
+    for _ in range(3):
+        time.sleep(0.15)
+        assert queue.report(task_id, "worker-1", {"pages": 1})
+    assert queue.claim("worker-2") is None
+    assert queue.status(task_id)["progress"] == {"pages": 1}
+
+
+def test_task_fails_after_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.1, max_attempts=2)
+    task_id = queue.submit("analyze", {"digest": "a"})
+    for worker in ("worker-1", "worker-2"):
+        assert queue.claim(worker)[0] == task_id
+        time.sleep(0.15)  # the worker dies without renewing
+    assert queue.claim("worker-3") is None
+    task = queue.status(task_id)
+    assert task["status"] == "failed"
+    assert "gave up after 2 attempts" in task["error"]
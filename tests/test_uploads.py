@@ -0,0 +1,96 @@
+import io
+import os
+
+import PyPDF2
+import pytest
+
+from uploads import SessionMemory, UploadRejected, session_upload, spool_upload
+
+
+def make_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class Unsized(io.BytesIO):
+    """A stream without the `size` the Streamlit widget reports, so limits are enforced while reading."""
+    name = "resume.pdf"
+
+
+class FakeUpload(io.BytesIO):
+    def __init__(self, data, file_id):
+        super().__init__(data)
+        self.name, self.size, self.file_id = "resume.pdf", len(data), file_id
+
+
+def test_small_upload_is_kept_in_memory():
+    data = make_pdf(2)
+    upload = spool_upload(Unsized(data), max_bytes=len(data), max_pages=2)
+    assert (upload.path, upload.nbytes, upload.disk_bytes, upload.size) == (None, len(data), 0, len(data))
+    with upload.open() as stream:
+        assert stream.read() == data
+
+
+def test_large_upload_is_spooled_to_disk(tmp_path):
+    data = make_pdf(3)
+    upload = spool_upload(Unsized(data), threshold=100, spool_dir=str(tmp_path))
+    assert (upload.nbytes, upload.disk_bytes) == (0, len(data))
+    assert upload.page_count() == 3
+    with upload.open() as stream:
+        assert stream[:] == data
+    upload.close()
+    assert upload.disk_bytes == 0
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("sized", [True, False])
+def test_upload_over_max_bytes_is_rejected(tmp_path, sized):
+    data = make_pdf(1)
+    with pytest.raises(UploadRejected, match="limit"):
+        spool_upload(FakeUpload(data, "id") if sized else Unsized(data), max_bytes=len(data) - 1, threshold=10,
+                     spool_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []  # a partly written spool file is removed
+
+
+def test_upload_over_max_pages_is_rejected(tmp_path):
+    with pytest.raises(UploadRejected, match="4 pages; the limit is 3"):
+        spool_upload(Unsized(make_pdf(4)), max_pages=3, threshold=10, spool_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+    assert spool_upload(Unsized(make_pdf(3)), max_pages=3).page_count() == 3
+
+
+def test_unreadable_upload_is_rejected():
+    with pytest.raises(UploadRejected, match="could not be read as a PDF"):
+        spool_upload(Unsized(b"%PDF-1.4 truncated"))
+
+
+def test_session_upload_is_copied_once():
+    memory = SessionMemory()
+    uploaded = FakeUpload(make_pdf(1), "file-1")
+    upload = session_upload(uploaded, memory=memory, session="a")
+    assert session_upload(uploaded, memory=memory, session="a") is upload
+    replaced = session_upload(FakeUpload(make_pdf(2), "file-2"), memory=memory, session="a")
+    assert replaced is not upload and upload.data is None  # the previous copy is released
+
+
+def test_session_disk_budget_evicts_spooled_uploads(tmp_path):
+    size = len(make_pdf(1))
+    memory = SessionMemory(session_disk_budget=2 * size + 10, total_disk_budget=3 * size + 10)
+
+    def upload(session, slot):
+        copy = spool_upload(FakeUpload(make_pdf(1), f"{session}-{slot}"), threshold=0, spool_dir=str(tmp_path))
+        memory.put(session, slot, copy, copy.nbytes, on_evict=copy.close, disk_bytes=copy.disk_bytes)
+        return copy
+
+    first = [upload("a", f"slot-{i}") for i in range(3)]
+    assert first[0].disk_bytes == 0 and first[2].disk_bytes == size  # over the session budget: LRU evicted
+    assert memory.usage()["disk_bytes"] == 2 * size
+    upload("b", "slot-0")
+    upload("b", "slot-1")  # 4 files over the total budget: session "a" goes
+    assert memory.usage()["disk_bytes"] == 2 * size
+    assert all(copy.disk_bytes == 0 for copy in first)
+    assert len(os.listdir(tmp_path)) == 2
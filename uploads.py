@@ -0,0 +1,281 @@
+"""
+Memory-bounded handling of uploaded PDFs and of per-session artifacts.
+
+Uploads:
+- files over UPLOAD_MAX_BYTES or UPLOAD_MAX_PAGES pages are refused with UploadRejected
+  (.streamlit/config.toml sets the same size limit for the upload widget itself)
+- an upload is copied once, in chunks, while its SHA-256 is computed; files over
+  SPOOL_THRESHOLD go to a temp file and are parsed through mmap, so the page
+  cache holds them instead of the Python heap, and getvalue() copies are avoided
+
+Sessions:
+- SessionMemory tracks how many bytes each session's artifacts (spooled uploads,
+  rendered resumes, ...) hold, evicts a session's least recently used artifacts
+  past SESSION_BUDGET_BYTES, drops sessions idle for SESSION_IDLE_TTL, and evicts
+  the least recently active sessions while all of them hold over TOTAL_BUDGET_BYTES.
+  Bytes on disk (spooled uploads in SPOOL_DIR) are counted the same way against
+  their own budgets, SESSION_DISK_BUDGET_BYTES and TOTAL_DISK_BUDGET_BYTES.
+  An evicted artifact's on_evict callback releases it (deletes the temp file,
+  drops rendered bytes); pages recompute it when they need it again.
+
+    upload = session_upload(uploaded_file)       # raises UploadRejected
+    with upload.open() as pdf:
+        text = extract_text_from_pdf(pdf)
+"""
+import contextlib
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import metrics
+
+MB = 1024 * 1024
+UPLOAD_MAX_BYTES = int(float(os.environ.get("RESUME_UPLOAD_MAX_MB", 20)) * MB)
+UPLOAD_MAX_PAGES = int(os.environ.get("RESUME_UPLOAD_MAX_PAGES", 30))
+SPOOL_THRESHOLD = 1 * MB  # uploads larger than this are spooled to disk
+SPOOL_DIR = os.environ.get("RESUME_SPOOL_DIR") or None  # None: the system temp directory
+CHUNK_BYTES = 1 * MB
+SESSION_BUDGET_BYTES = int(float(os.environ.get("RESUME_SESSION_BUDGET_MB", 16)) * MB)
+TOTAL_BUDGET_BYTES = int(float(os.environ.get("RESUME_SESSIONS_BUDGET_MB", 256)) * MB)
+SESSION_DISK_BUDGET_BYTES = int(float(os.environ.get("RESUME_SESSION_DISK_BUDGET_MB", 64)) * MB)
+TOTAL_DISK_BUDGET_BYTES = int(float(os.environ.get("RESUME_SESSIONS_DISK_BUDGET_MB", 2048)) * MB)
+SESSION_IDLE_TTL = 30 * 60  # seconds without a rerun before a session's artifacts are dropped
+
+
+class UploadRejected(ValueError):
+    pass
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpooledUpload:
+    """An uploaded file copied once: kept as bytes when small, as a temp file otherwise."""
+
+    def __init__(self, name, size, digest, data=None, path=None):
+        self.name = name
+        self.size = size
+        self.digest = digest  # SHA-256 hex digest of the content
+        self.data = data
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove, path) if path else None
+
+    @property
+    def nbytes(self):
+        """Bytes held in memory (a spooled file lives on disk and in the page cache)."""
+        return len(self.data) if self.data is not None else 0
+
+    @property
+    def disk_bytes(self):
+        """Bytes held in the spool file, 0 once closed or when kept in memory."""
+        return self.size if self._finalizer is not None and self._finalizer.alive else 0
+
+    @contextlib.contextmanager
+    def open(self):
+        """A seekable binary stream over the content: BytesIO, or a read-only mmap of the temp file."""
+        if self.data is not None:
+            yield io.BytesIO(self.data)
+            return
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+    def page_count(self):
+        import PyPDF2
+
+        with self.open() as stream:
+            return len(PyPDF2.PdfReader(stream).pages)
+
+    def close(self):
+        self.data = None
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+def spool_upload(file, name=None, max_bytes=UPLOAD_MAX_BYTES, max_pages=UPLOAD_MAX_PAGES,
+                 threshold=SPOOL_THRESHOLD, spool_dir=SPOOL_DIR):
+    """
+    Copies a binary file-like object into a SpooledUpload, hashing it on the way.
+
+    Raises:
+    UploadRejected: the file is over `max_bytes`, over `max_pages` pages, or not a readable PDF.
+    """
+    name = name or getattr(file, "name", "upload.pdf")
+    limit = f"{max_bytes / MB:g} MB" if max_bytes is not None else None
+    size = getattr(file, "size", None)
+    if max_bytes is not None and size is not None and size > max_bytes:
+        raise UploadRejected(f"{name} is {size / MB:.1f} MB; the limit is {limit}.")
+    if hasattr(file, "seek"):
+        file.seek(0)
+    digest, buffer, spool, size = hashlib.sha256(), io.BytesIO(), None, 0
+    try:
+        while True:
+            chunk = file.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise UploadRejected(f"{name} is over the {limit} limit.")
+            digest.update(chunk)
+            if spool is None and size > threshold:
+                spool = tempfile.NamedTemporaryFile(prefix="upload-", suffix=".pdf", dir=spool_dir, delete=False)
+                spool.write(buffer.getbuffer())
+                buffer = None
+            (spool or buffer).write(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            _remove(spool.name)
+        raise
+    if spool is not None:
+        spool.close()
+        upload = SpooledUpload(name, size, digest.hexdigest(), path=spool.name)
+        metrics.incr("uploads_spooled")
+    else:
+        upload = SpooledUpload(name, size, digest.hexdigest(), data=buffer.getvalue())
+    if max_pages is not None:
+        try:
+            pages = upload.page_count()
+        except Exception as exc:  # truncated or not a PDF at all
+            upload.close()
+            raise UploadRejected(f"{name} could not be read as a PDF ({type(exc).__name__}).") from exc
+        if pages > max_pages:
+            upload.close()
+            raise UploadRejected(f"{name} has {pages} pages; the limit is {max_pages}.")
+    return upload
+
+
+class SessionMemory:
+    def __init__(self, session_budget=SESSION_BUDGET_BYTES, total_budget=TOTAL_BUDGET_BYTES, idle_ttl=SESSION_IDLE_TTL,
+                 session_disk_budget=SESSION_DISK_BUDGET_BYTES, total_disk_budget=TOTAL_DISK_BUDGET_BYTES):
+        self.session_budget = session_budget
+        self.total_budget = total_budget
+        self.session_disk_budget = session_disk_budget
+        self.total_disk_budget = total_disk_budget
+        self.idle_ttl = idle_ttl
+        # session id -> [last used, OrderedDict(name -> [value, nbytes, on_evict, disk_bytes])]
+        self.sessions = OrderedDict()
+        self.total = 0
+        self.total_disk = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, session, name):
+        with self.lock:
+            entry = self.sessions.get(session)
+            if entry is None or name not in entry[1]:
+                return None
+            entry[0] = time.monotonic()
+            self.sessions.move_to_end(session)
+            entry[1].move_to_end(name)
+            return entry[1][name][0]
+
+    def put(self, session, name, value, nbytes, on_evict=None, disk_bytes=0):
+        """
+        Tracks (or re-measures) an artifact, then evicts whatever the budgets no longer allow.
+        `nbytes` is what it holds in memory, `disk_bytes` what it holds on disk.
+        """
+        evicted = []
+        with self.lock:
+            now = time.monotonic()
+            entry = self.sessions.setdefault(session, [now, OrderedDict()])
+            entry[0] = now
+            self.sessions.move_to_end(session)
+            old = entry[1].pop(name, None)
+            if old is not None:
+                self.total -= old[1]
+                self.total_disk -= old[3]
+                if old[0] is not value:
+                    evicted.append(old)
+            entry[1][name] = [value, nbytes, on_evict, disk_bytes]
+            self.total += nbytes
+            self.total_disk += disk_bytes
+            evicted += self._enforce(session, now)
+        self._release(evicted)
+
+    def drop_session(self, session):
+        with self.lock:
+            entry = self.sessions.pop(session, None)
+            artifacts = list(entry[1].values()) if entry else []
+            self.total -= sum(artifact[1] for artifact in artifacts)
+            self.total_disk -= sum(artifact[3] for artifact in artifacts)
+        self._release(artifacts)
+
+    def _enforce(self, session, now):
+        evicted = []
+        artifacts = self.sessions[session][1]
+        # Within the session: least recently used first, never the artifact just stored
+        while len(artifacts) > 1 and (sum(a[1] for a in artifacts.values()) > self.session_budget
+                                      or sum(a[3] for a in artifacts.values()) > self.session_disk_budget):
+            evicted.append(artifacts.popitem(last=False)[1])
+        # Idle sessions, then the least recently active ones while over a total budget
+        for other in list(self.sessions):
+            last_used, others = self.sessions[other]
+            over = (self.total - sum(a[1] for a in evicted) > self.total_budget
+                    or self.total_disk - sum(a[3] for a in evicted) > self.total_disk_budget)
+            if other != session and (now - last_used > self.idle_ttl or over):
+                evicted.extend(others.values())
+                del self.sessions[other]
+        self.total -= sum(artifact[1] for artifact in evicted)
+        self.total_disk -= sum(artifact[3] for artifact in evicted)
+        return evicted
+
+    def _release(self, artifacts):
+        for value, nbytes, on_evict, disk_bytes in artifacts:
+            self.evictions += 1
+            if on_evict is not None:
+                on_evict()
+        metrics.incr("session_evictions", len(artifacts))
+
+    def usage(self):
+        with self.lock:
+            return {"sessions": len(self.sessions), "bytes": self.total, "disk_bytes": self.total_disk,
+                    "evictions": self.evictions}
+
+
+_default_memory = None
+_default_memory_lock = threading.Lock()
+
+
+def get_session_memory():
+    global _default_memory
+    with _default_memory_lock:
+        if _default_memory is None:
+            _default_memory = SessionMemory()
+            metrics.register_collector("sessions", _default_memory.usage)
+        return _default_memory
+
+
+def current_session_id():
+    """The Streamlit session running this script, or "default" outside Streamlit."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return "default"
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+
+def session_upload(uploaded_file, slot="upload", memory=None, session=None):
+    """
+    The spooled copy of a Streamlit upload, made once per file. Each uploader uses
+    its own `slot`; uploading a different file there releases the previous copy.
+    """
+    memory = memory or get_session_memory()
+    session = session or current_session_id()
+    file_key = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    current = memory.get(session, slot)
+    if current is not None and current[0] == file_key:
+        return current[1]
+    upload = spool_upload(uploaded_file)
+    memory.put(session, slot, (file_key, upload), upload.nbytes, on_evict=upload.close, disk_bytes=upload.disk_bytes)
+    return upload